@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
 from db import get_db_connection
+from cache import cache, members_namespace, FAMILY_MEMBERS_TOTAL
+from auth import current_user_id
 
 # Define a blueprint for family member routes
 member_bp = Blueprint("member_bp", __name__, url_prefix="/api")
@@ -17,7 +19,7 @@ def add_family_member():
         if not data:
             return jsonify({"error": "Invalid request body"}), 400
 
-        user_id = data.get("user_id")
+        user_id = current_user_id()
         name = data.get("name")
         phone = data.get("phone")
         email = data.get("email")
@@ -42,6 +44,10 @@ def add_family_member():
         )
         conn.commit()
 
+        # Write-through invalidation of this user's cached lists/counts
+        cache.invalidate(members_namespace(user_id))
+        cache.incr_counter(FAMILY_MEMBERS_TOTAL)
+
         return jsonify({"message": "Family member added successfully!"}), 201
 
     except Exception as e:
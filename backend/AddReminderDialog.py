@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from db import get_db_connection
+from read_routing import get_read_connection
 import datetime
+import multiprocessing
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -9,7 +11,12 @@ from dotenv import load_dotenv
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.cron import CronTrigger
+import threading
+import time
 import traceback
+from auth import current_user_id
+from recurrence import upcoming, invalidate_upcoming, MAX_WINDOW_DAYS
+from adherence import adherence_log, ack_url, FIRED, DELIVERED
 
 # ---------------- BLUEPRINT ---------------- #
 reminders_bp = Blueprint("reminders_bp", __name__)
@@ -22,15 +29,18 @@ EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 
 # ---------------- APSCHEDULER ---------------- #
+# Only the process holding the MySQL named lock runs reminder jobs (see SchedulerLeader),
+# so each reminder fires once however many web workers there are.
+REMINDER_LEADER_LOCK = os.getenv("REMINDER_LEADER_LOCK", "parivaar_reminder_scheduler")
+REMINDER_SYNC_SECONDS = int(os.getenv("REMINDER_SYNC_SECONDS", 30))   # leader picks up other workers' writes
 scheduler = BackgroundScheduler()
-scheduler.start()
 
 # ---------------- FUNCTION: SEND EMAIL ---------------- #
 def send_email(to_email, subject, body):
     try:
         if not to_email:
             print("⚠️ Skipping email: No recipient address provided")
-            return
+            return False
 
         msg = MIMEMultipart()
         msg["From"] = EMAIL_ADDRESS
@@ -44,9 +54,11 @@ def send_email(to_email, subject, body):
         server.send_message(msg)
         server.quit()
         print(f"✅ Email sent to {to_email}")
+        return True
     except Exception as e:
         print(f"❌ Email sending failed to {to_email}: {e}")
         traceback.print_exc()
+        return False
 
 # ---------------- FETCH EMAILS FROM DB ---------------- #
 def get_emails_for_family_member(family_member_id):
@@ -70,10 +82,33 @@ def get_emails_for_family_member(family_member_id):
         print(f"❌ Failed fetching emails for family_member_id {family_member_id}: {e}")
         return None, None
 
+def get_emails_for_family_members(family_member_ids):
+    """{family_member_id: (member_email, user_email)} in one query, for bulk scheduling."""
+    ids = list(set(family_member_ids))
+    if not ids:
+        return {}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT fm.id, fm.email, u.email
+        FROM family_members fm
+        JOIN users u ON fm.user_id = u.id
+        WHERE fm.id IN ({", ".join(["%s"] * len(ids))})
+        """,
+        ids,
+    )
+    emails = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    cursor.close()
+    conn.close()
+    return emails
+
 # ---------------- SCHEDULE REMINDER ---------------- #
 def schedule_reminder(reminder_id, family_member_id, title, notes,
                       start_date, end_date, reminder_time, frequency,
-                      day_of_week=None, day_of_month=None):
+                      day_of_week=None, day_of_month=None, emails=None):
+    if not scheduler_leader.is_leader:
+        return  # the leader schedules it on its next sync
     try:
         now = datetime.datetime.now()
 
@@ -89,22 +124,30 @@ def schedule_reminder(reminder_id, family_member_id, title, notes,
         elif not isinstance(reminder_time, datetime.time):
             raise ValueError("Invalid reminder_time type")
 
-        # Fetch recipient emails
-        member_email, user_email = get_emails_for_family_member(family_member_id)
+        # Fetch recipient emails (bulk imports pass them in, looked up once per member)
+        member_email, user_email = emails or get_emails_for_family_member(family_member_id)
 
         def job_action():
+            # The scheduled minute identifies the dose in the adherence log and the ack link
+            occurrence_at = datetime.datetime.now().replace(second=0, microsecond=0)
+            adherence_log.record(FIRED, reminder_id, family_member_id, occurrence_at)
+            taken_link = f"\nTaken it? Tap to confirm: {ack_url(reminder_id, family_member_id, occurrence_at)}"
+
+            delivered = False
             if member_email:
-                send_email(
+                delivered |= send_email(
                     member_email,
                     f"Reminder: {title}",
-                    f"Hello! You have a reminder for {title}.\nNotes: {notes or 'None'}",
+                    f"Hello! You have a reminder for {title}.\nNotes: {notes or 'None'}{taken_link}",
                 )
             if user_email:
-                send_email(
+                delivered |= send_email(
                     user_email,
                     f"Reminder Notification: {title}",
-                    f"Reminder for your family member: {title}.\nNotes: {notes or 'None'}",
+                    f"Reminder for your family member: {title}.\nNotes: {notes or 'None'}{taken_link}",
                 )
+            if delivered:
+                adherence_log.record(DELIVERED, reminder_id, family_member_id, occurrence_at)
 
         if frequency.lower() == "once":
             reminder_datetime = datetime.datetime.combine(start_date, reminder_time)
@@ -153,16 +196,37 @@ def schedule_reminder(reminder_id, family_member_id, title, notes,
         traceback.print_exc()
 
 # ---------------- LOAD AND SCHEDULE EXISTING REMINDERS ---------------- #
-def load_and_schedule_reminders():
+def load_and_schedule_reminders(since=None):
+    """
+    (Re)schedule active reminders and unschedule inactive ones; with `since`, only rows
+    updated after it. Returns the newest updated_at seen, for the next call.
+    """
+    newest = since
     try:
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM reminders WHERE is_active = 1")
+        if since is None:
+            cursor.execute("SELECT * FROM reminders WHERE is_active = 1")
+        else:
+            cursor.execute("SELECT * FROM reminders WHERE updated_at > %s", (since,))
         reminders = cursor.fetchall()
+        if since is not None:
+            # Deleted rows leave no updated_at behind: drop jobs whose reminder is gone
+            cursor.execute("SELECT id FROM reminders")
+            existing = {f"reminder_{row['id']}" for row in cursor.fetchall()}
+            for job in scheduler.get_jobs():
+                if job.id.startswith("reminder_") and job.id not in existing:
+                    scheduler.remove_job(job.id)
         cursor.close()
         conn.close()
 
         for r in reminders:
+            if r.get("updated_at") and (newest is None or r["updated_at"] > newest):
+                newest = r["updated_at"]
+            if not r["is_active"]:
+                if scheduler.get_job(f"reminder_{r['id']}"):
+                    scheduler.remove_job(f"reminder_{r['id']}")
+                continue
             try:
                 start_date = datetime.date.fromisoformat(str(r["start_date"]))
                 end_date = datetime.date.fromisoformat(str(r["end_date"])) if r["end_date"] else None
@@ -187,20 +251,72 @@ def load_and_schedule_reminders():
     except Exception as e:
         print(f"❌ Error loading reminders: {e}")
         traceback.print_exc()
+    return newest
+
+class SchedulerLeader:
+    """
+    Every worker runs this thread; the one that gets GET_LOCK on its own connection runs the
+    scheduler and re-syncs reminders written by the other workers every REMINDER_SYNC_SECONDS.
+    If the leader dies its connection closes, the lock is released and another worker takes over.
+    """
+
+    def __init__(self, lock_name=REMINDER_LEADER_LOCK, interval=REMINDER_SYNC_SECONDS):
+        self.lock_name = lock_name
+        self.interval = interval
+        self.is_leader = False
+        self._conn = None
+        self._watermark = None
+
+    def start(self):
+        scheduler.start(paused=True)
+        threading.Thread(target=self._run, name="reminder-leader", daemon=True).start()
+
+    def _try_acquire(self):
+        conn = get_db_connection()
+        if conn is None:
+            return False
+        cursor = conn.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (self.lock_name,))
+        acquired = cursor.fetchone()[0] == 1
+        cursor.close()
+        if acquired:
+            self._conn = conn  # held open for as long as we lead
+        else:
+            conn.close()
+        return acquired
+
+    def _still_leader(self):
+        try:
+            self._conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _run(self):
+        while True:
+            try:
+                if self.is_leader and not self._still_leader():
+                    print("⚠️ Lost the reminder scheduler lock; stopping jobs in this worker")
+                    self.is_leader = False
+                    scheduler.pause()
+                    scheduler.remove_all_jobs()
+                elif not self.is_leader and self._try_acquire():
+                    print(f"✅ Reminder scheduler leader: pid {os.getpid()}")
+                    self.is_leader = True
+                    self._watermark = load_and_schedule_reminders()
+                    scheduler.resume()
+                elif self.is_leader:
+                    # A few seconds of overlap covers transactions that committed late
+                    since = self._watermark - datetime.timedelta(seconds=5) if self._watermark else None
+                    self._watermark = load_and_schedule_reminders(since)
+            except Exception as e:
+                print(f"❌ Reminder scheduler leader error: {e}")
+                traceback.print_exc()
+            time.sleep(self.interval)
 
-# Initialize scheduler with existing reminders
-load_and_schedule_reminders()
-
-# ---------------- SERIALIZATION HELPERS ---------------- #
-def serialize(obj):
-    if isinstance(obj, (datetime.date, datetime.datetime)):
-        return obj.isoformat()
-    elif isinstance(obj, datetime.timedelta):
-        return str(obj)
-    return obj
-
-def serialize_reminder(reminder: dict) -> dict:
-    return {k: serialize(v) for k, v in reminder.items()}
+scheduler_leader = SchedulerLeader()
+if multiprocessing.parent_process() is None:  # not in spawned pool workers
+    scheduler_leader.start()
 
 # ---------------- POST: Add Reminder ---------------- #
 @reminders_bp.route("/reminders", methods=["POST", "OPTIONS"])
@@ -255,6 +371,7 @@ def add_reminder():
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_upcoming([family_member_id])
 
         # Schedule immediately
         start_date = datetime.date.fromisoformat(start_date_str)
@@ -279,6 +396,86 @@ def add_reminder():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+# ---------------- Owned reminder lookup ---------------- #
+def find_reminder(cursor, reminder_id, user_id):
+    """family_member_id of the reminder if it exists and belongs to user_id."""
+    cursor.execute(
+        """
+        SELECT r.family_member_id FROM reminders r
+        JOIN family_members fm ON fm.id = r.family_member_id
+        WHERE r.id = %s AND fm.user_id = %s
+        """,
+        (reminder_id, user_id),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def unschedule(reminder_id):
+    # Only the leader holds jobs; other workers' changes reach it on its next sync
+    if scheduler.get_job(f"reminder_{reminder_id}"):
+        scheduler.remove_job(f"reminder_{reminder_id}")
+
+# ---------------- DELETE: Reminder ---------------- #
+@reminders_bp.route("/reminders/<int:reminder_id>", methods=["DELETE"])
+def delete_reminder(reminder_id):
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        member_id = find_reminder(cursor, reminder_id, user_id)
+        if member_id is None:
+            cursor.close()
+            conn.close()
+            return jsonify({"error": "Reminder not found"}), 404
+        cursor.execute("DELETE FROM reminders WHERE id = %s", (reminder_id,))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        unschedule(reminder_id)
+        invalidate_upcoming([member_id])
+        return jsonify({"message": "Reminder deleted"}), 200
+
+    except Exception as e:
+        print("❌ Delete reminder error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# ---------------- PUT: Activate / Deactivate Reminder ---------------- #
+@reminders_bp.route("/reminders/<int:reminder_id>/toggle-active", methods=["PUT"])
+def toggle_reminder(reminder_id):
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    try:
+        data = request.get_json(silent=True) or {}
+        is_active = 1 if data.get("is_active", True) else 0
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        member_id = find_reminder(cursor, reminder_id, user_id)
+        if member_id is None:
+            cursor.close()
+            conn.close()
+            return jsonify({"error": "Reminder not found"}), 404
+        cursor.execute("UPDATE reminders SET is_active = %s WHERE id = %s", (is_active, reminder_id))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        # Re-activation is scheduled by the leader's sync (updated_at changed); deactivation takes effect now
+        if not is_active:
+            unschedule(reminder_id)
+        invalidate_upcoming([member_id])
+        return jsonify({"message": "Reminder updated"}), 200
+
+    except Exception as e:
+        print("❌ Toggle reminder error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
 # ---------------- GET: List Reminders for Member ---------------- #
 @reminders_bp.route("/family-members/<int:member_id>/reminders", methods=["GET", "OPTIONS"])
 def list_reminders(member_id):
@@ -286,7 +483,7 @@ def list_reminders(member_id):
         return jsonify({"message": "CORS preflight OK"}), 200
 
     try:
-        conn = get_db_connection()
+        conn = get_read_connection()
         cursor = conn.cursor(dictionary=True)
         cursor.execute(
             """
@@ -302,9 +499,36 @@ def list_reminders(member_id):
         cursor.close()
         conn.close()
 
-        return jsonify([serialize_reminder(r) for r in reminders]), 200
+        return jsonify(reminders), 200
 
     except Exception as e:
         print("❌ List reminders error:", e)
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
+
+# ---------------- GET: Upcoming Occurrences ---------------- #
+@reminders_bp.route("/reminders/upcoming", methods=["GET"])
+def upcoming_reminders():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+    member_id = request.args.get("member_id", type=int)
+    days = min(max(request.args.get("days", 7, type=int), 1), MAX_WINDOW_DAYS)
+    try:
+        start_date = datetime.date.fromisoformat(request.args["from"]) if request.args.get("from") \
+            else datetime.date.today()
+    except ValueError:
+        return jsonify({"error": "from must be an ISO date (YYYY-MM-DD)"}), 400
+
+    try:
+        result = upcoming(user_id, start_date, days, member_id)
+        return jsonify({
+            "from": start_date.isoformat(),
+            "days": days,
+            "count": len(result["occurrences"]),
+            **result,
+        }), 200
+    except Exception as e:
+        print("❌ Upcoming reminders error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
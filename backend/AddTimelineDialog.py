@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from db import get_db_connection
-import datetime
+from read_routing import get_read_connection
+from auth import current_user_id
+from embeddings import store
+import timeline_rollup
+import queries
 
 timeline_bp = Blueprint("timeline_bp", __name__)
 
@@ -35,120 +39,72 @@ def add_timeline_entry():
             """,
             (member_id, title, event_type, event_date, severity, notes)
         )
+        entry_id = cursor.lastrowid
+        timeline_rollup.add_entry(cursor, entry_id)  # same transaction as the insert
         conn.commit()
         cursor.close()
         conn.close()
 
+        # Keep the semantic index current (embedded in the background)
+        store.index_record(member_id, "timeline", entry_id, f"{title}. {event_type}. {notes or ''}")
+
         return jsonify({"message": "Timeline entry added successfully"}), 201
 
     except Exception as e:
         print("❌ Add timeline error:", e)
         return jsonify({"error": str(e)}), 500
 
-# ---------------- GET: List Timeline Entries ---------------- #
-@timeline_bp.route("/family-members/<int:member_id>/timeline", methods=["GET"])
-def list_timeline(member_id):
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-            SELECT id, title, event_type, event_date, severity, notes, created_at
-            FROM medical_timeline
-            WHERE family_member_id = %s
-            ORDER BY event_date DESC
-            """,
-            (member_id,)
-        )
-        entries = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        # Convert datetime to string
-        for entry in entries:
-            if isinstance(entry.get("event_date"), (datetime.date, datetime.datetime)):
-                entry["event_date"] = entry["event_date"].isoformat()
-            if isinstance(entry.get("created_at"), (datetime.date, datetime.datetime)):
-                entry["created_at"] = entry["created_at"].isoformat()
-
-        return jsonify(entries), 200
-
-    except Exception as e:
-        print("❌ List timeline error:", e)
-        return jsonify({"error": str(e)}), 500
-from flask import Blueprint, request, jsonify
-from db import get_db_connection
-import datetime
-
-timeline_bp = Blueprint("timeline_bp", __name__)
-
-# ---------------- POST: Add Timeline Entry ---------------- #
-@timeline_bp.route("/timeline", methods=["POST", "OPTIONS"])
-def add_timeline_entry():
-    if request.method == "OPTIONS":
-        return jsonify({"message": "CORS preflight OK"}), 200
-
+# ---------------- DELETE: Timeline Entry ---------------- #
+@timeline_bp.route("/timeline/<int:entry_id>", methods=["DELETE"])
+def delete_timeline_entry(entry_id):
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "Invalid request body"}), 400
-
-        member_id = data.get("member_id")
-        title = data.get("title")
-        event_type = data.get("event_type")
-        event_date = data.get("event_date")
-        severity = data.get("severity")
-        notes = data.get("notes")
-
-        if not member_id or not title or not event_type or not event_date:
-            return jsonify({"error": "Missing required fields"}), 400
-
+        user_id = current_user_id()
+        if not user_id:
+            return jsonify({"error": "Authentication required"}), 401
         conn = get_db_connection()
         cursor = conn.cursor()
         cursor.execute(
             """
-            INSERT INTO medical_timeline
-            (family_member_id, title, event_type, event_date, severity, notes)
-            VALUES (%s, %s, %s, %s, %s, %s)
+            SELECT t.id FROM medical_timeline t
+            JOIN family_members fm ON fm.id = t.family_member_id
+            WHERE t.id = %s AND fm.user_id = %s
             """,
-            (member_id, title, event_type, event_date, severity, notes)
+            (entry_id, user_id),
         )
+        if not cursor.fetchone():
+            cursor.close()
+            conn.close()
+            return jsonify({"error": "Timeline entry not found"}), 404
+
+        # Rollup counts and embeddings go in the same transaction as the delete
+        timeline_rollup.remove_entry(cursor, entry_id)
+        store.delete_record(cursor, "timeline", entry_id)
+        cursor.execute("DELETE FROM medical_timeline WHERE id = %s", (entry_id,))
         conn.commit()
         cursor.close()
         conn.close()
+        store.forget(user_id, "timeline", entry_id)  # out of /api/search/related right away
 
-        return jsonify({"message": "Timeline entry added successfully"}), 201
+        return jsonify({"message": "Timeline entry deleted successfully"}), 200
 
     except Exception as e:
-        print("❌ Add timeline error:", e)
+        print("❌ Delete timeline error:", e)
         return jsonify({"error": str(e)}), 500
 
 # ---------------- GET: List Timeline Entries ---------------- #
 @timeline_bp.route("/family-members/<int:member_id>/timeline", methods=["GET"])
 def list_timeline(member_id):
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
     try:
-        conn = get_db_connection()
+        conn = get_read_connection()
         cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-            SELECT id, title, event_type, event_date, severity, notes, created_at
-            FROM medical_timeline
-            WHERE family_member_id = %s
-            ORDER BY event_date DESC
-            """,
-            (member_id,)
-        )
+        cursor.execute(*queries.member_timeline(member_id, user_id))
         entries = cursor.fetchall()
         cursor.close()
         conn.close()
 
-        # Convert datetime to string
-        for entry in entries:
-            if isinstance(entry.get("event_date"), (datetime.date, datetime.datetime)):
-                entry["event_date"] = entry["event_date"].isoformat()
-            if isinstance(entry.get("created_at"), (datetime.date, datetime.datetime)):
-                entry["created_at"] = entry["created_at"].isoformat()
-
         return jsonify(entries), 200
 
     except Exception as e:
@@ -0,0 +1,331 @@
+from flask import Blueprint, request, jsonify
+from db import get_db_connection
+from cache import cache, members_namespace, FAMILY_MEMBERS_TOTAL
+from auth import current_user_id
+from embeddings import store
+from AddReminderDialog import schedule_reminder, get_emails_for_family_members
+from recurrence import invalidate_upcoming
+import datetime
+import os
+import time
+import traceback
+import numpy as np
+import orjson
+import timeline_rollup
+
+bulk_bp = Blueprint("bulk_bp", __name__, url_prefix="/api/bulk")
+
+# ---------------- CONFIG ---------------- #
+BULK_CHUNK_ROWS = int(os.getenv("BULK_CHUNK_ROWS", 500))     # rows per multi-row INSERT + commit
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", 50000))
+MAX_REPORTED_ERRORS = 1000
+
+# Column layout of each import. Field names match the single-record endpoints.
+SPECS = {
+    "timeline": {
+        "table": "medical_timeline",
+        "columns": ["member_id", "title", "event_type", "event_date", "severity", "notes"],
+        "db_columns": ["family_member_id", "title", "event_type", "event_date", "severity", "notes"],
+        "required": ["member_id", "title", "event_type", "event_date"],
+        "dates": ["event_date"],
+        "member_column": "member_id",
+        "in_transaction": timeline_rollup.add_rows,  # monthly rollup counts commit with each chunk
+    },
+    "reminders": {
+        "table": "reminders",
+        "columns": ["family_member_id", "title", "reminder_type", "start_date", "end_date", "reminder_time",
+                    "frequency", "dosage", "notes", "day_of_week", "day_of_month"],
+        "db_columns": ["family_member_id", "title", "reminder_type", "start_date", "end_date", "reminder_time",
+                       "frequency", "dosage", "notes", "day_of_week", "day_of_month"],
+        "required": ["family_member_id", "title", "reminder_type", "start_date", "reminder_time"],
+        "dates": ["start_date", "end_date"],
+        "times": ["reminder_time"],
+        "choices": {"frequency": {"Once", "Daily", "Weekly", "Monthly"}},
+        "defaults": {"frequency": "Once"},
+        # Same as add_reminder; inactive rows would never be scheduled or counted.
+        # Bound like the row values (callables are evaluated once per batch)
+        "db_values": {"is_active": 1, "created_at": datetime.datetime.now},
+        "member_column": "family_member_id",
+    },
+    "members": {
+        "table": "family_members",
+        "columns": ["user_id", "name", "phone", "email", "age", "gender", "relation"],
+        "db_columns": ["user_id", "name", "phone", "email", "age", "gender", "relation"],
+        "required": ["user_id", "name", "relation"],
+        "ints": ["age"],
+    },
+}
+
+# ---------------- PARSING ---------------- #
+def read_records():
+    """
+    JSON array (or {"records": [...]}) or NDJSON, one object per line.
+    Returns (records, errors); unparsable NDJSON lines become row errors.
+    """
+    content_type = request.mimetype or ""
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl") \
+            or request.args.get("format") == "ndjson":
+        records, errors = [], []
+        for line in request.stream:
+            if len(records) + len(errors) >= BULK_MAX_ROWS:
+                raise ValueError(f"At most {BULK_MAX_ROWS} rows per import")
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = orjson.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("line is not a JSON object")
+                records.append(record)
+            except (orjson.JSONDecodeError, ValueError) as e:
+                errors.append({"row": len(records), "error": f"Invalid JSON: {e}"})
+                records.append({})  # keep row numbers aligned with input lines
+        return records, errors
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("records")
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of records or NDJSON")
+    if len(data) > BULK_MAX_ROWS:
+        raise ValueError(f"At most {BULK_MAX_ROWS} rows per import")
+    return [r if isinstance(r, dict) else {} for r in data], []
+
+# ---------------- VALIDATION ---------------- #
+def parse_dates(values):
+    """ISO dates -> (datetime.date or None list, invalid mask), one NumPy cast in the common case."""
+    present = np.array([v not in (None, "") for v in values], dtype=bool)
+    invalid = np.array([p and not isinstance(v, str) for v, p in zip(values, present)], dtype=bool)
+    usable = present & ~invalid
+    strings = [v[:10] if ok else "NaT" for v, ok in zip(values, usable)]  # drop any time part
+    try:
+        parsed = np.array(strings, dtype="datetime64[D]")
+    except ValueError:
+        # Some value is malformed: fall back to per-value parsing to find which
+        parsed = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[D]")
+        for i in np.flatnonzero(usable):
+            try:
+                parsed[i] = np.datetime64(datetime.date.fromisoformat(strings[i]), "D")
+            except ValueError:
+                invalid[i] = True
+    dates = [d.item() if ok and not bad else None for d, ok, bad in zip(parsed, usable, invalid)]
+    return dates, invalid
+
+def parse_times(values):
+    times, invalid = [], np.zeros(len(values), dtype=bool)
+    for i, v in enumerate(values):
+        try:
+            times.append(datetime.time.fromisoformat(v) if v not in (None, "") else None)
+        except (ValueError, TypeError):
+            times.append(None)
+            invalid[i] = True
+    return times, invalid
+
+def validate(spec, records, allowed_members=None):
+    """
+    Column-wise validation: every check produces a boolean mask over all rows.
+    Returns (columns, row_errors) where row_errors maps row index -> message.
+    """
+    columns = {}
+    for name in spec["columns"]:
+        default = spec.get("defaults", {}).get(name)
+        columns[name] = [r.get(name, default) for r in records]
+
+    errors = {}
+    def flag(mask, message):
+        for i in np.flatnonzero(mask):
+            errors.setdefault(int(i), message)
+
+    for name in spec["required"]:
+        flag(np.array([v in (None, "") for v in columns[name]], dtype=bool), f"{name} is required")
+
+    for name in spec.get("dates", []):
+        columns[name], invalid = parse_dates(columns[name])
+        flag(invalid, f"{name} must be an ISO date (YYYY-MM-DD)")
+
+    for name in spec.get("times", []):
+        columns[name], invalid = parse_times(columns[name])
+        flag(invalid, f"{name} must be a time (HH:MM[:SS])")
+
+    for name in spec.get("ints", []):
+        values = columns[name]
+        invalid = np.array([v not in (None, "") and not str(v).isdigit() for v in values], dtype=bool)
+        flag(invalid, f"{name} must be a whole number")
+        columns[name] = [int(v) if v not in (None, "") and str(v).isdigit() else None for v in values]
+
+    for name, choices in spec.get("choices", {}).items():
+        flag(np.array([v not in choices for v in columns[name]], dtype=bool),
+             f"{name} must be one of {', '.join(sorted(choices))}")
+
+    member_column = spec.get("member_column")
+    if member_column and allowed_members is not None:
+        ids = np.array([int(v) if str(v).isdigit() else -1 for v in columns[member_column]], dtype=np.int64)
+        flag(~np.isin(ids, np.fromiter(allowed_members, dtype=np.int64)), f"Unknown {member_column}")
+        columns[member_column] = ids.tolist()
+
+    if "end_date" in columns and "start_date" in columns:
+        flag(np.array([e is not None and s is not None and e < s
+                       for s, e in zip(columns["start_date"], columns["end_date"])], dtype=bool),
+             "end_date is before start_date")
+
+    return columns, errors
+
+def member_ids_for(user_id):
+    """Member ids the caller may write to: their own."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM family_members WHERE user_id=%s", (user_id,))
+    allowed = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    conn.close()
+    return allowed
+
+# ---------------- INSERT ---------------- #
+def insert_statement(spec, fixed, n):
+    """One multi-row INSERT for n rows, every value a placeholder."""
+    row = "({})".format(", ".join(["%s"] * (len(spec["db_columns"]) + len(fixed))))
+    return "INSERT INTO {table} ({cols}) VALUES {rows}".format(
+        table=spec["table"], cols=", ".join(spec["db_columns"] + list(fixed)), rows=", ".join([row] * n))
+
+def insert_batch(conn, cursor, spec, rows, numbers, inserted, errors):
+    """
+    One multi-row INSERT + commit (together with the spec's in_transaction hook, if any).
+    On failure the batch is rolled back and bisected, so good rows still commit and
+    only the offending rows are reported.
+    """
+    fixed = {name: value() if callable(value) else value for name, value in spec.get("db_values", {}).items()}
+    params = [value for row in rows for value in row + tuple(fixed.values())]
+    try:
+        # Built as a single statement rather than left to executemany's rewriting, so the ids
+        # are known: InnoDB gives one simple multi-row INSERT consecutive ids, and
+        # lastrowid (LAST_INSERT_ID) is the id of its first row
+        cursor.execute(insert_statement(spec, fixed, len(rows)), params)
+        if cursor.rowcount != len(rows):
+            raise RuntimeError(f"Inserted {cursor.rowcount} of {len(rows)} rows")
+        first_id = cursor.lastrowid
+        if spec.get("in_transaction"):
+            spec["in_transaction"](cursor, rows)
+        conn.commit()
+        inserted.extend((num, first_id + i, row) for i, (num, row) in enumerate(zip(numbers, rows)))
+    except Exception as e:
+        conn.rollback()
+        if len(rows) == 1:
+            print(f"❌ Bulk insert of row {numbers[0]} failed: {e}")
+            errors.append({"row": numbers[0], "error": str(e)})
+            return
+        half = len(rows) // 2
+        insert_batch(conn, cursor, spec, rows[:half], numbers[:half], inserted, errors)
+        insert_batch(conn, cursor, spec, rows[half:], numbers[half:], inserted, errors)
+
+def insert_chunks(spec, rows, row_numbers):
+    """
+    One multi-row INSERT per chunk of BULK_CHUNK_ROWS, one transaction each; see insert_batch
+    for how failures are narrowed down to single rows.
+    Returns ([(row_number, new_id, row)], errors).
+    """
+    inserted, errors = [], []
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(rows), BULK_CHUNK_ROWS):
+            insert_batch(conn, cursor, spec, rows[start:start + BULK_CHUNK_ROWS],
+                         row_numbers[start:start + BULK_CHUNK_ROWS], inserted, errors)
+    finally:
+        cursor.close()
+        conn.close()
+    return inserted, errors
+
+def run_import(kind, after_insert=None):
+    spec = SPECS[kind]
+    started = time.perf_counter()
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    try:
+        records, errors = read_records()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not records:
+        return jsonify({"error": "No records to import"}), 400
+
+    if kind == "members":
+        # Imported members always belong to the caller
+        for r in records:
+            r["user_id"] = user_id
+        allowed = None
+    else:
+        allowed = member_ids_for(user_id)
+
+    columns, row_errors = validate(spec, records, allowed)
+    for e in errors:
+        row_errors[e["row"]] = e["error"]
+
+    valid = [i for i in range(len(records)) if i not in row_errors]
+    rows = [tuple(columns[name][i] for name in spec["columns"]) for i in valid]
+    inserted, insert_errors = insert_chunks(spec, rows, valid) if rows else ([], [])
+
+    if inserted and after_insert:
+        after_insert(spec, inserted)
+
+    all_errors = sorted(
+        [{"row": i, "error": msg} for i, msg in row_errors.items()] + insert_errors,
+        key=lambda e: e["row"],
+    )
+    elapsed = time.perf_counter() - started
+    return jsonify({
+        "received": len(records),
+        "inserted": len(inserted),
+        "failed": len(all_errors),
+        "errors": all_errors[:MAX_REPORTED_ERRORS],
+        "took_ms": round(elapsed * 1000, 2),
+        "rows_per_second": round(len(inserted) / elapsed, 1) if elapsed else None,
+    }), 201 if inserted else 400
+
+# ---------------- POST-INSERT HOOKS ---------------- #
+def index_timeline(spec, inserted):
+    for _, entry_id, row in inserted:
+        member_id, title, event_type, _, _, notes = row
+        store.index_record(member_id, "timeline", entry_id, f"{title}. {event_type}. {notes or ''}")
+
+def schedule_reminders(spec, inserted):
+    # Recipient emails are looked up once per member, not once per reminder
+    emails = get_emails_for_family_members(row[0] for _, _, row in inserted)
+    for _, reminder_id, row in inserted:
+        (member_id, title, _, start_date, end_date, reminder_time,
+         frequency, _, notes, day_of_week, day_of_month) = row
+        schedule_reminder(reminder_id, member_id, title, notes, start_date, end_date, reminder_time,
+                          frequency, day_of_week, day_of_month, emails=emails.get(member_id, (None, None)))
+    invalidate_upcoming({row[0] for _, _, row in inserted})
+
+def refresh_member_caches(spec, inserted):
+    for user_id in {row[0] for _, _, row in inserted}:
+        cache.invalidate(members_namespace(user_id))
+    cache.incr_counter(FAMILY_MEMBERS_TOTAL, len(inserted))
+
+# ---------------- ROUTES ---------------- #
+@bulk_bp.route("/timeline", methods=["POST"])
+def bulk_timeline():
+    try:
+        return run_import("timeline", index_timeline)
+    except Exception as e:
+        print("❌ Bulk timeline import error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@bulk_bp.route("/reminders", methods=["POST"])
+def bulk_reminders():
+    try:
+        return run_import("reminders", schedule_reminders)
+    except Exception as e:
+        print("❌ Bulk reminders import error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@bulk_bp.route("/members", methods=["POST"])
+def bulk_members():
+    try:
+        return run_import("members", refresh_member_caches)
+    except Exception as e:
+        print("❌ Bulk members import error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
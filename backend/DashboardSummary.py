@@ -0,0 +1,151 @@
+from flask import Blueprint, request, jsonify, make_response
+from read_routing import get_read_connection
+from cache import cache
+from auth import current_user_id
+import hashlib
+import traceback
+
+dashboard_bp = Blueprint("dashboard_bp", __name__)
+
+LATEST_TIMELINE_PER_MEMBER = 3
+
+# ---------------- HELPERS ---------------- #
+def dashboard_fingerprint(cursor, user_id):
+    """
+    One cheap round trip that changes whenever anything shown on the dashboard changes:
+    COUNT/MAX(id) catch inserts and deletes, MAX(updated_at) catches edits (uuid, dates, ...).
+    """
+    cursor.execute(
+        """
+        SELECT
+            CURDATE() AS today,
+            (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(id), 0), ':', COALESCE(MAX(updated_at), ''))
+               FROM family_members WHERE user_id = %s) AS members,
+            (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(d.id), 0), ':', COALESCE(MAX(d.updated_at), ''))
+               FROM medical_documents d
+               JOIN family_members fm ON fm.id = d.family_member_id
+              WHERE fm.user_id = %s) AS documents,
+            (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(r.id), 0), ':', COALESCE(SUM(r.is_active), 0),
+                           ':', COALESCE(MAX(r.updated_at), ''))
+               FROM reminders r
+               JOIN family_members fm ON fm.id = r.family_member_id
+              WHERE fm.user_id = %s) AS reminders,
+            (SELECT CONCAT(COUNT(*), ':', COALESCE(MAX(t.id), 0), ':', COALESCE(MAX(t.updated_at), ''))
+               FROM medical_timeline t
+               JOIN family_members fm ON fm.id = t.family_member_id
+              WHERE fm.user_id = %s) AS timeline
+        """,
+        (user_id, user_id, user_id, user_id),
+    )
+    row = cursor.fetchone()
+    digest = hashlib.sha1("|".join(str(v) for v in row.values()).encode("utf-8")).hexdigest()
+    return f"dash-{user_id}-{digest[:20]}"
+
+def build_dashboard(cursor, user_id, latest_limit):
+    """Members plus per-member aggregates, using grouped queries instead of per-member calls."""
+    cursor.execute(
+        """
+        SELECT id, user_id, name, phone, email, age, gender, relation, uuid
+        FROM family_members
+        WHERE user_id = %s
+        ORDER BY id DESC
+        """,
+        (user_id,),
+    )
+    members = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT d.family_member_id, COUNT(*) AS n
+        FROM medical_documents d
+        JOIN family_members fm ON fm.id = d.family_member_id
+        WHERE fm.user_id = %s
+        GROUP BY d.family_member_id
+        """,
+        (user_id,),
+    )
+    document_counts = {r["family_member_id"]: r["n"] for r in cursor.fetchall()}
+
+    cursor.execute(
+        """
+        SELECT r.family_member_id, COUNT(*) AS n
+        FROM reminders r
+        JOIN family_members fm ON fm.id = r.family_member_id
+        WHERE fm.user_id = %s
+          AND r.is_active = 1
+          AND (r.end_date IS NULL OR r.end_date >= CURDATE())
+          AND NOT (LOWER(r.frequency) = 'once' AND r.start_date < CURDATE())
+        GROUP BY r.family_member_id
+        """,
+        (user_id,),
+    )
+    reminder_counts = {r["family_member_id"]: r["n"] for r in cursor.fetchall()}
+
+    cursor.execute(
+        """
+        SELECT id, family_member_id, title, event_type, event_date, severity
+        FROM (
+            SELECT t.id, t.family_member_id, t.title, t.event_type, t.event_date, t.severity,
+                   ROW_NUMBER() OVER (PARTITION BY t.family_member_id
+                                      ORDER BY t.event_date DESC, t.id DESC) AS rn
+            FROM medical_timeline t
+            JOIN family_members fm ON fm.id = t.family_member_id
+            WHERE fm.user_id = %s
+        ) ranked
+        WHERE rn <= %s
+        ORDER BY family_member_id, rn
+        """,
+        (user_id, latest_limit),
+    )
+    latest = {}
+    for event in cursor.fetchall():
+        latest.setdefault(event.pop("family_member_id"), []).append(event)
+
+    for member in members:
+        member["document_count"] = document_counts.get(member["id"], 0)
+        member["upcoming_reminder_count"] = reminder_counts.get(member["id"], 0)
+        member["latest_timeline"] = latest.get(member["id"], [])
+
+    return {
+        "member_count": len(members),
+        "members": members,
+        "totals": {
+            "documents": sum(document_counts.values()),
+            "upcoming_reminders": sum(reminder_counts.values()),
+        },
+    }
+
+# ---------------- GET: Dashboard Summary ---------------- #
+@dashboard_bp.route("/api/dashboard", methods=["GET"])
+def get_dashboard():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+    latest_limit = request.args.get("latest", LATEST_TIMELINE_PER_MEMBER, type=int)
+
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        etag = f"{dashboard_fingerprint(cursor, user_id)}-{latest_limit}"
+
+        # Unchanged dashboard: the fingerprint query is the only DB work
+        if etag in request.if_none_match:
+            response = make_response("", 304)
+        else:
+            namespace = f"dashboard:{user_id}"
+            payload = cache.get(namespace, etag)
+            if payload is None:
+                payload = build_dashboard(cursor, user_id, latest_limit)
+                cache.set(namespace, etag, payload)
+            response = make_response(jsonify(payload), 200)
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    except Exception as e:
+        print("❌ Dashboard error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
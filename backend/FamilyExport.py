@@ -0,0 +1,218 @@
+from flask import Blueprint, Response, jsonify, stream_with_context
+from db import get_db_connection
+from auth import current_user_id
+from json_provider import dumps_bytes
+import csv
+import io
+import re
+import threading
+import time
+import traceback
+import zipfile
+
+export_bp = Blueprint("export_bp", __name__)
+
+BLOB_CHUNK_BYTES = 1024 * 1024   # PDFs are written to the archive this many bytes at a time
+TABLE_FLUSH_ROWS = 500           # table rows written between drains of the zip sink
+
+# Tables dumped as JSON + CSV; every query is scoped to the user's family members
+TABLE_DUMPS = {
+    "members": """
+        SELECT id, name, relation, age, gender, phone, email, uuid
+        FROM family_members WHERE user_id = %s ORDER BY id
+    """,
+    "timeline": """
+        SELECT t.id, t.family_member_id, fm.name AS member_name, t.title, t.event_type,
+               t.event_date, t.severity, t.notes, t.created_at
+        FROM medical_timeline t JOIN family_members fm ON fm.id = t.family_member_id
+        WHERE fm.user_id = %s ORDER BY t.family_member_id, t.event_date
+    """,
+    "reminders": """
+        SELECT r.id, r.family_member_id, fm.name AS member_name, r.title, r.reminder_type,
+               r.start_date, r.end_date, r.reminder_time, r.frequency, r.dosage, r.notes,
+               r.day_of_week, r.day_of_month, r.is_active
+        FROM reminders r JOIN family_members fm ON fm.id = r.family_member_id
+        WHERE fm.user_id = %s ORDER BY r.family_member_id, r.start_date
+    """,
+    "emergency_cards": """
+        SELECT c.member_id, fm.name AS member_name, c.blood_group, c.allergies, c.ongoing_medicines,
+               c.medical_conditions, c.emergency_contact_name, c.emergency_contact_phone,
+               c.doctor_name, c.doctor_phone
+        FROM emergency_health_cards c JOIN family_members fm ON fm.id = c.member_id
+        WHERE fm.user_id = %s ORDER BY c.member_id
+    """,
+}
+
+_stats = {"exports": 0, "bytes": 0, "seconds": 0.0, "last_mb_per_s": None}
+_stats_lock = threading.Lock()
+
+def export_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_mb_per_s"] = round(stats["bytes"] / 1e6 / stats["seconds"], 2) if stats["seconds"] else None
+    stats["seconds"] = round(stats["seconds"], 2)
+    return stats
+
+# ---------------- STREAMING ZIP ---------------- #
+class ZipStream(io.RawIOBase):
+    """
+    Write-only sink for zipfile. It has no seek(), so ZipFile writes data descriptors
+    after each member instead of rewinding, and the bytes can be sent as soon as they exist.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def safe_name(value):
+    return re.sub(r"[^\w.-]+", "_", str(value or "")).strip("_") or "untitled"
+
+def write_table(zf, conn, name, user_id):
+    """
+    Stream one query into name.json (array) and name.csv, row by row from an unbuffered cursor.
+    Yields every TABLE_FLUSH_ROWS rows so the caller can send what has been compressed so far.
+    """
+    # ZipFile allows one open member at a time, so each format gets its own pass
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    cursor.execute(TABLE_DUMPS[name], (user_id,))
+    with zf.open(f"{name}.json", "w", force_zip64=True) as out:
+        out.write(b"[")
+        for i, row in enumerate(cursor):
+            out.write((b",\n" if i else b"\n") + dumps_bytes(row))
+            if i % TABLE_FLUSH_ROWS == TABLE_FLUSH_ROWS - 1:
+                yield
+        out.write(b"\n]\n")
+    yield
+
+    cursor.execute(TABLE_DUMPS[name], (user_id,))
+    with zf.open(f"{name}.csv", "w", force_zip64=True) as raw:
+        out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        writer = csv.writer(out)
+        writer.writerow(cursor.column_names)
+        for i, row in enumerate(cursor):
+            writer.writerow(row.values())
+            if i % TABLE_FLUSH_ROWS == TABLE_FLUSH_ROWS - 1:
+                out.flush()
+                yield
+        out.flush()
+        out.detach()
+    cursor.close()
+    yield
+
+def write_document(zf, conn, doc):
+    """
+    Copy one PDF blob into the archive. The blob is read with a single SELECT (one
+    document in memory at a time) and written out BLOB_CHUNK_BYTES at a time, so the
+    response keeps streaming between slices.
+    """
+    path = "documents/{}_{}/{}_{}".format(
+        doc["family_member_id"], safe_name(doc["member_name"]), doc["id"], safe_name(doc["file_name"]))
+    info = zipfile.ZipInfo(path)
+    info.compress_type = zipfile.ZIP_STORED  # PDFs are already compressed
+    cursor = conn.cursor()
+    cursor.execute("SELECT file_data FROM medical_documents WHERE id = %s", (doc["id"],))
+    row = cursor.fetchone()
+    cursor.close()
+    data = memoryview(row[0] or b"") if row else memoryview(b"")
+    with zf.open(info, "w", force_zip64=True) as out:
+        for offset in range(0, len(data), BLOB_CHUNK_BYTES):
+            out.write(data[offset:offset + BLOB_CHUNK_BYTES])
+            yield
+
+def generate_export(user_id):
+    started = time.perf_counter()
+    sink = ZipStream()
+    total = 0
+    conn = get_db_connection()
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name in TABLE_DUMPS:
+                for _ in write_table(zf, conn, name, user_id):
+                    data = sink.drain()
+                    total += len(data)
+                    yield data
+
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                """
+                SELECT d.id, d.family_member_id, fm.name AS member_name, d.file_name,
+                       LENGTH(d.file_data) AS size
+                FROM medical_documents d JOIN family_members fm ON fm.id = d.family_member_id
+                WHERE fm.user_id = %s
+                ORDER BY d.family_member_id, d.id
+                """,
+                (user_id,),
+            )
+            documents = cursor.fetchall()  # metadata only; blobs are streamed below
+            cursor.close()
+
+            pdf_bytes = 0
+            for doc in documents:
+                for _ in write_document(zf, conn, doc):
+                    data = sink.drain()
+                    total += len(data)
+                    yield data
+                pdf_bytes += doc["size"] or 0
+
+            elapsed = time.perf_counter() - started
+            zf.writestr("manifest.json", dumps_bytes({
+                "user_id": user_id,
+                "tables": list(TABLE_DUMPS),
+                "documents": len(documents),
+                "document_bytes": pdf_bytes,
+                "seconds": round(elapsed, 2),
+                "mb_per_s": round(total / 1e6 / elapsed, 2) if elapsed else None,
+            }))
+        data = sink.drain()  # central directory
+        total += len(data)
+        yield data
+    except Exception as e:
+        # Headers are already sent; the client sees a truncated archive
+        print(f"❌ Export of user {user_id} failed after {total} bytes: {e}")
+        traceback.print_exc()
+        raise
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    mb_per_s = round(total / 1e6 / elapsed, 2) if elapsed else None
+    with _stats_lock:
+        _stats["exports"] += 1
+        _stats["bytes"] += total
+        _stats["seconds"] += elapsed
+        _stats["last_mb_per_s"] = mb_per_s
+    print(f"📦 Exported records of user {user_id}: {total / 1e6:.1f} MB in {elapsed:.1f}s ({mb_per_s} MB/s)")
+
+# ---------------- GET: Export Family Records ---------------- #
+@export_bp.route("/api/export", methods=["GET"])
+def export_family():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    try:
+        stream = generate_export(user_id)
+        response = Response(stream_with_context(stream), mimetype="application/zip")
+        response.headers["Content-Disposition"] = f'attachment; filename="parivaar-export-{user_id}.zip"'
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    except Exception as e:
+        print("❌ Export error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
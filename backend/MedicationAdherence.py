@@ -0,0 +1,108 @@
+from flask import Blueprint, request, jsonify
+from db import get_db_connection
+from read_routing import get_read_connection
+from auth import current_user_id
+from adherence import adherence_log, verify_ack_token, ACKNOWLEDGED
+import datetime
+import traceback
+
+adherence_bp = Blueprint("adherence_bp", __name__)
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+
+ACK_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Parivaar</title></head>
+<body style="font-family: sans-serif; text-align: center; padding-top: 4em;">
+<h2>{heading}</h2><p>{message}</p></body></html>"""
+
+def percent(part, whole):
+    return round(part * 100 / whole, 1) if whole else None
+
+# ---------------- GET: Acknowledge a Dose (signed link from the reminder email) ---------------- #
+@adherence_bp.route("/adherence/ack/<string:token>", methods=["GET"])
+def acknowledge_dose(token):
+    try:
+        reminder_id, member_id, occurrence_at = verify_ack_token(token)
+    except ValueError as e:
+        return ACK_PAGE.format(heading="Link not valid", message=str(e)), 400
+
+    # Count each dose once, however many times (or in however many workers) the link is opened:
+    # only the request whose row actually went in records the event
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT IGNORE INTO adherence_acks (reminder_id, occurrence_at) VALUES (%s, %s)",
+            (reminder_id, occurrence_at),
+        )
+        first = cursor.rowcount == 1
+        conn.commit()
+        cursor.close()
+        conn.close()
+    except Exception as e:
+        print("❌ Adherence ack error:", e)
+        traceback.print_exc()
+        return ACK_PAGE.format(heading="Something went wrong", message="Please open the link again later."), 500
+    if first:
+        adherence_log.record(ACKNOWLEDGED, reminder_id, member_id, occurrence_at)
+    return ACK_PAGE.format(
+        heading="Thank you!",
+        message=f"The {occurrence_at:%d %b %Y, %H:%M} dose has been marked as taken.",
+    ), 200
+
+# ---------------- GET: Adherence per Member ---------------- #
+@adherence_bp.route("/api/adherence", methods=["GET"])
+def member_adherence():
+    """Fired / delivered / acknowledged totals and percentages per member from adherence_daily."""
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+    member_id = request.args.get("member_id", type=int)
+    days = min(max(request.args.get("days", DEFAULT_DAYS, type=int), 1), MAX_DAYS)
+    since = datetime.date.today() - datetime.timedelta(days=days - 1)
+
+    try:
+        query = """
+            SELECT a.family_member_id, fm.name, a.day, a.fired, a.delivered, a.acknowledged
+            FROM adherence_daily a
+            JOIN family_members fm ON fm.id = a.family_member_id
+            WHERE fm.user_id = %s AND a.day >= %s
+        """
+        args = [user_id, since]
+        if member_id:
+            query += " AND a.family_member_id = %s"
+            args.append(member_id)
+        query += " ORDER BY a.family_member_id, a.day"
+
+        conn = get_read_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query, tuple(args))
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+
+        members = {}
+        for row in rows:
+            m = members.setdefault(row["family_member_id"], {
+                "family_member_id": row["family_member_id"], "name": row["name"],
+                "fired": 0, "delivered": 0, "acknowledged": 0, "daily": [],
+            })
+            for field in ("fired", "delivered", "acknowledged"):
+                m[field] += row[field]
+            if member_id:
+                m["daily"].append({"day": row["day"], "fired": row["fired"], "delivered": row["delivered"],
+                                   "acknowledged": row["acknowledged"],
+                                   "adherence_pct": percent(row["acknowledged"], row["fired"])})
+
+        for m in members.values():
+            m["delivery_pct"] = percent(m["delivered"], m["fired"])
+            m["adherence_pct"] = percent(m["acknowledged"], m["fired"])
+            if not member_id:
+                del m["daily"]
+
+        return jsonify({"since": since, "days": days, "members": list(members.values())}), 200
+    except Exception as e:
+        print("❌ Adherence stats error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,114 @@
+from flask import Blueprint, request, jsonify
+from read_routing import get_read_connection
+from auth import current_user_id
+from embeddings import store
+import re
+import time
+import traceback
+
+search_bp = Blueprint("search_bp", __name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+SNIPPET_CHARS = 200
+
+# One FULLTEXT match per source; every branch is scoped to the user's family members.
+# MATCH in SELECT and WHERE with the same arguments is evaluated once by InnoDB.
+SEARCH_SQL = """
+    SELECT * FROM (
+        SELECT 'document' AS source, d.id, d.family_member_id, fm.name AS member_name,
+               d.title, d.document_type AS type, d.document_date AS date,
+               SUBSTRING(d.extracted_text, GREATEST(LOCATE(%(term)s, d.extracted_text) - 60, 1), {snippet})
+                   AS snippet,
+               MATCH(d.title, d.extracted_text) AGAINST (%(q)s IN NATURAL LANGUAGE MODE) AS score
+        FROM medical_documents d
+        JOIN family_members fm ON fm.id = d.family_member_id
+        WHERE fm.user_id = %(user_id)s
+          AND MATCH(d.title, d.extracted_text) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+
+        UNION ALL
+
+        SELECT 'timeline', t.id, t.family_member_id, fm.name,
+               t.title, t.event_type, t.event_date,
+               LEFT(t.notes, {snippet}),
+               MATCH(t.title, t.notes) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+        FROM medical_timeline t
+        JOIN family_members fm ON fm.id = t.family_member_id
+        WHERE fm.user_id = %(user_id)s
+          AND MATCH(t.title, t.notes) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+
+        UNION ALL
+
+        SELECT 'reminder', r.id, r.family_member_id, fm.name,
+               r.title, r.reminder_type, r.start_date,
+               LEFT(r.notes, {snippet}),
+               MATCH(r.title) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+        FROM reminders r
+        JOIN family_members fm ON fm.id = r.family_member_id
+        WHERE fm.user_id = %(user_id)s
+          AND MATCH(r.title) AGAINST (%(q)s IN NATURAL LANGUAGE MODE)
+    ) hits
+    ORDER BY score DESC
+    LIMIT %(limit)s
+""".format(snippet=SNIPPET_CHARS)
+
+# ---------------- GET: Search Family Records ---------------- #
+@search_bp.route("/api/search", methods=["GET"])
+def search_records():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Query is required"}), 400
+    limit = min(request.args.get("limit", DEFAULT_LIMIT, type=int), MAX_LIMIT)
+
+    # Longest word of the query anchors the document snippet
+    words = re.findall(r"\w+", q)
+    term = max(words, key=len) if words else q
+
+    try:
+        started = time.perf_counter()
+        conn = get_read_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(SEARCH_SQL, {"q": q, "term": term, "user_id": user_id, "limit": limit})
+        results = cursor.fetchall()
+        cursor.close()
+        conn.close()
+
+        return jsonify({
+            "query": q,
+            "results": results,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        }), 200
+    except Exception as e:
+        print("❌ Search error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+# ---------------- GET: Semantically Related Records ---------------- #
+@search_bp.route("/api/search/related", methods=["GET"])
+def related_records():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+
+    q = (request.args.get("q") or "").strip()
+    source = request.args.get("source")
+    source_id = request.args.get("id", type=int)
+    if not q and not (source and source_id):
+        return jsonify({"error": "Provide q, or source and id of a record"}), 400
+    k = min(request.args.get("k", 10, type=int), MAX_LIMIT)
+
+    try:
+        started = time.perf_counter()
+        results = store.related(user_id, query_text=q or None, source=source, source_id=source_id, k=k)
+        return jsonify({
+            "results": results,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        }), 200
+    except Exception as e:
+        print("❌ Related records error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
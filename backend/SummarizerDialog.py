@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
-from pdf_utils import extract_text_from_pdf  # function to extract PDF text
-from summarizer import summarize_text, simplify_summary  # T5 summarizer
+from pdf_utils import extract_text_from_bytes, extract_sections_from_bytes, section_focus_text
+from summarizer import summarize_text, simplify_summary, resolve_profile, SummarizerBusy  # T5 summarizer
+from model_registry import registry, UnknownModel
+from auth import current_user_id
 import traceback
 
 # Blueprint for Medical Summarizer
@@ -15,23 +17,49 @@ def summarize_pdf():
     if file.filename == "":
         return jsonify({"error": "Empty file uploaded"}), 400
 
+    # Checkpoint: explicit ?model= / form field, else the tenant's configured model, else the default
     try:
-        # Extract text from PDF
-        text = extract_text_from_pdf(file)
+        model_name = registry.resolve(request.form.get("model") or request.args.get("model"),
+                                      user_id=current_user_id())
+    except UnknownModel as e:
+        return jsonify({"error": f"Unknown model {e}", "available": list(registry.models)}), 400
+
+    try:
+        # Extract text and labelled sections from PDF
+        pdf_bytes = file.read()
+        text = extract_text_from_bytes(pdf_bytes)
         if not text.strip():
             return jsonify({"error": "PDF contains no extractable text"}), 400
+        sections = extract_sections_from_bytes(pdf_bytes)
 
-        # Generate summary
-        summary = summarize_text(text)
-        simplified = simplify_summary(summary)
+        # Decoding profile (fast/balanced/quality) and deadline in seconds; the server
+        # may step the profile down when other summaries are already running
+        profile = resolve_profile(request.form.get("profile") or request.args.get("profile"))
+        deadline = request.form.get("deadline", type=float) or request.args.get("deadline", type=float)
+
+        # Generate summary, reading high-value sections (Impression, Assessment, ...) first
+        summary = summarize_text(section_focus_text(sections) or text, profile=profile, deadline=deadline,
+                                 adaptive=False, model_name=model_name)
+        simplified = simplify_summary(summary, profile=profile, deadline=deadline,
+                                      adaptive=False, model_name=model_name)
 
         return jsonify({
             "original_text": text,
+            "sections": sections,
             "summary": summary,
-            "simplified": simplified
+            "simplified": simplified,
+            "profile": profile,
+            "model": model_name
         })
 
+    except SummarizerBusy as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         print("❌ Error in summarizer:", e)
         traceback.print_exc()
         return jsonify({"error": "Failed to summarize PDF. " + str(e)}), 500
+
+# ---------------- GET: Available / Loaded Models ---------------- #
+@summarizer_bp.route("/models", methods=["GET"])
+def list_models():
+    return jsonify(registry.stats())
@@ -0,0 +1,52 @@
+from flask import Blueprint, request, jsonify
+from read_routing import get_read_connection
+from auth import current_user_id
+from timeline_rollup import month_start, shape_series
+import time
+import traceback
+
+analytics_bp = Blueprint("analytics_bp", __name__)
+
+DEFAULT_MONTHS = 12
+MAX_MONTHS = 120
+
+# ---------------- GET: Timeline Trends ---------------- #
+@analytics_bp.route("/api/analytics/timeline", methods=["GET"])
+def timeline_trends():
+    """Events per month by type and severity for the family, or one member, from the rollup table."""
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "User ID is required"}), 400
+    member_id = request.args.get("member_id", type=int)
+    months = min(max(request.args.get("months", DEFAULT_MONTHS, type=int), 1), MAX_MONTHS)
+    since = month_start(months - 1)
+
+    try:
+        started = time.perf_counter()
+        query = """
+            SELECT r.month, r.event_type, r.severity, SUM(r.event_count) AS n
+            FROM timeline_rollup_monthly r
+            JOIN family_members fm ON fm.id = r.family_member_id
+            WHERE fm.user_id = %s AND r.month >= %s AND r.event_count > 0
+        """
+        args = [user_id, since]
+        if member_id:
+            query += " AND r.family_member_id = %s"
+            args.append(member_id)
+        query += " GROUP BY r.month, r.event_type, r.severity"
+
+        conn = get_read_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query, tuple(args))
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+
+        payload = shape_series(rows, since)
+        payload["member_id"] = member_id
+        payload["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify(payload), 200
+    except Exception as e:
+        print("❌ Timeline analytics error:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
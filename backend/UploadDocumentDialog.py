@@ -1,8 +1,13 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app
 from db import get_db_connection
+from read_routing import get_read_connection
+from auth import current_user_id
+from ingestion import pipeline
+from thumbnails import thumb_cache, thumb_name, store_thumbnails, THUMB_SIZES, THUMB_VERSION
 from datetime import datetime
 import io
 import traceback
+import queries
 
 documents_bp = Blueprint('documents_bp', __name__)
 
@@ -56,12 +61,17 @@ def upload_document():
             (family_member_id, title, document_type, document_date, notes, file_name, file_data, created_at)
             VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
         """, (member_id, title, document_type, document_date, notes, file.filename, file_data))
+        doc_id = cursor.lastrowid
         conn.commit()
         cursor.close()
         conn.close()
 
+        # 4️⃣ Text extraction / summaries happen off the request path
+        pipeline.enqueue(doc_id)
+
         return jsonify({
             'message': 'Document uploaded successfully',
+            'id': doc_id,
             'file_name': file.filename
         }), 201
 
@@ -73,19 +83,17 @@ def upload_document():
 # ---------------- GET: List Documents for Member ---------------- #
 @documents_bp.route('/family-members/<int:member_id>/documents', methods=['GET'])
 def list_documents(member_id):
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
     try:
-        conn = get_db_connection()
+        conn = get_read_connection()
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT id, title, document_type, document_date, notes, file_name
-            FROM medical_documents
-            WHERE family_member_id = %s
-            ORDER BY created_at DESC
-        """, (member_id,))
+        cursor.execute(*queries.member_documents(member_id, user_id))
         documents = cursor.fetchall()
         cursor.close()
         conn.close()
-        return jsonify(documents)
+        return jsonify(queries.with_thumbnail_urls(documents))
     except Exception as e:
         print("❌ List documents error:", e)
         traceback.print_exc()
@@ -126,3 +134,69 @@ def serve_document(doc_id):
         print("❌ Serve document error:", e)
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
+
+# ---------------- GET: First-Page Thumbnail ---------------- #
+@documents_bp.route('/documents/<int:doc_id>/thumbnail', methods=['GET'])
+def document_thumbnail(doc_id):
+    size = request.args.get('size', 'sm')
+    if size not in THUMB_SIZES:
+        return jsonify({'error': f"size must be one of {', '.join(THUMB_SIZES)}"}), 400
+
+    try:
+        etag = f"{doc_id}-{size}-v{THUMB_VERSION}"
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            path = thumb_cache.get(thumb_name(doc_id, size))
+            if path is None:
+                # Not rendered yet (ingestion pending) or evicted: render from the stored PDF
+                conn = get_db_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT file_data FROM medical_documents WHERE id=%s", (doc_id,))
+                row = cursor.fetchone()
+                cursor.close()
+                conn.close()
+                if not row:
+                    return jsonify({'error': 'Document not found'}), 404
+                path = store_thumbnails(doc_id, row[0]).get(size)
+                if path is None:
+                    return jsonify({'error': 'Document has no pages'}), 404
+            response = send_file(path, mimetype='image/jpeg', etag=False)
+
+        # A document's first page never changes, so browsers may keep it for a year
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+
+    except Exception as e:
+        print("❌ Thumbnail error:", e)
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+# ---------------- GET: Stored Summary ---------------- #
+@documents_bp.route('/documents/<int:doc_id>/summary', methods=['GET'])
+def document_summary(doc_id):
+    try:
+        conn = get_read_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT id, title, page_count, impression, summary, simplified, ingest_status, ingest_error, ingested_at
+            FROM medical_documents
+            WHERE id = %s
+        """, (doc_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        conn.close()
+
+        if not row:
+            return jsonify({'error': 'Document not found'}), 404
+
+        # Still queued or running: tell the client to poll again
+        if row['ingest_status'] in ('pending', 'processing'):
+            return jsonify(row), 202
+        return jsonify(row), 200
+
+    except Exception as e:
+        print("❌ Document summary error:", e)
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
@@ -1,28 +1,29 @@
-from flask import Blueprint, request, jsonify
-from db import get_db_connection
+from flask import Blueprint, jsonify
+from read_routing import get_read_connection
+from cache import cache, members_namespace
+from auth import current_user_id
+import queries
 
 view_members_bp = Blueprint("view_members_bp", __name__)
 
 # Get all family members for a user
 @view_members_bp.route("/api/family-members", methods=["GET"])
 def get_family_members():
-    user_id = request.args.get("user_id")
+    user_id = current_user_id()
     if not user_id:
         return jsonify({"error": "User ID is required"}), 400
 
-    conn = get_db_connection()
+    namespace = members_namespace(user_id)
+    members = cache.get(namespace, "list")
+    if members is not None:
+        return jsonify(members), 200
+
+    conn = get_read_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute(
-            """
-            SELECT id, user_id, name, phone, email, age, gender, relation
-            FROM family_members
-            WHERE user_id = %s
-            ORDER BY id DESC
-            """,
-            (user_id,)
-        )
+        cursor.execute(*queries.family_members(user_id))
         members = cursor.fetchall()
+        cache.set(namespace, "list", members)
         return jsonify(members), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -33,24 +34,23 @@ def get_family_members():
 # Get single member by ID
 @view_members_bp.route("/api/family-members/<int:member_id>", methods=["GET"])
 def get_family_member(member_id):
-    user_id = request.args.get("user_id")
+    user_id = current_user_id()
     if not user_id:
         return jsonify({"error": "User ID is required"}), 400
 
-    conn = get_db_connection()
+    namespace = members_namespace(user_id)
+    member = cache.get(namespace, f"member:{member_id}")
+    if member is not None:
+        return jsonify(member), 200
+
+    conn = get_read_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute(
-            """
-            SELECT id, user_id, name, phone, email, age, gender, relation
-            FROM family_members
-            WHERE id = %s AND user_id = %s
-            """,
-            (member_id, user_id)
-        )
+        cursor.execute(*queries.family_member(member_id, user_id))
         member = cursor.fetchone()
         if not member:
             return jsonify({"error": "Member not found"}), 404
+        cache.set(namespace, f"member:{member_id}", member)
         return jsonify(member), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -61,23 +61,22 @@ def get_family_member(member_id):
 # Get count of family members for a user
 @view_members_bp.route("/api/family-members/count", methods=["GET"])
 def get_family_member_count():
-    user_id = request.args.get("user_id")
+    user_id = current_user_id()
     if not user_id:
         return jsonify({"error": "User ID is required"}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    namespace = members_namespace(user_id)
+    count = cache.get(namespace, "count")
+    if count is not None:
+        return jsonify({"count": count}), 200
+
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute(
-            """
-            SELECT COUNT(*) as count
-            FROM family_members
-            WHERE user_id = %s
-            """,
-            (user_id,)
-        )
-        result = cursor.fetchone()
-        return jsonify({"count": result[0]}), 200
+        cursor.execute(*queries.family_member_count(user_id))
+        count = cursor.fetchone()["count"]
+        cache.set(namespace, "count", count)
+        return jsonify({"count": count}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     finally:
@@ -0,0 +1,258 @@
+import atexit
+import datetime
+import hashlib
+import hmac
+import os
+import threading
+import time
+import traceback
+from collections import Counter
+from dotenv import load_dotenv
+from db import get_db_connection
+from auth import SECRET_KEY
+
+load_dotenv()
+
+# Medication adherence log. Reminder jobs append fired/delivered/acknowledged events to an
+# in-memory buffer; one background thread writes them in batches (one multi-row INSERT per
+# flush) and folds the same batch into adherence_daily, so reading adherence never touches
+# the raw events. adherence_events is partitioned by month and old months are dropped whole.
+
+# ---------------- CONFIG ---------------- #
+ADHERENCE_FLUSH_ROWS = int(os.getenv("ADHERENCE_FLUSH_ROWS", 1000))         # flush early at this many events
+ADHERENCE_FLUSH_SECONDS = float(os.getenv("ADHERENCE_FLUSH_SECONDS", 2))
+ADHERENCE_BUFFER_MAX = int(os.getenv("ADHERENCE_BUFFER_MAX", 100000))       # beyond this events are dropped
+ADHERENCE_RETENTION_MONTHS = int(os.getenv("ADHERENCE_RETENTION_MONTHS", 13))
+ADHERENCE_MONTHS_AHEAD = 2                                                   # empty partitions kept ready
+ADHERENCE_MAINTAIN_HOURS = 24
+ACK_SECRET = os.getenv("ADHERENCE_ACK_SECRET", SECRET_KEY).encode("utf-8")
+ACK_BASE_URL = os.getenv("ADHERENCE_ACK_BASE_URL", "http://localhost:8000")
+ACK_VALID_HOURS = int(os.getenv("ADHERENCE_ACK_VALID_HOURS", 48))
+
+FIRED, DELIVERED, ACKNOWLEDGED = "fired", "delivered", "acknowledged"
+EVENTS = (FIRED, DELIVERED, ACKNOWLEDGED)
+
+# ---------------- SIGNED ACK LINKS ---------------- #
+def _signature(payload):
+    return hmac.new(ACK_SECRET, payload.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+def ack_token(reminder_id, member_id, occurrence_at):
+    payload = f"{reminder_id}.{member_id}.{int(occurrence_at.timestamp())}"
+    return f"{payload}.{_signature(payload)}"
+
+def ack_url(reminder_id, member_id, occurrence_at):
+    return f"{ACK_BASE_URL}/adherence/ack/{ack_token(reminder_id, member_id, occurrence_at)}"
+
+def verify_ack_token(token):
+    """(reminder_id, member_id, occurrence_at) for a valid, unexpired token; ValueError otherwise."""
+    payload, _, signature = token.rpartition(".")
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII str
+    if not payload or not hmac.compare_digest(signature.encode("utf-8"), _signature(payload).encode("utf-8")):
+        raise ValueError("Invalid link")
+    reminder_id, member_id, timestamp = (int(part) for part in payload.split("."))
+    if time.time() > timestamp + ACK_VALID_HOURS * 3600:
+        raise ValueError("Link expired")
+    return reminder_id, member_id, datetime.datetime.fromtimestamp(timestamp)
+
+# ---------------- BUFFERED LOG ---------------- #
+class AdherenceLog:
+    """
+    Bounded buffer + one writer thread. record() never touches the database; a flush writes
+    every buffered event with executemany and upserts one adherence_daily row per
+    (member, day) in the same transaction.
+    """
+
+    def __init__(self, flush_rows=ADHERENCE_FLUSH_ROWS, flush_seconds=ADHERENCE_FLUSH_SECONDS,
+                 max_buffer=ADHERENCE_BUFFER_MAX):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._started = False
+        self._maintained_at = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flush_seconds_total = 0.0
+
+    def start(self):
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="adherence-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def record(self, event, reminder_id, member_id, occurrence_at):
+        if event not in EVENTS:
+            raise ValueError(f"Unknown adherence event {event}")
+        self.start()
+        row = (reminder_id, member_id, occurrence_at, event, datetime.datetime.now())
+        with self._cond:
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return False
+            self._buffer.append(row)
+            self.recorded += 1
+            if len(self._buffer) >= self.flush_rows:
+                self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            due = self._maintained_at is None \
+                or time.monotonic() - self._maintained_at >= ADHERENCE_MAINTAIN_HOURS * 3600
+            if due:
+                self._maintained_at = time.monotonic()
+                try:
+                    maintain_partitions()
+                except Exception as e:
+                    print("❌ Adherence partition maintenance error:", e)
+            with self._cond:
+                if len(self._buffer) < self.flush_rows:
+                    self._cond.wait(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                print("❌ Adherence flush error:", e)
+                traceback.print_exc()
+
+    def flush(self):
+        with self._cond:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+
+        started = time.perf_counter()
+        daily = Counter()
+        for _, member_id, occurrence_at, event, _ in batch:
+            daily[(member_id, occurrence_at.date(), event)] += 1
+        per_day = {}
+        for (member_id, day, event), n in daily.items():
+            per_day.setdefault((member_id, day), Counter())[event] += n
+
+        conn = get_db_connection()
+        if conn is None:
+            self._requeue(batch)
+            raise RuntimeError("Database unavailable")
+        cursor = conn.cursor()
+        try:
+            # Statements of at most flush_rows rows, so a backlog after an outage stays under max_allowed_packet
+            for start in range(0, len(batch), self.flush_rows):
+                cursor.executemany(
+                    """
+                    INSERT INTO adherence_events (reminder_id, family_member_id, occurrence_at, event, created_at)
+                    VALUES (%s, %s, %s, %s, %s)
+                    """,
+                    batch[start:start + self.flush_rows],
+                )
+            cursor.executemany(
+                """
+                INSERT INTO adherence_daily (family_member_id, day, fired, delivered, acknowledged)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE fired = fired + VALUES(fired),
+                                        delivered = delivered + VALUES(delivered),
+                                        acknowledged = acknowledged + VALUES(acknowledged)
+                """,
+                [(member_id, day, c[FIRED], c[DELIVERED], c[ACKNOWLEDGED])
+                 for (member_id, day), c in per_day.items()],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            self._requeue(batch)
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        with self._cond:
+            self.written += len(batch)
+            self.flushes += 1
+            self.flush_seconds_total += time.perf_counter() - started
+        return len(batch)
+
+    def _requeue(self, batch):
+        # Put the batch back in front, as far as the buffer bound allows; retried on the next flush
+        with self._cond:
+            room = max(self.max_buffer - len(self._buffer), 0)
+            self._buffer[:0] = batch[:room]
+            self.dropped += max(len(batch) - room, 0)
+            self.failed_flushes += 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                "buffered": len(self._buffer),
+                "recorded": self.recorded,
+                "written": self.written,
+                "dropped": self.dropped,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "avg_batch": round(self.written / self.flushes, 1) if self.flushes else None,
+                "avg_flush_ms": round(self.flush_seconds_total / self.flushes * 1000, 2) if self.flushes else None,
+            }
+
+adherence_log = AdherenceLog()
+
+# ---------------- PARTITIONS ---------------- #
+def add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+def maintain_partitions(today=None):
+    """
+    Split monthly partitions off pmax for this month and the next ADHERENCE_MONTHS_AHEAD,
+    and drop months older than ADHERENCE_RETENTION_MONTHS. Returns (added, dropped) names.
+    """
+    this_month = (today or datetime.date.today()).replace(day=1)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'adherence_events'
+              AND PARTITION_NAME IS NOT NULL
+            """
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        months = {name: datetime.date(int(name[1:5]), int(name[5:7]), 1)
+                  for name in existing if name != "pmax"}
+
+        added = []
+        newest = max(months.values(), default=add_months(this_month, -1))
+        month = add_months(newest, 1)
+        while month <= add_months(this_month, ADHERENCE_MONTHS_AHEAD):
+            name = f"p{month:%Y%m}"
+            cursor.execute(
+                f"""
+                ALTER TABLE adherence_events REORGANIZE PARTITION pmax INTO (
+                    PARTITION {name} VALUES LESS THAN ('{add_months(month, 1).isoformat()}'),
+                    PARTITION pmax VALUES LESS THAN (MAXVALUE)
+                )
+                """
+            )
+            added.append(name)
+            month = add_months(month, 1)
+
+        cutoff = add_months(this_month, -ADHERENCE_RETENTION_MONTHS)
+        dropped = sorted(name for name, m in months.items() if m < cutoff)
+        if dropped:
+            # Dropping a partition discards its rows without deleting them one by one
+            cursor.execute(f"ALTER TABLE adherence_events DROP PARTITION {', '.join(dropped)}")
+        # Ack dedupe keys only matter while a link can still be opened
+        cursor.execute("DELETE FROM adherence_acks WHERE occurrence_at < %s", (cutoff,))
+        conn.commit()
+        return added, dropped
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    # Also runs daily in the writer thread; this is for cron or a first setup
+    added, dropped = maintain_partitions()
+    print(f"✅ Partitions added: {added or 'none'}; dropped: {dropped or 'none'}")
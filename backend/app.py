@@ -1,12 +1,22 @@
-from flask import Flask, request, jsonify, Blueprint, redirect
+from flask import Flask, request, jsonify, Blueprint, redirect, send_file
 from flask_cors import CORS
-import bcrypt
-import jwt
-import datetime
+import io
+import multiprocessing
 import os
 import traceback
 import uuid
 from db import get_db_connection
+from read_routing import get_read_connection, init_read_routing, stats as read_routing_stats
+from json_provider import OrjsonProvider
+import queries
+from cache import cache, members_namespace, FAMILY_MEMBERS_TOTAL
+from auth import init_auth, issue_token, token_cache, current_user_id
+from passwords import hasher, HashPoolBusy
+from cpu_policy import gate
+import emergency_card
+from thumbnails import thumb_cache
+from pdf_optimize import optimizer
+from compression import init_compression, compression_stats
 
 # ---------------- BLUEPRINT IMPORTS ---------------- #
 from AddMemberDialog import member_bp
@@ -15,12 +25,23 @@ from UploadDocumentDialog import documents_bp
 from AddReminderDialog import reminders_bp
 from AddTimelineDialog import timeline_bp
 from SummarizerDialog import summarizer_bp  # ✅ Medical Summarizer
+from DashboardSummary import dashboard_bp
+from SearchRecords import search_bp
+from BulkImport import bulk_bp
+from TimelineAnalytics import analytics_bp
+from MedicationAdherence import adherence_bp
+from adherence import adherence_log
+from FamilyExport import export_bp, export_stats
+from ingestion import pipeline
 
 # ---------------- APP CONFIG ---------------- #
 app = Flask(__name__)
+app.json = OrjsonProvider(app)  # native date/time/Decimal handling for every jsonify
 CORS(app, resources={r"/*": {"origins": ["http://localhost:8080"]}}, supports_credentials=True)
 
-SECRET_KEY = "your-secret-key"
+init_auth(app)  # verifies bearer tokens once per request and sets g.user_id
+init_compression(app)  # zstd/br/gzip by Accept-Encoding for JSON and streamed bodies
+init_read_routing(app)  # writes pin the caller's reads to the primary for DB_STICKY_SECONDS
 
 UPLOAD_FOLDER = "uploads/documents"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -43,7 +64,10 @@ def signup():
     if not email or not password:
         return jsonify({"error": "Email and password are required"}), 400
 
-    hashed_pw = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    try:
+        hashed_pw = hasher.hash(password)
+    except HashPoolBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
 
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -62,6 +86,14 @@ def signup():
         conn.close()
 
 # ---------------- AUTH: LOGIN ---------------- #
+def update_password_hash(user_id, new_hash):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("UPDATE users SET password=%s WHERE id=%s", (new_hash, user_id))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
 @app.route("/login", methods=["POST"])
 def login():
     try:
@@ -81,34 +113,88 @@ def login():
     cursor.close()
     conn.close()
 
-    if user and bcrypt.checkpw(password.encode("utf-8"), user["password"].encode("utf-8")):
-        payload = {
-            "email": email,
-            "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-        }
-        token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+    try:
+        valid = bool(user) and hasher.check(password, user["password"])
+    except HashPoolBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+
+    if valid:
+        # Transparently upgrade hashes made with an older cost factor
+        if hasher.needs_rehash(user["password"]):
+            hasher.rehash_in_background(password, lambda new_hash: update_password_hash(user["id"], new_hash))
+        token = issue_token(user["id"], email)
         return jsonify({"message": "Login successful!", "token": token, "user_id": user["id"]}), 200
 
     return jsonify({"error": "Invalid credentials"}), 401
 
 # ---------------- FAMILY MEMBER COUNT ---------------- #
-@app.route("/api/family_members/count", methods=["GET"])
-def get_family_member_count():
+def count_all_family_members():
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(*) FROM family_members")
     count = cursor.fetchone()[0]
     cursor.close()
     conn.close()
+    return count
+
+@app.route("/api/family_members/count", methods=["GET"])
+def get_family_member_count():
+    # Maintained counter: seeded from COUNT(*) once, then bumped by add_family_member
+    count = cache.counter(FAMILY_MEMBERS_TOTAL, count_all_family_members)
     return jsonify({"count": count})
 
+# ---------------- CACHE STATS ---------------- #
+@app.route("/api/metrics/cache", methods=["GET"])
+def cache_stats():
+    return jsonify(cache.stats())
+
+@app.route("/api/metrics/auth", methods=["GET"])
+def auth_stats():
+    return jsonify(token_cache.stats())
+
+@app.route("/api/metrics/passwords", methods=["GET"])
+def password_stats():
+    return jsonify(hasher.stats())
+
+@app.route("/api/metrics/ingestion", methods=["GET"])
+def ingestion_stats():
+    return jsonify(pipeline.stats())
+
+@app.route("/api/metrics/inference", methods=["GET"])
+def inference_stats():
+    return jsonify(gate.stats())
+
+@app.route("/api/metrics/export", methods=["GET"])
+def export_metrics():
+    return jsonify(export_stats())
+
+@app.route("/api/metrics/thumbnails", methods=["GET"])
+def thumbnail_stats():
+    return jsonify(thumb_cache.stats())
+
+@app.route("/api/metrics/storage", methods=["GET"])
+def storage_stats():
+    return jsonify(optimizer.stats())
+
+@app.route("/api/metrics/compression", methods=["GET"])
+def compression_metrics():
+    return jsonify(compression_stats.stats())
+
+@app.route("/api/metrics/adherence", methods=["GET"])
+def adherence_stats():
+    return jsonify(adherence_log.stats())
+
+@app.route("/api/metrics/db", methods=["GET"])
+def db_stats():
+    return jsonify(read_routing_stats())
+
 # ---------------- EMERGENCY BLUEPRINT ---------------- #
 emergency_bp = Blueprint("emergency_bp", __name__)
 
 def get_member_by_uuid(member_uuid: str):
-    conn = get_db_connection()
+    conn = get_read_connection()
     cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM family_members WHERE uuid=%s", (member_uuid,))
+    cursor.execute(*queries.member_by_uuid(member_uuid))
     member = cursor.fetchone()
     cursor.close()
     conn.close()
@@ -122,8 +208,13 @@ def generate_uuid(member_id: int):
         cursor = conn.cursor()
         cursor.execute("UPDATE family_members SET uuid=%s WHERE id=%s", (member_uuid, member_id))
         conn.commit()
+        cursor.execute("SELECT user_id FROM family_members WHERE id=%s", (member_id,))
+        owner = cursor.fetchone()
         cursor.close()
         conn.close()
+        if owner:
+            cache.invalidate(members_namespace(owner[0]))
+        emergency_card.invalidate(member_id)  # QR points at the old UUID
         return jsonify({"uuid": member_uuid}), 200
     except Exception as e:
         print("❌ Error generating UUID:", e)
@@ -143,26 +234,16 @@ def doctor_view_data(member_uuid: str):
             return jsonify({"error": "Member not found"}), 404
 
         member_id = member["id"]
-        conn = get_db_connection()
+        conn = get_read_connection()
         cursor = conn.cursor(dictionary=True)
 
-        cursor.execute("SELECT * FROM emergency_health_cards WHERE member_id=%s", (member_id,))
+        cursor.execute(*queries.emergency_card(member_id))
         card = cursor.fetchone()
 
-        cursor.execute("""
-            SELECT id, title, event_type, event_date AS date, severity, notes
-            FROM medical_timeline
-            WHERE family_member_id=%s
-            ORDER BY event_date DESC
-        """, (member_id,))
+        cursor.execute(*queries.doctor_view_timeline(member_id))
         timeline = cursor.fetchall()
 
-        cursor.execute("""
-            SELECT id, title, document_type, document_date, notes, file_name
-            FROM medical_documents
-            WHERE family_member_id=%s
-            ORDER BY created_at DESC
-        """, (member_id,))
+        cursor.execute(*queries.doctor_view_documents(member_id))
         documents = cursor.fetchall()
 
         cursor.close()
@@ -179,6 +260,31 @@ def doctor_view_data(member_uuid: str):
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@emergency_bp.route("/api/doctor-view/<string:member_uuid>/documents/<int:doc_id>", methods=["GET"])
+def doctor_view_document(member_uuid: str, doc_id: int):
+    """Public like the rest of the doctor view, but only for documents of the member behind the UUID."""
+    try:
+        conn = get_read_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT d.file_name, d.file_data
+            FROM medical_documents d
+            JOIN family_members fm ON fm.id = d.family_member_id
+            WHERE d.id=%s AND fm.uuid=%s
+        """, (doc_id, member_uuid))
+        row = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        if not row:
+            return jsonify({"error": "Document not found"}), 404
+
+        file_name, file_data = row
+        return send_file(io.BytesIO(file_data), mimetype="application/pdf", download_name=file_name)
+    except Exception as e:
+        print("❌ Error serving doctor view document:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
 @emergency_bp.route("/emergency/save/<int:member_id>", methods=["POST"])
 def save_emergency_card(member_id: int):
     try:
@@ -220,12 +326,72 @@ def save_emergency_card(member_id: int):
         cursor.close()
         conn.close()
 
+        emergency_card.invalidate(member_id)  # printed card is re-rendered on next request
+
         return jsonify({"message": "Emergency health card saved successfully"}), 200
     except Exception as e:
         print("❌ Error saving emergency card:", e)
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+def send_card_file(member_id, kind):
+    # Owner-only: needs a verified token even when AUTH_REQUIRED is off
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    # Someone else's member looks exactly like a missing one
+    card = emergency_card.fetch_card(member_id, user_id)
+    if not card:
+        return jsonify({"error": "Member not found"}), 404
+    if not card["uuid"]:
+        return jsonify({"error": "Generate a UUID for this member first"}), 409
+
+    # Version is a hash of the card's data, so unchanged cards answer 304 without rendering
+    version = emergency_card.card_version(card)
+    if request.if_none_match.contains(version):
+        response = app.response_class(status=304)
+    else:
+        path, version = emergency_card.get_rendered(card, kind)
+        response = send_file(
+            path,
+            mimetype="application/pdf" if kind == "pdf" else "image/png",
+            download_name=f"emergency-card-{member_id}.{kind}",
+            etag=False,
+        )
+    response.set_etag(version)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+@emergency_bp.route("/emergency/card/<int:member_id>.pdf", methods=["GET"])
+def emergency_card_pdf(member_id: int):
+    try:
+        return send_card_file(member_id, "pdf")
+    except Exception as e:
+        print("❌ Error rendering emergency card:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@emergency_bp.route("/emergency/qr/<int:member_id>.png", methods=["GET"])
+def emergency_card_qr(member_id: int):
+    try:
+        return send_card_file(member_id, "png")
+    except Exception as e:
+        print("❌ Error rendering emergency QR:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+@emergency_bp.route("/emergency/cards/render", methods=["POST"])
+def render_family_cards():
+    user_id = current_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    try:
+        return jsonify({"cards": emergency_card.render_family(user_id)}), 200
+    except Exception as e:
+        print("❌ Error rendering family cards:", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
 # ---------------- REGISTER BLUEPRINTS ---------------- #
 app.register_blueprint(member_bp)
 app.register_blueprint(view_members_bp)
@@ -233,8 +399,20 @@ app.register_blueprint(documents_bp, url_prefix="/api")
 app.register_blueprint(reminders_bp, url_prefix="/api")
 app.register_blueprint(timeline_bp, url_prefix="/api")
 app.register_blueprint(emergency_bp)
+app.register_blueprint(dashboard_bp)
+app.register_blueprint(search_bp)
+app.register_blueprint(bulk_bp)
+app.register_blueprint(analytics_bp)
+app.register_blueprint(adherence_bp)
+app.register_blueprint(export_bp)
 app.register_blueprint(summarizer_bp, url_prefix="/api/summarizer")  # ✅ Medical Summarizer
 
+# ---------------- BACKGROUND INGESTION ---------------- #
+# Spawned pool workers re-import the main module (this file under `python app.py`);
+# background services belong to the server process only
+if multiprocessing.parent_process() is None:
+    pipeline.start()
+
 # ---------------- RUN ---------------- #
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8000, debug=True)
@@ -0,0 +1,250 @@
+import asyncio
+import contextlib
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import aiomysql
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from dotenv import load_dotenv
+from db import DB_CONFIG
+from json_provider import dumps_bytes
+from cache import cache, members_namespace
+import queries
+from auth import verify_token, AuthError, AUTH_REQUIRED, PUBLIC_PATHS, PUBLIC_PREFIXES
+from app import app as flask_app
+
+# ASGI deployment: uvicorn asgi:app --workers 2
+# Read-mostly routes run as coroutines on an aiomysql pool; everything else is the
+# Flask app, mounted underneath and served from a thread pool as before.
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+ASYNC_POOL_MIN = int(os.getenv("ASYNC_DB_POOL_MIN", 2))
+ASYNC_POOL_MAX = int(os.getenv("ASYNC_DB_POOL_MAX", 20))
+SUMMARIZE_WORKERS = int(os.getenv("ASGI_SUMMARIZE_WORKERS", 1))
+
+pool = None
+# Summaries never run on the event loop or in the thread pool serving the WSGI mount
+summarize_executor = ThreadPoolExecutor(max_workers=SUMMARIZE_WORKERS, thread_name_prefix="summarize")
+
+class JSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps_bytes(content)
+
+async def fetch(sql, args=(), one=False):
+    async with pool.acquire() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, args)
+            return await (cursor.fetchone() if one else cursor.fetchall())
+
+# ---------------- AUTH ---------------- #
+class AuthMiddleware(BaseHTTPMiddleware):
+    """Same rules as auth.authenticate, for the async routes."""
+
+    async def dispatch(self, request, call_next):
+        request.state.user_id = None
+        path = request.url.path
+        if request.method == "OPTIONS" or path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES):
+            return await call_next(request)
+
+        header = request.headers.get("Authorization", "")
+        if header.startswith("Bearer "):
+            try:
+                claims = verify_token(header[7:].strip())
+            except AuthError as e:
+                return JSONResponse({"error": f"Invalid token: {e}"}, status_code=401)
+            request.state.user_id = int(claims.get("user_id") or claims["sub"])
+            requested = request.query_params.get("user_id")
+            if requested and requested != str(request.state.user_id):
+                return JSONResponse({"error": "Forbidden"}, status_code=403)
+        elif AUTH_REQUIRED:
+            return JSONResponse({"error": "Authentication required"}, status_code=401)
+        return await call_next(request)
+
+def current_user_id(request):
+    """The verified token's user id, or None; as in auth.current_user_id, a caller-sent user_id is ignored."""
+    return request.state.user_id
+
+def guarded(handler):
+    async def wrapper(request):
+        try:
+            return await handler(request)
+        except Exception as e:
+            print(f"❌ {handler.__name__} error:", e)
+            traceback.print_exc()
+            return JSONResponse({"error": str(e)}, status_code=500)
+    wrapper.__name__ = handler.__name__
+    return wrapper
+
+# ---------------- MEMBERS ---------------- #
+@guarded
+async def get_family_members(request):
+    user_id = current_user_id(request)
+    if not user_id:
+        return JSONResponse({"error": "User ID is required"}, status_code=400)
+
+    namespace = members_namespace(user_id)
+    members = cache.get(namespace, "list")
+    if members is None:
+        members = await fetch(*queries.family_members(user_id))
+        cache.set(namespace, "list", members)
+    return JSONResponse(members)
+
+@guarded
+async def get_family_member(request):
+    user_id = current_user_id(request)
+    if not user_id:
+        return JSONResponse({"error": "User ID is required"}, status_code=400)
+    member_id = request.path_params["member_id"]
+
+    namespace = members_namespace(user_id)
+    member = cache.get(namespace, f"member:{member_id}")
+    if member is None:
+        member = await fetch(*queries.family_member(member_id, user_id), one=True)
+        if not member:
+            return JSONResponse({"error": "Member not found"}, status_code=404)
+        cache.set(namespace, f"member:{member_id}", member)
+    return JSONResponse(member)
+
+@guarded
+async def get_family_member_count(request):
+    user_id = current_user_id(request)
+    if not user_id:
+        return JSONResponse({"error": "User ID is required"}, status_code=400)
+
+    namespace = members_namespace(user_id)
+    count = cache.get(namespace, "count")
+    if count is None:
+        row = await fetch(*queries.family_member_count(user_id), one=True)
+        count = row["count"]
+        cache.set(namespace, "count", count)
+    return JSONResponse({"count": count})
+
+# ---------------- TIMELINE / DOCUMENTS ---------------- #
+@guarded
+async def list_timeline(request):
+    user_id = current_user_id(request)
+    if not user_id:
+        return JSONResponse({"error": "Authentication required"}, status_code=401)
+    entries = await fetch(*queries.member_timeline(request.path_params["member_id"], user_id))
+    return JSONResponse(entries)
+
+@guarded
+async def list_documents(request):
+    user_id = current_user_id(request)
+    if not user_id:
+        return JSONResponse({"error": "Authentication required"}, status_code=401)
+    documents = await fetch(*queries.member_documents(request.path_params["member_id"], user_id))
+    return JSONResponse(queries.with_thumbnail_urls(documents))
+
+# ---------------- DOCTOR VIEW ---------------- #
+@guarded
+async def doctor_view_data(request):
+    member = await fetch(*queries.member_by_uuid(request.path_params["member_uuid"]), one=True)
+    if not member:
+        return JSONResponse({"error": "Member not found"}, status_code=404)
+
+    member_id = member["id"]
+    # Three independent queries on three pooled connections, concurrently
+    card, timeline, documents = await asyncio.gather(
+        fetch(*queries.emergency_card(member_id), one=True),
+        fetch(*queries.doctor_view_timeline(member_id)),
+        fetch(*queries.doctor_view_documents(member_id)),
+    )
+    return JSONResponse({"member": member, "emergency_card": card, "timeline": timeline, "documents": documents})
+
+# ---------------- SUMMARIZER ---------------- #
+def float_param(value):
+    """Like Flask's type=float: None when missing or not a number."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+def summarize_pdf_bytes(pdf_bytes, profile, deadline, model_name):
+    from pdf_utils import extract_text_from_bytes, extract_sections_from_bytes, section_focus_text
+    from summarizer import summarize_text, simplify_summary, resolve_profile
+
+    text = extract_text_from_bytes(pdf_bytes)
+    if not text.strip():
+        raise ValueError("PDF contains no extractable text")
+    sections = extract_sections_from_bytes(pdf_bytes)
+    profile = resolve_profile(profile)
+    summary = summarize_text(section_focus_text(sections) or text, profile=profile, deadline=deadline,
+                             adaptive=False, model_name=model_name)
+    simplified = simplify_summary(summary, profile=profile, deadline=deadline,
+                                  adaptive=False, model_name=model_name)
+    return {"original_text": text, "sections": sections, "summary": summary,
+            "simplified": simplified, "profile": profile, "model": model_name}
+
+@guarded
+async def summarize_pdf(request):
+    from model_registry import registry, UnknownModel
+    from summarizer import SummarizerBusy
+
+    form = await request.form()
+    upload = form.get("file")
+    if upload is None or not upload.filename:
+        return JSONResponse({"error": "No file uploaded"}, status_code=400)
+    try:
+        model_name = registry.resolve(form.get("model") or request.query_params.get("model"),
+                                      user_id=current_user_id(request))
+    except UnknownModel as e:
+        return JSONResponse({"error": f"Unknown model {e}", "available": list(registry.models)}, status_code=400)
+
+    pdf_bytes = await upload.read()
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            summarize_executor, summarize_pdf_bytes, pdf_bytes,
+            form.get("profile") or request.query_params.get("profile"),
+            float_param(form.get("deadline")) or float_param(request.query_params.get("deadline")), model_name,
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except SummarizerBusy as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    return JSONResponse(result)
+
+# ---------------- APP ---------------- #
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global pool
+    pool = await aiomysql.create_pool(
+        host=DB_CONFIG["host"], port=DB_CONFIG["port"], user=DB_CONFIG["user"], password=DB_CONFIG["password"],
+        db=DB_CONFIG["database"], minsize=ASYNC_POOL_MIN, maxsize=ASYNC_POOL_MAX, autocommit=True,
+    )
+    try:
+        yield
+    finally:
+        pool.close()
+        await pool.wait_closed()
+        summarize_executor.shutdown(wait=False)
+
+app = Starlette(
+    routes=[
+        Route("/api/family-members", get_family_members),
+        Route("/api/family-members/count", get_family_member_count),
+        Route("/api/family-members/{member_id:int}", get_family_member),
+        Route("/api/family-members/{member_id:int}/timeline", list_timeline),
+        Route("/api/family-members/{member_id:int}/documents", list_documents),
+        Route("/api/doctor-view/{member_uuid:str}", doctor_view_data),
+        Route("/api/summarizer/", summarize_pdf, methods=["POST"]),
+        Mount("/", WSGIMiddleware(flask_app)),  # everything else: the existing Flask routes
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["http://localhost:8080"], allow_credentials=True,
+                   allow_methods=["*"], allow_headers=["*"]),
+        Middleware(AuthMiddleware),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+import jwt
+from jwt.algorithms import HMACAlgorithm
+from flask import g, request, jsonify
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")
+JWT_ALGORITHM = "HS256"
+TOKEN_TTL_HOURS = 24
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "1") == "1"   # reject unauthenticated calls to non-public routes
+TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 4096))
+
+# Parsed once instead of on every decode
+SIGNING_KEY = HMACAlgorithm(HMACAlgorithm.SHA256).prepare_key(SECRET_KEY)
+
+PUBLIC_PATHS = ("/", "/signup", "/login")
+PUBLIC_PREFIXES = ("/doctor-view/", "/api/doctor-view/", "/adherence/ack/")  # ack links are HMAC-signed
+
+class AuthError(Exception):
+    pass
+
+# ---------------- VERIFIED TOKEN LRU ---------------- #
+class TokenCache:
+    """Small LRU of token -> claims so repeat requests skip signature verification."""
+
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            claims = self._data.get(token)
+            if claims is None:
+                self.misses += 1
+                return None
+            if claims["exp"] <= time.time():
+                del self._data[token]
+                self.misses += 1
+                return None
+            self._data.move_to_end(token)
+            self.hits += 1
+            return claims
+
+    def put(self, token, claims):
+        with self._lock:
+            self._data[token] = claims
+            self._data.move_to_end(token)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+token_cache = TokenCache()
+
+# ---------------- TOKENS ---------------- #
+def issue_token(user_id, email):
+    payload = {
+        "sub": str(user_id),
+        "user_id": user_id,
+        "email": email,
+        "exp": int(time.time()) + TOKEN_TTL_HOURS * 3600,
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+def verify_token(token):
+    """Return the token's claims, raising AuthError if it is invalid or expired."""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(
+            token,
+            SIGNING_KEY,
+            algorithms=[JWT_ALGORITHM],
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.PyJWTError as e:
+        raise AuthError(str(e))
+    token_cache.put(token, claims)
+    return claims
+
+# ---------------- MIDDLEWARE ---------------- #
+def _is_public(path):
+    return path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES)
+
+def authenticate():
+    """before_request hook: verify the bearer token once and attach the user to `g`."""
+    if request.method == "OPTIONS" or _is_public(request.path):
+        return None
+
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        if AUTH_REQUIRED:
+            return jsonify({"error": "Authentication required"}), 401
+        return None
+
+    try:
+        claims = verify_token(header[7:].strip())
+    except AuthError as e:
+        return jsonify({"error": f"Invalid token: {e}"}), 401
+
+    g.claims = claims
+    g.user_id = int(claims.get("user_id") or claims["sub"])
+    g.user_email = claims.get("email")
+
+    # A token holder may not ask for someone else's data
+    requested = request.args.get("user_id")
+    if requested and requested != str(g.user_id):
+        return jsonify({"error": "Forbidden"}), 403
+    return None
+
+def init_auth(app):
+    app.before_request(authenticate)
+
+def current_user_id():
+    """The verified token's user id, or None. A user_id sent by the caller is never trusted."""
+    return g.get("user_id")
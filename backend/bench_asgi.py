@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+# Benchmark: requests/s and server memory per concurrent connection, Flask (WSGI) vs. asgi.py.
+# Start both servers first, e.g.
+#   gunicorn -c gunicorn.conf.py app:app                  (port 8000)
+#   uvicorn asgi:app --port 8001 --workers 1
+# then: python bench_asgi.py --target wsgi=http://localhost:8000@<pid> --target asgi=http://localhost:8001@<pid>
+#       --path "/api/family-members?user_id=1"
+# psutil is only needed for the memory column (pass the server's master/worker pid).
+
+def rss_mb(pid):
+    if not pid:
+        return None
+    import psutil
+    process = psutil.Process(pid)
+    processes = [process] + process.children(recursive=True)
+    return sum(p.memory_info().rss for p in processes) / 1024 / 1024
+
+async def run_level(base_url, path, concurrency, total, pid):
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        remaining = iter(range(total))
+        idle_rss = peak_rss = rss_mb(pid)
+
+        async def user():
+            nonlocal errors, peak_rss
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+                if pid and len(latencies) % 50 == 0:
+                    peak_rss = max(peak_rss, rss_mb(pid))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    per_conn = (peak_rss - idle_rss) / concurrency * 1024 if pid else None
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+        "kb_per_conn": per_conn,
+    }
+
+def parse_target(value):
+    name, rest = value.split("=", 1)
+    url, _, pid = rest.partition("@")
+    return name, url, int(pid) if pid else None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", action="append", required=True, help="name=url[@server pid]")
+    parser.add_argument("--path", default="/api/family-members?user_id=1")
+    parser.add_argument("--concurrency", default="1,10,50,200")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for target in args.target:
+        name, url, pid = parse_target(target)
+        for level in [int(c) for c in args.concurrency.split(",")]:
+            r = asyncio.run(run_level(url, args.path, level, args.requests, pid))
+            memory = f"{r['kb_per_conn']:8.1f} KB/conn" if r["kb_per_conn"] is not None else ""
+            print(f"{name:>6} c={level:<4} {r['rps']:8.0f} req/s  p50 {r['p50_ms']:7.1f} ms  "
+                  f"p99 {r['p99_ms']:7.1f} ms  errors {r['errors']:<4} {memory}")
@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify
+from auth import init_auth, issue_token, token_cache, current_user_id
+
+# Benchmark: authenticated requests through the real before_request hook (header parsing,
+# verification, g) from concurrent clients, with the verified-token LRU off, cold and warm.
+# Uses Flask's test client, so it measures the per-request auth path without network noise.
+N_USERS = 500
+N_REQUESTS = 50000
+THREADS = 8
+
+app = Flask(__name__)
+init_auth(app)
+
+@app.route("/api/whoami")
+def whoami():
+    return jsonify({"user_id": current_user_id()})
+
+def worker(tokens, start, count):
+    client = app.test_client()
+    for i in range(start, start + count):
+        response = client.get("/api/whoami", headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+        assert response.status_code == 200, response.status_code
+
+def run(label, tokens):
+    per_thread = N_REQUESTS // THREADS
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        futures = [pool.submit(worker, tokens, t * per_thread, per_thread) for t in range(THREADS)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    total = per_thread * THREADS
+    print(f"{label:>26}: {total / elapsed:10,.0f} requests/s  ({elapsed / total * 1e6:.1f} µs each, {THREADS} threads)")
+
+if __name__ == "__main__":
+    tokens = [issue_token(uid, f"user{uid}@example.com") for uid in range(1, N_USERS + 1)]
+
+    size = token_cache.max_size
+    token_cache.max_size = 0            # every put is evicted at once: full verification per request
+    run("no token cache", tokens)
+    token_cache.max_size = size
+
+    run("token cache, cold start", tokens)   # first N_USERS requests verify, the rest hit
+    run("token cache, warm", tokens)
+    print(f"token cache: {token_cache.stats()}")
@@ -0,0 +1,81 @@
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+
+# Benchmark: summarization throughput for workers x torch threads x in-process concurrency.
+# Each configuration runs in fresh processes, like gunicorn workers, because torch's
+# thread pool size is fixed per process.
+SAMPLE = (
+    "HISTORY OF PRESENT ILLNESS: The patient is a 58-year-old male with a history of hypertension "
+    "and type 2 diabetes who presents with three days of progressive shortness of breath and "
+    "bilateral lower extremity edema. He reports orthopnea and paroxysmal nocturnal dyspnea. "
+    "ASSESSMENT: Chest x-ray shows cardiomegaly with small bilateral pleural effusions. BNP is "
+    "elevated at 1,240. Echocardiogram demonstrates an ejection fraction of 30 percent. "
+    "IMPRESSION: New onset heart failure with reduced ejection fraction, likely ischemic. "
+    "PLAN: Start IV furosemide, low-dose beta blocker and ACE inhibitor; cardiology consult for "
+    "ischemic evaluation; daily weights and strict intake and output monitoring."
+)
+
+def load_texts(folder, limit):
+    if not folder:
+        return [SAMPLE] * limit
+    from pdf_utils import extract_text_from_bytes
+    texts = []
+    for name in sorted(os.listdir(folder))[:limit]:
+        with open(os.path.join(folder, name), "rb") as f:
+            texts.append(extract_text_from_bytes(f.read()))
+    return texts
+
+def worker(args):
+    index, threads, concurrency, texts, profile = args
+    os.environ["TORCH_THREADS"] = str(threads)
+    os.environ["INFERENCE_CONCURRENCY"] = str(concurrency)
+    os.environ["WORKER_INDEX"] = str(index)
+    from summarizer import summarize_text  # applies the CPU policy from the env above
+
+    summarize_text(texts[0], profile=profile, adaptive=False)  # warm-up
+    latencies = []
+
+    def one(text):
+        start = time.perf_counter()
+        summarize_text(text, profile=profile, adaptive=False)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, texts))
+    return time.perf_counter() - start, latencies
+
+def run(workers, threads, concurrency, texts, profile):
+    # Split the documents across worker processes, as a load balancer would
+    shares = [texts[i::workers] for i in range(workers)]
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    with get_context("spawn").Pool(workers) as pool:
+        start = time.perf_counter()
+        results = pool.map(worker, [(i, threads, concurrency, share, profile) for i, share in enumerate(shares)])
+        elapsed = time.perf_counter() - start
+    latencies = sorted(l for _, ls in results for l in ls)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(f"workers={workers:<2} threads={threads:<2} concurrency={concurrency:<2} "
+          f"{len(texts) / max(r[0] for r in results):6.2f} docs/s  "
+          f"p50 {statistics.median(latencies):6.2f}s  p95 {p95:6.2f}s  (wall {elapsed:.1f}s incl. model load)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", help="folder of PDFs to summarize (default: a built-in sample)")
+    parser.add_argument("--docs", type=int, default=16)
+    parser.add_argument("--profile", default="fast")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    texts = load_texts(args.reports, args.docs)
+    print(f"{cores} cores, {len(texts)} documents, profile={args.profile}")
+
+    # Oversubscribed (every worker uses all cores) vs. the policy's even split
+    configs = {(1, cores, 1), (1, cores, 2), (2, cores, 1), (2, max(1, cores // 2), 1),
+               (max(1, cores // 2), 2, 1), (cores, 1, 1)}
+    for workers, threads, concurrency in sorted(configs):
+        run(workers, threads, concurrency, texts, args.profile)
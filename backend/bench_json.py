@@ -0,0 +1,68 @@
+import datetime
+import decimal
+import json
+import random
+import time
+from json_provider import dumps_bytes
+
+# Benchmark: old per-row isoformat loops + stdlib json vs. the orjson provider
+N_ROWS = 20000
+ROUNDS = 5
+
+def make_timeline(n):
+    base = datetime.date(2015, 1, 1)
+    return [{
+        "id": i,
+        "title": f"Follow-up visit {i}",
+        "event_type": random.choice(["Checkup", "Surgery", "Diagnosis", "Vaccination"]),
+        "event_date": base + datetime.timedelta(days=i % 3650),
+        "severity": random.choice(["Low", "Medium", "High", None]),
+        "notes": "Patient reports improvement. Continue current medication." * 2,
+        "created_at": datetime.datetime(2024, 1, 1, 9, 30) + datetime.timedelta(minutes=i),
+    } for i in range(n)]
+
+def make_reminders(n):
+    return [{
+        "id": i,
+        "title": f"Metformin {i}",
+        "reminder_type": "Medication",
+        "start_date": datetime.date(2024, 1, 1),
+        "end_date": datetime.date(2025, 1, 1) if i % 2 else None,
+        "reminder_time": datetime.timedelta(hours=8, minutes=i % 60),
+        "frequency": "Daily",
+        "dosage": decimal.Decimal("500.0"),
+        "notes": "After breakfast",
+        "day_of_week": None,
+        "day_of_month": None,
+        "created_at": datetime.datetime(2024, 1, 1, 9, 30),
+        "is_active": 1,
+    } for i in range(n)]
+
+# ---------------- OLD PATH ---------------- #
+def legacy_serialize(obj):
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    elif isinstance(obj, datetime.timedelta):
+        return str(obj)
+    elif isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return obj
+
+def legacy_dumps(rows):
+    converted = [{k: legacy_serialize(v) for k, v in r.items()} for r in rows]
+    return json.dumps(converted).encode("utf-8")
+
+def timeit(fn, rows):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        out = fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best, len(out)
+
+if __name__ == "__main__":
+    for name, rows in (("timeline", make_timeline(N_ROWS)), ("reminders", make_reminders(N_ROWS))):
+        legacy_t, legacy_size = timeit(legacy_dumps, rows)
+        fast_t, fast_size = timeit(dumps_bytes, rows)
+        print(f"{name:>10}: {N_ROWS} rows | legacy {legacy_t * 1000:7.1f} ms ({legacy_size / 1e6:.1f} MB) | "
+              f"orjson {fast_t * 1000:7.1f} ms ({fast_size / 1e6:.1f} MB) | {legacy_t / fast_t:.1f}x faster")
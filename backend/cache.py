@@ -0,0 +1,211 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+# "memory" or "redis". With more than one worker process Redis is required: an in-process
+# cache would serve stale entries after another worker's write, and read-your-writes
+# stickiness (db.py) would only hold within the worker that took the write.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis" if WEB_WORKERS > 1 else "memory")
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")  # any Redis-compatible server
+CACHE_TTL = int(os.getenv("CACHE_TTL", 60))                     # seconds
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+COUNTER_TTL = int(os.getenv("CACHE_COUNTER_TTL", 300))          # counters are re-seeded from the DB after this
+
+# ---------------- IN-PROCESS BACKEND ---------------- #
+class MemoryBackend:
+    """TTL + LRU dict. Namespace generations and counters live outside the LRU so they are never evicted."""
+
+    name = "memory"
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._generations = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def get_counter(self, name):
+        item = self._counters.get(name)
+        if item is None or item[1] < time.monotonic():
+            return None
+        return item[0]
+
+    def seed_counter(self, name, value, ttl):
+        with self._lock:
+            self._counters[name] = (value, time.monotonic() + ttl)
+
+    def incr_counter(self, name, amount):
+        with self._lock:
+            item = self._counters.get(name)
+            if item is not None:
+                self._counters[name] = (item[0] + amount, item[1])
+
+    def size(self):
+        return len(self._data)
+
+# ---------------- REDIS BACKEND ---------------- #
+class RedisBackend:
+    """Shared cache for multi-worker deployments. Eviction is left to the server's maxmemory policy."""
+
+    name = "redis"
+
+    def __init__(self, url=CACHE_URL):
+        import redis  # optional dependency
+        self._redis = redis.Redis.from_url(url)
+        self._redis.ping()
+
+    @property
+    def evictions(self):
+        return self._redis.info("stats").get("evicted_keys", 0)
+
+    def get(self, key):
+        raw = self._redis.get(key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._redis.set(key, pickle.dumps(value), ex=ttl)
+
+    def generation(self, namespace):
+        return int(self._redis.get(f"gen:{namespace}") or 0)
+
+    def bump_generation(self, namespace):
+        self._redis.incr(f"gen:{namespace}")
+
+    def get_counter(self, name):
+        raw = self._redis.get(f"counter:{name}")
+        return int(raw) if raw is not None else None
+
+    def seed_counter(self, name, value, ttl):
+        self._redis.set(f"counter:{name}", value, ex=ttl, nx=True)
+
+    def incr_counter(self, name, amount):
+        # Only bump a seeded counter; INCR on a missing key would start from 0
+        self._redis.eval(
+            "if redis.call('EXISTS', KEYS[1]) == 1 then return redis.call('INCRBY', KEYS[1], ARGV[1]) end",
+            1, f"counter:{name}", amount,
+        )
+
+    def size(self):
+        return self._redis.dbsize()
+
+# ---------------- CACHE FRONT ---------------- #
+class Cache:
+    """
+    Namespaced read-through cache. Writers call `invalidate(namespace)`, which bumps the
+    namespace generation so every key under it misses without scanning for keys.
+    """
+
+    def __init__(self, backend, ttl=CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._stats_lock = threading.Lock()  # += is not atomic across request threads
+
+    def _record(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _key(self, namespace, key):
+        return f"{namespace}:{self.backend.generation(namespace)}:{key}"
+
+    def get(self, namespace, key):
+        value = self.backend.get(self._key(namespace, key))
+        self._record(value is not None)
+        return value
+
+    def set(self, namespace, key, value, ttl=None):
+        self.backend.set(self._key(namespace, key), value, ttl or self.ttl)
+
+    def invalidate(self, namespace):
+        with self._stats_lock:
+            self.invalidations += 1
+        self.backend.bump_generation(namespace)
+
+    def counter(self, name, loader):
+        """Return a maintained counter, seeding it from `loader()` when missing or expired."""
+        value = self.backend.get_counter(name)
+        self._record(value is not None)
+        if value is None:
+            self.backend.seed_counter(name, loader(), COUNTER_TTL)
+            value = self.backend.get_counter(name)
+        return value
+
+    def incr_counter(self, name, amount=1):
+        self.backend.incr_counter(name, amount)
+
+    def stats(self):
+        with self._stats_lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        lookups = hits + misses
+        return {
+            "backend": self.backend.name,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "invalidations": invalidations,
+            "entries": self.backend.size(),
+            "ttl": self.ttl,
+        }
+
+def _make_backend():
+    if CACHE_BACKEND == "redis":
+        try:
+            return RedisBackend()
+        except Exception as e:
+            print(f"⚠️ Redis cache unavailable ({e}), falling back to in-process cache")
+            if WEB_WORKERS > 1:
+                print(f"⚠️ {WEB_WORKERS} workers without a shared cache: reads may be stale "
+                      "across workers until entries expire")
+    return MemoryBackend()
+
+cache = Cache(_make_backend())
+
+# ---------------- KEYS ---------------- #
+FAMILY_MEMBERS_TOTAL = "family_members:total"
+
+def members_namespace(user_id):
+    return f"members:{user_id}"
+
+def upcoming_namespace(user_id):
+    return f"upcoming:{user_id}"
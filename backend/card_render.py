@@ -0,0 +1,70 @@
+import io
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Card rendering only. Runs inside the spawned render workers (see emergency_card.get_pool),
+# so it must not import db, cache or anything else that connects at import time.
+
+# The QR opens the backend redirect, which forwards to the frontend doctor view
+DOCTOR_VIEW_BASE_URL = os.getenv("DOCTOR_VIEW_BASE_URL", "http://localhost:8000")
+
+def doctor_view_url(card) -> str:
+    return f"{DOCTOR_VIEW_BASE_URL}/doctor-view/{card['uuid']}"
+
+def render_qr(url) -> bytes:
+    import qrcode
+    image = qrcode.make(url, box_size=8, border=2)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def render_card(card):
+    """Wallet-size (CR80, 85.6 x 54 mm) card PDF and the QR PNG, for one member."""
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    qr_png = render_qr(doctor_view_url(card))
+    width, height = 85.6 * mm, 54 * mm
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(width, height))
+    pdf.setTitle(f"Emergency card - {card['name']}")
+
+    # Header band
+    pdf.setFillColorRGB(0.78, 0.1, 0.1)
+    pdf.rect(0, height - 10 * mm, width, 10 * mm, stroke=0, fill=1)
+    pdf.setFillColorRGB(1, 1, 1)
+    pdf.setFont("Helvetica-Bold", 9)
+    pdf.drawString(4 * mm, height - 6.5 * mm, "EMERGENCY HEALTH CARD")
+    pdf.drawRightString(width - 4 * mm, height - 6.5 * mm, f"Blood: {card.get('blood_group') or '-'}")
+
+    # QR on the right, details on the left
+    qr_size = 30 * mm
+    pdf.drawImage(ImageReader(io.BytesIO(qr_png)), width - qr_size - 3 * mm, 4 * mm, qr_size, qr_size)
+
+    pdf.setFillColorRGB(0, 0, 0)
+    pdf.setFont("Helvetica-Bold", 8)
+    y = height - 15 * mm
+    pdf.drawString(4 * mm, y, (card["name"] or "")[:32])
+    details = [
+        ("Age/Sex", f"{card.get('age') or '-'} / {card.get('gender') or '-'}"),
+        ("Allergies", card.get("allergies")),
+        ("Conditions", card.get("medical_conditions")),
+        ("Medicines", card.get("ongoing_medicines")),
+        ("Contact", " ".join(filter(None, [card.get("emergency_contact_name"), card.get("emergency_contact_phone")]))),
+        ("Doctor", " ".join(filter(None, [card.get("doctor_name"), card.get("doctor_phone")]))),
+    ]
+    for label, value in details:
+        y -= 4.6 * mm
+        pdf.setFont("Helvetica-Bold", 5.5)
+        pdf.drawString(4 * mm, y, f"{label}:")
+        pdf.setFont("Helvetica", 5.5)
+        pdf.drawString(16 * mm, y, (value or "-")[:40])
+
+    pdf.setFont("Helvetica", 4.5)
+    pdf.drawString(4 * mm, 2.5 * mm, "Scan for full medical history")
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue(), qr_png
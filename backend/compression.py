@@ -0,0 +1,191 @@
+import os
+import re
+import threading
+import time
+import zlib
+from flask import request
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))   # below this the headers cost more than we save
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+ZSTD_LEVEL = int(os.getenv("COMPRESS_ZSTD_LEVEL", 3))
+# Already compressed formats are sent as they are
+SKIP_MIMETYPES = ("application/pdf", "application/zip", "application/gzip", "image/", "video/", "audio/")
+
+try:
+    import zstandard  # optional
+except ImportError:
+    zstandard = None
+try:
+    import brotli  # optional
+except ImportError:
+    brotli = None
+
+# Server preference when the client ranks encodings equally
+ENCODINGS = [name for name, lib in (("zstd", zstandard), ("br", brotli), ("gzip", zlib)) if lib is not None]
+
+# ---------------- CODECS ---------------- #
+def compress_bytes(data, encoding):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    gz = gzip_stream()
+    return gz.compress(data) + gz.flush()
+
+def gzip_stream():
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits=31: gzip container
+
+class StreamCompressor:
+    """Incremental compressor; each chunk is flushed so the client can use it immediately."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._obj = gzip_stream()
+
+    def chunk(self, data):
+        if self.encoding == "zstd":
+            return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+def choose_encoding(accept_encoding):
+    """Best available encoding by the client's q-values; None for identity."""
+    ranked = {}
+    for part in (accept_encoding or "").split(","):
+        fields = part.strip().split(";")
+        name = fields[0].strip().lower()
+        q = 1.0
+        for param in fields[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            ranked[name] = q
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = ranked.get(name, ranked.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+# ---------------- STATS ---------------- #
+class CompressionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, encoding, bytes_in, bytes_out, cpu_seconds):
+        with self._lock:
+            entry = self._routes.setdefault(route, {"responses": 0, "bytes_in": 0, "bytes_out": 0,
+                                                    "cpu_seconds": 0.0, "encodings": {}})
+            entry["responses"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            entry["cpu_seconds"] += cpu_seconds
+            entry["encodings"][encoding] = entry["encodings"].get(encoding, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            routes = {}
+            for route, e in self._routes.items():
+                routes[route] = {
+                    "responses": e["responses"],
+                    "encodings": dict(e["encodings"]),
+                    "kb_in": round(e["bytes_in"] / 1024, 1),
+                    "kb_out": round(e["bytes_out"] / 1024, 1),
+                    "ratio": round(e["bytes_in"] / e["bytes_out"], 2) if e["bytes_out"] else None,
+                    "cpu_ms_per_response": round(e["cpu_seconds"] / e["responses"] * 1000, 3),
+                    "cpu_ms_per_mb": round(e["cpu_seconds"] * 1000 / (e["bytes_in"] / 1024 / 1024), 1)
+                    if e["bytes_in"] else None,
+                }
+            return {"encodings": ENCODINGS, "min_bytes": COMPRESS_MIN_BYTES, "routes": routes}
+
+compression_stats = CompressionStats()
+
+# ---------------- MIDDLEWARE ---------------- #
+ETAG_SUFFIX = re.compile(r'-(?:%s)"' % "|".join(["zstd", "br", "gzip"]))
+
+def strip_encoding_from_etags():
+    """before_request: compare If-None-Match against the handler's own (unsuffixed) ETag."""
+    header = request.environ.get("HTTP_IF_NONE_MATCH")
+    if header and ETAG_SUFFIX.search(header):
+        request.environ["HTTP_IF_NONE_MATCH"] = ETAG_SUFFIX.sub('"', header)
+
+def compress_response(response):
+    response.vary.add("Accept-Encoding")
+    if (request.method == "HEAD"
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough  # send_file: PDFs, images, cached cards
+            or (response.mimetype or "").startswith(SKIP_MIMETYPES)):
+        return response
+
+    encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+    route = request.url_rule.rule if request.url_rule else request.path
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, route)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        started = time.thread_time()
+        compressed = compress_bytes(data, encoding)
+        compression_stats.record(route, encoding, len(data), len(compressed), time.thread_time() - started)
+        response.set_data(compressed)
+
+    response.headers["Content-Encoding"] = encoding
+    # The encoded body is a different representation, so it needs a different ETag
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+def _compress_stream(chunks, encoding, route):
+    compressor = StreamCompressor(encoding)
+    bytes_in = bytes_out = 0
+    cpu = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            started = time.thread_time()
+            out = compressor.chunk(chunk)
+            cpu += time.thread_time() - started
+            bytes_in += len(chunk)
+            bytes_out += len(out)
+            if out:
+                yield out
+        tail = compressor.finish()
+        bytes_out += len(tail)
+        yield tail
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+        compression_stats.record(route, encoding, bytes_in, bytes_out, cpu)
+
+def init_compression(app):
+    app.before_request(strip_encoding_from_etags)
+    app.after_request(compress_response)
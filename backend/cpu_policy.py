@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        return os.cpu_count() or 1
+
+CPU_CORES = available_cores()
+WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))        # gunicorn worker processes on this host
+# Each worker gets an even share of the cores, so workers x threads never exceeds the host
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", 0)) or max(1, CPU_CORES // WEB_WORKERS)
+TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", 1))
+# Generations allowed to run at once in this process; the rest wait for a slot
+INFERENCE_CONCURRENCY = max(1, int(os.getenv("INFERENCE_CONCURRENCY", 1)))
+CPU_PINNING = os.getenv("CPU_PINNING", "0") == "1"
+WORKER_INDEX = int(os.getenv("WORKER_INDEX", 0))                   # set by gunicorn.conf.py post_fork
+
+def worker_cores(index=WORKER_INDEX, threads=TORCH_THREADS, cores=CPU_CORES):
+    """Contiguous block of cores for one worker, wrapping around when workers outnumber blocks."""
+    ordered = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(cores))
+    blocks = max(1, len(ordered) // threads)
+    start = (index % blocks) * threads
+    return set(ordered[start:start + threads])
+
+_applied = False
+
+def apply_policy():
+    """Configure torch for this process. Must run before the first inference."""
+    global _applied
+    if _applied:
+        return
+    _applied = True
+
+    import torch
+    torch.set_num_threads(TORCH_THREADS)
+    try:
+        torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+    except RuntimeError:
+        pass  # already started parallel work; interop pool size is fixed from then on
+
+    pinned = None
+    if CPU_PINNING and hasattr(os, "sched_setaffinity"):
+        pinned = worker_cores()
+        os.sched_setaffinity(0, pinned)
+    print(f"⚙️ CPU policy: {CPU_CORES} cores, {WEB_WORKERS} workers, {TORCH_THREADS} torch threads, "
+          f"{INFERENCE_CONCURRENCY} concurrent inferences" + (f", pinned to {sorted(pinned)}" if pinned else ""))
+
+# ---------------- INFERENCE SLOTS ---------------- #
+class InferenceGate:
+    """Semaphore around model calls, with counters for how long requests wait for a slot."""
+
+    def __init__(self, slots=INFERENCE_CONCURRENCY):
+        self.slots = slots
+        self._semaphore = threading.BoundedSemaphore(slots)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.wait_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    @contextmanager
+    def slot(self, timeout=None):
+        """Hold a slot for the block; TimeoutError if none frees up within `timeout` seconds."""
+        with self._lock:
+            self.waiting += 1
+        queued = time.perf_counter()
+        acquired = self._semaphore.acquire(timeout=timeout)
+        started = time.perf_counter()
+        with self._lock:
+            self.waiting -= 1
+            if acquired:
+                self.active += 1
+                self.wait_seconds += started - queued
+            else:
+                self.timed_out += 1
+        if not acquired:
+            raise TimeoutError(f"No inference slot free within {timeout:.1f}s")
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.busy_seconds += time.perf_counter() - started
+
+    def stats(self):
+        with self._lock:
+            return {
+                "cores": CPU_CORES,
+                "workers": WEB_WORKERS,
+                "worker_index": WORKER_INDEX,
+                "torch_threads": TORCH_THREADS,
+                "slots": self.slots,
+                "active": self.active,
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "timed_out": self.timed_out,
+                "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 1) if self.completed else 0.0,
+                "avg_busy_ms": round(self.busy_seconds / self.completed * 1000, 1) if self.completed else 0.0,
+            }
+
+gate = InferenceGate()
@@ -1,18 +1,167 @@
+import itertools
+import os
+import threading
+import time
 import mysql.connector
 from mysql.connector import Error
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+# Primary (all writes). Shared with the async pool in asgi.py
+DB_PASSWORD = os.getenv("DB_PASSWORD")  # set it in backend/.env; an empty value is allowed
+if DB_PASSWORD is None:
+    raise RuntimeError("DB_PASSWORD is not set (add it to backend/.env)")
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", 3306)),
+    "user": os.getenv("DB_USER", "root"),                 # Your MySQL username
+    "password": DB_PASSWORD,
+    "database": os.getenv("DB_NAME", "parivar_db"),
+}
+# Read replicas as "host[:port],host[:port]" (same credentials as the primary).
+# "simulated" points a replica at the primary with DB_SIMULATED_LAG seconds of pretend lag,
+# to exercise routing and fallback locally with a single MySQL.
+DB_REPLICAS = [r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()]
+DB_SIMULATED_LAG = float(os.getenv("DB_SIMULATED_LAG", 0))
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 5))   # seconds; lagging replicas are skipped
+DB_LAG_CHECK_SECONDS = float(os.getenv("DB_LAG_CHECK_SECONDS", 2))
+REPLICA_CONNECT_TIMEOUT = 2
 
 def get_db_connection():
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",             # Your MySQL username
-            password="Manusri#874",  # Your MySQL password
-            database="parivar_db"
-        )
+        connection = mysql.connector.connect(**DB_CONFIG)
         return connection
     except Error as e:
         print("Database connection error:", e)
         return None
+
+# ---------------- REPLICAS ---------------- #
+class Replica:
+    def __init__(self, spec):
+        self.name = spec
+        self.simulated = spec == "simulated"
+        config = dict(DB_CONFIG)
+        if not self.simulated:
+            host, _, port = spec.partition(":")
+            config.update(host=host, port=int(port or 3306))
+        config["connection_timeout"] = REPLICA_CONNECT_TIMEOUT
+        self.config = config
+        # (healthy, lag seconds or None), replaced as one tuple so readers never see a half update
+        self.state = (False, None)
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self):
+        return self.state[0]
+
+    @property
+    def lag(self):
+        return self.state[1]
+
+    def mark_unhealthy(self):
+        self.state = (False, None)
+
+    def connect(self):
+        return mysql.connector.connect(**self.config)
+
+    def _measure_lag(self):
+        if self.simulated:
+            return DB_SIMULATED_LAG
+        conn = self.connect()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")        # MySQL 8.0.22+
+            except Error:
+                cursor.execute("SHOW SLAVE STATUS")          # MariaDB / older MySQL
+            status = cursor.fetchone()
+            cursor.close()
+        finally:
+            conn.close()
+        if not status:
+            return None
+        lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        return float(lag) if lag is not None else None
+
+    def usable(self):
+        """Healthy and within the lag budget; lag is re-measured at most every DB_LAG_CHECK_SECONDS."""
+        now = time.monotonic()
+        if now - self.checked_at >= DB_LAG_CHECK_SECONDS and self._lock.acquire(blocking=False):
+            # One thread refreshes; the others use the last measurement
+            try:
+                lag = self._measure_lag()
+                self.state = (lag is not None, lag)
+            except Error as e:
+                if self.healthy:
+                    print(f"⚠️ Replica {self.name} unavailable: {e}")
+                self.mark_unhealthy()
+            finally:
+                self.checked_at = time.monotonic()
+                self._lock.release()
+        healthy, lag = self.state
+        return healthy and lag is not None and lag <= DB_REPLICA_MAX_LAG
+
+class ReadRouter:
+    """
+    Round-robin over usable replicas. The caller says whether the session wrote recently
+    (sticky), in which case the read goes to the primary; see read_routing.py.
+    """
+
+    def __init__(self, specs=DB_REPLICAS):
+        self.replicas = [Replica(spec) for spec in specs]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.counts = {"replica": 0, "primary_sticky": 0, "primary_fallback": 0, "primary_no_replicas": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def connection(self, sticky=False):
+        if not self.replicas:
+            self._count("primary_no_replicas")
+            return get_db_connection()
+        if sticky:
+            self._count("primary_sticky")
+            return get_db_connection()
+
+        start = next(self._next)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if not replica.usable():
+                continue
+            try:
+                conn = replica.connect()
+                self._count("replica")
+                return conn
+            except Error as e:
+                print(f"⚠️ Replica {replica.name} connect failed: {e}")
+                replica.mark_unhealthy()
+        self._count("primary_fallback")
+        return get_db_connection()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+        return {
+            "replicas": [
+                {"name": r.name, "healthy": healthy, "lag_seconds": lag,
+                 "checked_seconds_ago": round(time.monotonic() - r.checked_at, 1) if r.checked_at else None}
+                for r, (healthy, lag) in ((r, r.state) for r in self.replicas)
+            ],
+            "max_lag_seconds": DB_REPLICA_MAX_LAG,
+            "reads": counts,
+        }
+
+read_router = ReadRouter()
+
+def get_read_connection(sticky=False):
+    """Connection for read-only queries: a replica unless sticky is set or none is usable."""
+    return read_router.connection(sticky)
+
 if __name__ == "__main__":
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -20,3 +169,5 @@ if __name__ == "__main__":
     print("Connected to database:", cursor.fetchone())
     cursor.close()
     conn.close()
+    for replica in read_router.replicas:
+        print(f"Replica {replica.name}: usable={replica.usable()} lag={replica.lag}")
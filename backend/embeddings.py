@@ -0,0 +1,267 @@
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from dotenv import load_dotenv
+from db import get_db_connection
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+# Local path or hub id of a small CPU sentence-embedding model
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+ANN_THRESHOLD = int(os.getenv("EMBEDDING_ANN_THRESHOLD", 5000))   # vectors per family before switching to HNSW
+MAX_CACHED_FAMILIES = int(os.getenv("EMBEDDING_MAX_CACHED_FAMILIES", 200))
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 20
+PREVIEW_CHARS = 300
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    global _model
+    with _model_lock:
+        if _model is None:
+            from sentence_transformers import SentenceTransformer
+            _model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+    return _model
+
+def embed(texts):
+    """Unit-normalised float32 embeddings, so cosine similarity is a dot product."""
+    vectors = get_model().encode(texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+    return vectors.astype(np.float32)
+
+def chunk_text(text, words=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    tokens = text.split()
+    if len(tokens) <= words:
+        return [" ".join(tokens)] if tokens else []
+    step = words - overlap
+    return [" ".join(tokens[i:i + words]) for i in range(0, len(tokens) - overlap, step)]
+
+# ---------------- PER-FAMILY INDEX ---------------- #
+class FamilyIndex:
+    """Vectors of one user's records: NumPy brute force when small, HNSW when large."""
+
+    def __init__(self, meta, vectors):
+        self.meta = meta            # [(source, source_id, family_member_id, preview)], None once removed
+        self.vectors = vectors      # (n, dim) float32, normalised
+        self.removed = 0
+        self.ann = None
+        self.lock = threading.Lock()
+        self._maybe_build_ann()
+
+    def _maybe_build_ann(self):
+        if self.ann is not None or len(self.meta) < ANN_THRESHOLD:
+            return
+        try:
+            import hnswlib  # optional dependency
+        except ImportError:
+            return
+        ann = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+        ann.init_index(max_elements=max(len(self.meta) * 2, 1024), ef_construction=200, M=16)
+        ann.add_items(self.vectors, np.arange(len(self.meta)))
+        ann.set_ef(64)
+        self.ann = ann
+
+    def add(self, meta, vectors):
+        with self.lock:
+            start = len(self.meta)
+            self.meta.extend(meta)
+            self.vectors = np.vstack([self.vectors, vectors]) if len(self.vectors) else vectors
+            if self.ann is not None:
+                if self.ann.get_max_elements() < len(self.meta):
+                    self.ann.resize_index(len(self.meta) * 2)
+                self.ann.add_items(vectors, np.arange(start, len(self.meta)))
+            else:
+                self._maybe_build_ann()
+
+    def remove(self, source, source_id):
+        """
+        Drop a record's chunks. Positions are HNSW labels, so rows are tombstoned rather
+        than compacted: the meta entry becomes None and the label is marked deleted.
+        """
+        with self.lock:
+            for pos, m in enumerate(self.meta):
+                if m is not None and m[0] == source and m[1] == source_id:
+                    self.meta[pos] = None
+                    self.removed += 1
+                    if self.ann is not None:
+                        self.ann.mark_deleted(pos)
+
+    def query(self, vector, k):
+        with self.lock:
+            k = min(k, len(self.meta) - self.removed)
+            if k <= 0:
+                return []
+            if self.ann is not None:
+                labels, distances = self.ann.knn_query(vector, k=k)
+                return [(int(i), 1.0 - float(d)) for i, d in zip(labels[0], distances[0])]
+            scores = self.vectors @ vector
+            if self.removed:
+                scores[[m is None for m in self.meta]] = -np.inf
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(i), float(scores[i])) for i in top]
+
+# ---------------- STORE ---------------- #
+class EmbeddingStore:
+    """Loads family indexes from `record_embeddings` on first use and keeps an LRU of them in memory."""
+
+    def __init__(self, max_families=MAX_CACHED_FAMILIES):
+        self.max_families = max_families
+        self._families = OrderedDict()
+        self._lock = threading.Lock()
+        # Embedding on insert happens here, never on the request thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+    def _load(self, user_id):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT source, source_id, family_member_id, preview, vector
+            FROM record_embeddings
+            WHERE user_id = %s
+            ORDER BY id
+            """,
+            (user_id,),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        meta = [(r[0], r[1], r[2], r[3]) for r in rows]
+        vectors = np.vstack([np.frombuffer(r[4], dtype=np.float32) for r in rows]) if rows else np.zeros((0, 0), np.float32)
+        return FamilyIndex(meta, vectors)
+
+    def family(self, user_id):
+        key = str(user_id)
+        with self._lock:
+            index = self._families.get(key)
+            if index is not None:
+                self._families.move_to_end(key)
+                return index
+        index = self._load(user_id)
+        with self._lock:
+            self._families[key] = index
+            while len(self._families) > self.max_families:
+                self._families.popitem(last=False)
+        return index
+
+    def _index_record(self, family_member_id, source, source_id, text):
+        chunks = chunk_text(text)
+        if not chunks:
+            return
+        vectors = embed(chunks)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT user_id FROM family_members WHERE id=%s", (family_member_id,))
+        owner = cursor.fetchone()
+        if not owner:
+            cursor.close()
+            conn.close()
+            return
+        user_id = owner[0]
+        cursor.execute("DELETE FROM record_embeddings WHERE source=%s AND source_id=%s", (source, source_id))
+        cursor.executemany(
+            """
+            INSERT INTO record_embeddings
+            (user_id, family_member_id, source, source_id, chunk_index, preview, vector)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            [(user_id, family_member_id, source, source_id, i, chunk[:PREVIEW_CHARS], vec.tobytes())
+             for i, (chunk, vec) in enumerate(zip(chunks, vectors))],
+        )
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        # Incremental update of an already-loaded family index; a re-indexed record
+        # replaces its old chunks instead of adding a second copy
+        with self._lock:
+            loaded = self._families.get(str(user_id))
+        if loaded is not None:
+            loaded.remove(source, source_id)
+            loaded.add([(source, source_id, family_member_id, c[:PREVIEW_CHARS]) for c in chunks], vectors)
+
+    def delete_record(self, cursor, source, source_id):
+        """Delete a record's embeddings in the caller's transaction; call forget() once it commits."""
+        cursor.execute("DELETE FROM record_embeddings WHERE source=%s AND source_id=%s", (source, source_id))
+
+    def forget(self, user_id, source, source_id):
+        """Drop a deleted record from the family's index, if it is loaded."""
+        with self._lock:
+            loaded = self._families.get(str(user_id))
+        if loaded is not None:
+            loaded.remove(source, source_id)
+
+    def index_record(self, family_member_id, source, source_id, text):
+        """Queue a timeline entry or document for embedding."""
+        def job():
+            try:
+                self._index_record(family_member_id, source, source_id, text)
+            except Exception as e:
+                print(f"❌ Embedding failed for {source} {source_id}: {e}")
+                traceback.print_exc()
+        self._executor.submit(job)
+
+    def related(self, user_id, query_text=None, source=None, source_id=None, k=10):
+        """Records most similar to free text, or to an existing record (its first chunk)."""
+        index = self.family(user_id)
+        if query_text:
+            vector = embed([query_text])[0]
+        else:
+            positions = [i for i, m in enumerate(index.meta) if m is not None and m[0] == source and m[1] == source_id]
+            if not positions:
+                return []
+            vector = index.vectors[positions[0]]
+
+        # Over-fetch because several chunks of one document can match
+        results, seen = [], set()
+        for pos, score in index.query(vector, k * 3):
+            entry = index.meta[pos]
+            if entry is None:  # removed after the query
+                continue
+            src, src_id, member_id, preview = entry
+            if (src, src_id) in seen or (src == source and src_id == source_id):
+                continue
+            seen.add((src, src_id))
+            results.append({
+                "source": src,
+                "id": src_id,
+                "family_member_id": member_id,
+                "preview": preview,
+                "score": round(score, 4),
+            })
+            if len(results) == k:
+                break
+        return results
+
+store = EmbeddingStore()
+
+# ---------------- BACKFILL ---------------- #
+def rebuild_all():
+    """Embed every timeline entry and ingested document (run once after enabling the feature)."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, family_member_id, title, event_type, notes FROM medical_timeline")
+    timeline = cursor.fetchall()
+    cursor.execute(
+        "SELECT id, family_member_id, title, extracted_text FROM medical_documents "
+        "WHERE ingest_status = 'done' AND extracted_text <> ''"
+    )
+    documents = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    for entry_id, member_id, title, event_type, notes in timeline:
+        store._index_record(member_id, "timeline", entry_id, f"{title}. {event_type}. {notes or ''}")
+    for doc_id, member_id, title, text in documents:
+        store._index_record(member_id, "document", doc_id, f"{title}. {text}")
+    print(f"✅ Embedded {len(timeline)} timeline entries and {len(documents)} documents")
+
+if __name__ == "__main__":
+    rebuild_all()
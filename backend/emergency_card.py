@@ -0,0 +1,137 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from db import get_db_connection
+from json_provider import dumps_bytes
+from card_render import render_card
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+CARD_CACHE_DIR = os.getenv("CARD_CACHE_DIR", "uploads/cards")
+CARD_RENDER_WORKERS = int(os.getenv("CARD_RENDER_WORKERS", 2))
+RENDER_VERSION = "1"  # bump when the layout changes so cached cards are re-rendered
+
+os.makedirs(CARD_CACHE_DIR, exist_ok=True)
+
+CARD_FIELDS = """
+    SELECT fm.id AS member_id, fm.name, fm.age, fm.gender, fm.relation, fm.uuid,
+           c.blood_group, c.allergies, c.ongoing_medicines, c.medical_conditions,
+           c.emergency_contact_name, c.emergency_contact_phone, c.doctor_name, c.doctor_phone
+    FROM family_members fm
+    LEFT JOIN emergency_health_cards c ON c.member_id = fm.id
+"""
+
+def fetch_card(member_id, user_id):
+    """The member's card, only if the member belongs to user_id."""
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(CARD_FIELDS + " WHERE fm.id = %s AND fm.user_id = %s", (member_id, user_id))
+    card = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return card
+
+def fetch_family_cards(user_id):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(CARD_FIELDS + " WHERE fm.user_id = %s ORDER BY fm.id", (user_id,))
+    cards = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return cards
+
+def card_version(card) -> str:
+    """Content hash of everything printed on the card; doubles as the ETag."""
+    return hashlib.sha1(RENDER_VERSION.encode() + dumps_bytes(card)).hexdigest()[:20]
+
+# ---------------- DISK CACHE ---------------- #
+def _paths(member_id, version):
+    base = os.path.join(CARD_CACHE_DIR, f"{member_id}-{version}")
+    return base + ".pdf", base + ".png"
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def store_rendered(member_id, version, pdf_bytes, png_bytes):
+    """Write the new files, then drop older versions of this member's card."""
+    pdf_path, png_path = _paths(member_id, version)
+    _write_atomic(pdf_path, pdf_bytes)
+    _write_atomic(png_path, png_bytes)
+    invalidate(member_id, keep=version)
+
+def invalidate(member_id, keep=None):
+    prefix = f"{member_id}-"
+    for name in os.listdir(CARD_CACHE_DIR):
+        if name.startswith(prefix) and (keep is None or not name.startswith(f"{prefix}{keep}.")):
+            try:
+                os.remove(os.path.join(CARD_CACHE_DIR, name))
+            except FileNotFoundError:
+                pass
+
+def get_rendered(card, kind):
+    """Path of the cached PDF ("pdf") or QR ("png"), rendering it first if this version is new."""
+    version = card_version(card)
+    pdf_path, png_path = _paths(card["member_id"], version)
+    if not (os.path.exists(pdf_path) and os.path.exists(png_path)):
+        pdf_bytes, png_bytes = render_card(card)
+        store_rendered(card["member_id"], version, pdf_bytes, png_bytes)
+    return (pdf_path if kind == "pdf" else png_path), version
+
+# ---------------- BATCH ---------------- #
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: this process already runs scheduler, ingestion and torch threads.
+            # Workers only unpickle card_render.render_card, so they never import db or cache
+            _pool = ProcessPoolExecutor(max_workers=CARD_RENDER_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def reset_pool(broken):
+    """Replace the pool after a worker died, unless another thread already did."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False)
+
+def render_family(user_id):
+    """Render every stale card of a family across the process pool; returns per-member versions."""
+    results, pending = [], {}
+    for card in fetch_family_cards(user_id):
+        version = card_version(card)
+        if not card["uuid"]:
+            results.append({"member_id": card["member_id"], "status": "no_uuid"})
+            continue
+        pdf_path, png_path = _paths(card["member_id"], version)
+        if os.path.exists(pdf_path) and os.path.exists(png_path):
+            results.append({"member_id": card["member_id"], "status": "cached", "etag": version})
+            continue
+        pool = get_pool()
+        pending[pool.submit(render_card, card)] = (card["member_id"], version, pool)
+
+    for future, (member_id, version, pool) in pending.items():
+        try:
+            pdf_bytes, png_bytes = future.result()
+            store_rendered(member_id, version, pdf_bytes, png_bytes)
+            results.append({"member_id": member_id, "status": "rendered", "etag": version})
+        except BrokenProcessPool as e:
+            reset_pool(pool)
+            print(f"❌ Card render pool broke on member {member_id}: {e}")
+            results.append({"member_id": member_id, "status": "failed", "error": str(e)})
+        except Exception as e:
+            print(f"❌ Card render failed for member {member_id}: {e}")
+            results.append({"member_id": member_id, "status": "failed", "error": str(e)})
+    return sorted(results, key=lambda r: r["member_id"])
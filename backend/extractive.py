@@ -0,0 +1,79 @@
+import re
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# ---------------- CONFIG ---------------- #
+DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+MIN_SENTENCE_WORDS = 4
+# Header-like lines ("PATIENT NAME:", "DATE OF SERVICE:") carry little content for the summary
+BOILERPLATE = re.compile(r"^(patient|name|date|dob|mrn|account|physician|dictated|transcribed|cc)\b[^.]{0,40}:", re.I)
+
+def split_sentences(text: str):
+    parts = re.split(r"(?<=[.!?])\s+(?=[A-Z0-9])", text)
+    return [p.strip() for p in parts if p.strip()]
+
+def approx_tokens(sentence: str) -> int:
+    """Rough T5 sentencepiece count when no tokenizer is supplied."""
+    return int(len(sentence.split()) * 1.3) + 1
+
+# ---------------- RANKING ---------------- #
+def rank_sentences(sentences):
+    """TextRank over the TF-IDF cosine-similarity graph, computed with sparse/NumPy ops."""
+    try:
+        tfidf = TfidfVectorizer(stop_words="english", sublinear_tf=True).fit_transform(sentences)
+    except ValueError:
+        # Only stop words / empty vocabulary
+        return np.ones(len(sentences)) / len(sentences)
+
+    sim = (tfidf @ tfidf.T).toarray()  # rows are L2-normalised, so this is cosine similarity
+    np.fill_diagonal(sim, 0.0)
+    row_sums = sim.sum(axis=1, keepdims=True)
+    transition = np.divide(sim, row_sums, out=np.zeros_like(sim), where=row_sums > 0)
+
+    n = len(sentences)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+
+    # Down-weight fragments and header boilerplate
+    lengths = np.array([len(s.split()) for s in sentences])
+    boiler = np.array([bool(BOILERPLATE.match(s)) for s in sentences])
+    scores = scores * np.where(lengths < MIN_SENTENCE_WORDS, 0.2, 1.0) * np.where(boiler, 0.1, 1.0)
+    return scores
+
+def extractive_prefilter(text: str, token_budget: int = 480, count_tokens=approx_tokens) -> str:
+    """
+    Keep the highest-ranked sentences that fit in `token_budget`, in original order.
+    Text that already fits is returned unchanged.
+    """
+    sentences = split_sentences(text)
+    if len(sentences) < 3:
+        return text
+
+    lengths = np.array([count_tokens(s) for s in sentences])
+    if lengths.sum() <= token_budget:
+        return text
+
+    scores = rank_sentences(sentences)
+    chosen, used = [], 0
+    for i in np.argsort(-scores, kind="stable"):
+        if used + lengths[i] <= token_budget:
+            chosen.append(i)
+            used += lengths[i]
+    if not chosen:
+        # Every sentence is over budget on its own (e.g. OCR text without punctuation):
+        # keep the leading words of the best one rather than returning nothing
+        return truncate_to_budget(sentences[int(np.argmax(scores))], token_budget, count_tokens)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+def truncate_to_budget(sentence: str, token_budget: int, count_tokens=approx_tokens) -> str:
+    words = sentence.split()
+    keep = max(int(len(words) * token_budget / max(count_tokens(sentence), 1)), 1)
+    while keep > 1 and count_tokens(" ".join(words[:keep])) > token_budget:
+        keep -= 1
+    return " ".join(words[:keep])
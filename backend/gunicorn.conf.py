@@ -0,0 +1,26 @@
+import os
+
+# gunicorn -c gunicorn.conf.py app:app
+# cpu_policy.py divides the host's cores between these workers using the same
+# WEB_CONCURRENCY value, so set it in the environment rather than with -w.
+# Reminder jobs run in one worker only (AddReminderDialog.SchedulerLeader holds a MySQL lock).
+# With more than one worker the cache defaults to Redis (CACHE_URL), which must be running.
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+os.environ["WEB_CONCURRENCY"] = str(workers)
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))   # summaries of long reports take a while on CPU
+preload_app = False                                 # each worker loads torch after fork, with its own policy
+
+def pre_fork(server, worker):
+    # Lowest index not held by a live worker, so a restarted worker reuses its core block
+    taken = {getattr(w, "worker_index", None) for w in server.WORKERS.values()}
+    worker.worker_index = next(i for i in range(len(taken) + 1) if i not in taken)
+
+def post_fork(server, worker):
+    os.environ["WORKER_INDEX"] = str(worker.worker_index)
+    # OpenMP/MKL read these before torch is imported
+    threads_per_worker = os.getenv("TORCH_THREADS") or str(max(1, (os.cpu_count() or 1) // workers))
+    os.environ.setdefault("OMP_NUM_THREADS", threads_per_worker)
+    os.environ.setdefault("MKL_NUM_THREADS", threads_per_worker)
+    server.log.info("Worker %s started as index %s", worker.pid, worker.worker_index)
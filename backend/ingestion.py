@@ -0,0 +1,225 @@
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+import fitz  # PyMuPDF
+from dotenv import load_dotenv
+from db import get_db_connection
+from pdf_utils import extract_text_from_bytes, extract_sections_from_bytes, find_section, section_focus_text
+from embeddings import store
+from thumbnails import store_thumbnails
+from pdf_optimize import optimizer, PDF_OPTIMIZE
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 1))            # summarization is CPU heavy
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", 100))
+INGEST_SWEEP_SECONDS = int(os.getenv("INGEST_SWEEP_SECONDS", 60))
+INGEST_STALE_MINUTES = int(os.getenv("INGEST_STALE_MINUTES", 30))  # reclaim rows a dead worker left behind
+INGEST_SUMMARIZE = os.getenv("INGEST_SUMMARIZE", "1") == "1"
+
+# ---------------- STAGES ---------------- #
+def claim_document(cursor, doc_id):
+    """Mark a row as processing; returns False if another worker already has it."""
+    cursor.execute(
+        """
+        UPDATE medical_documents
+        SET ingest_status = 'processing', ingest_started_at = NOW()
+        WHERE id = %s
+          AND (ingest_status = 'pending'
+               OR (ingest_status = 'processing'
+                   AND ingest_started_at < NOW() - INTERVAL %s MINUTE))
+        """,
+        (doc_id, INGEST_STALE_MINUTES),
+    )
+    return cursor.rowcount == 1
+
+def derive(pdf_bytes):
+    """Text, sections, page count and (optionally) summaries for one PDF."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = doc.page_count
+    try:
+        text = extract_text_from_bytes(pdf_bytes)
+    except ValueError:
+        text = ""  # scanned PDF without a text layer
+    sections = extract_sections_from_bytes(pdf_bytes) if text else []
+
+    summary = simplified = None
+    if INGEST_SUMMARIZE and text:
+        from summarizer import summarize_text, simplify_summary  # heavy import, only in workers
+        summary = summarize_text(section_focus_text(sections) or text)
+        simplified = simplify_summary(summary)
+    return {
+        "extracted_text": text,
+        "page_count": page_count,
+        "sections_json": json.dumps(sections),
+        "impression": find_section(sections),
+        "summary": summary,
+        "simplified": simplified,
+    }
+
+def ingest_document(doc_id):
+    conn = get_db_connection()
+    if conn is None:
+        # Row stays pending; the sweep queues it again once the database is back
+        print(f"⚠️ Ingestion of document {doc_id} postponed: no database connection")
+        return
+    cursor = conn.cursor()
+    try:
+        if not claim_document(cursor, doc_id):
+            conn.commit()
+            return
+        conn.commit()
+
+        cursor.execute(
+            "SELECT file_data, family_member_id, title, original_size FROM medical_documents WHERE id=%s",
+            (doc_id,),
+        )
+        row = cursor.fetchone()
+        if not row:
+            return
+        file_data, family_member_id, title, original_size = row
+
+        # Thumbnails first: cheap, and the documents grid shows them before summaries finish
+        try:
+            store_thumbnails(doc_id, file_data)
+        except Exception as e:
+            print(f"⚠️ Thumbnails failed for document {doc_id}: {e}")
+
+        # Optional: replace the stored PDF with a smaller one (once; original_size marks it done)
+        if PDF_OPTIMIZE and original_size is None:
+            stored, changed = optimizer.optimize(file_data)
+            if changed:
+                cursor.execute(
+                    "UPDATE medical_documents SET file_data=%s, original_size=%s, stored_size=%s, optimized=1 "
+                    "WHERE id=%s",
+                    (stored, len(file_data), len(stored), doc_id),
+                )
+                print(f"🗜️ Document {doc_id}: {len(file_data)} -> {len(stored)} bytes")
+            else:
+                cursor.execute(
+                    "UPDATE medical_documents SET original_size=%s, stored_size=%s, optimized=0 WHERE id=%s",
+                    (len(file_data), len(file_data), doc_id),
+                )
+            conn.commit()
+            file_data = stored
+
+        result = derive(file_data)
+        cursor.execute(
+            """
+            UPDATE medical_documents
+            SET extracted_text = %s, page_count = %s, sections_json = %s, impression = %s,
+                summary = %s, simplified = %s,
+                ingest_status = 'done', ingest_error = NULL, ingested_at = NOW()
+            WHERE id = %s
+            """,
+            (result["extracted_text"], result["page_count"], result["sections_json"], result["impression"],
+             result["summary"], result["simplified"], doc_id),
+        )
+        conn.commit()
+        if result["extracted_text"]:
+            store.index_record(family_member_id, "document", doc_id, f"{title}. {result['extracted_text']}")
+        print(f"✅ Ingested document {doc_id} ({result['page_count']} pages)")
+    except Exception as e:
+        print(f"❌ Ingestion failed for document {doc_id}: {e}")
+        traceback.print_exc()
+        try:
+            conn.rollback()
+            cursor.execute(
+                "UPDATE medical_documents SET ingest_status='failed', ingest_error=%s WHERE id=%s",
+                (str(e)[:1000], doc_id),
+            )
+            conn.commit()
+        except Exception as mark_error:
+            # Left 'processing'; the sweep reclaims it after INGEST_STALE_MINUTES
+            print(f"❌ Could not mark document {doc_id} as failed: {mark_error}")
+    finally:
+        cursor.close()
+        conn.close()
+
+# ---------------- WORKER POOL ---------------- #
+class IngestionPipeline:
+    """
+    Bounded queue + fixed worker threads. When the queue is full the row simply stays
+    'pending' and the periodic sweep picks it up, so uploads never block on ingestion.
+    """
+
+    def __init__(self, workers=INGEST_WORKERS, queue_size=INGEST_QUEUE_SIZE):
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._run, name=f"ingest-{i}", daemon=True).start()
+        threading.Thread(target=self._sweep_loop, name="ingest-sweep", daemon=True).start()
+
+    def enqueue(self, doc_id):
+        with self._lock:
+            if doc_id in self._queued:
+                return True
+            try:
+                self._queue.put_nowait(doc_id)
+            except queue.Full:
+                return False
+            self._queued.add(doc_id)
+            return True
+
+    def _run(self):
+        while True:
+            doc_id = self._queue.get()
+            with self._lock:
+                self._queued.discard(doc_id)
+            try:
+                ingest_document(doc_id)
+            except Exception as e:
+                # Never let one document take the worker thread down with it
+                print(f"❌ Ingestion worker error on document {doc_id}: {e}")
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    def sweep(self):
+        """Queue rows left pending (queue overflow, restarts, pre-existing documents)."""
+        free = self._queue.maxsize - self._queue.qsize()
+        if free <= 0:
+            return
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id FROM medical_documents
+            WHERE ingest_status = 'pending'
+               OR (ingest_status = 'processing'
+                   AND ingest_started_at < NOW() - INTERVAL %s MINUTE)
+            ORDER BY id
+            LIMIT %s
+            """,
+            (INGEST_STALE_MINUTES, free),
+        )
+        ids = [r[0] for r in cursor.fetchall()]
+        cursor.close()
+        conn.close()
+        for doc_id in ids:
+            self.enqueue(doc_id)
+
+    def _sweep_loop(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                print("❌ Ingestion sweep error:", e)
+            time.sleep(INGEST_SWEEP_SECONDS)
+
+    def stats(self):
+        return {"workers": self.workers, "queued": self._queue.qsize(), "queue_size": self._queue.maxsize}
+
+pipeline = IngestionPipeline()
@@ -0,0 +1,42 @@
+import base64
+import datetime
+import decimal
+import orjson
+from flask.json.provider import JSONProvider
+
+# OPT_NON_STR_KEYS lets handlers return dicts keyed by member id without converting keys first
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# ---------------- TYPE FALLBACKS ---------------- #
+def _default(obj):
+    """Types orjson does not handle natively (date/datetime/time/UUID are native)."""
+    if isinstance(obj, datetime.timedelta):
+        # MySQL TIME columns arrive as timedelta; keep the "H:MM:SS" form the frontend expects
+        return str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(obj)).decode("ascii")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_bytes(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+# ---------------- FLASK PROVIDER ---------------- #
+class OrjsonProvider(JSONProvider):
+    """App-wide JSON provider so `jsonify` can take raw DB rows without per-row conversion."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
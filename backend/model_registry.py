@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+import torch
+from dotenv import load_dotenv
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+def parse_mapping(value):
+    """'a=x,b=y' -> {"a": "x", "b": "y"}"""
+    mapping = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            key, val = item.split("=", 1)
+            mapping[key.strip()] = val.strip()
+    return mapping
+
+# name=local path (or hub id), e.g. "t5-small=t5-small,t5-base=/models/t5-base,flan-t5-base=/models/flan-t5-base"
+SUMMARIZER_MODELS = parse_mapping(os.getenv("SUMMARIZER_MODELS", "t5-small=t5-small"))
+DEFAULT_MODEL = os.getenv("SUMMARIZER_DEFAULT_MODEL", next(iter(SUMMARIZER_MODELS), "t5-small"))
+# user_id=model name, for tenants served by a larger checkpoint
+TENANT_MODELS = parse_mapping(os.getenv("SUMMARIZER_TENANT_MODELS", ""))
+RAM_BUDGET_MB = int(os.getenv("SUMMARIZER_RAM_BUDGET_MB", 2048))
+# Loaded when the summarizer is imported, so the first request does not pay for it
+WARM_MODELS = [m.strip() for m in os.getenv("SUMMARIZER_WARM", DEFAULT_MODEL).split(",") if m.strip()]
+
+device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+class UnknownModel(KeyError):
+    pass
+
+def resident_bytes(model) -> int:
+    """Memory held by parameters and buffers."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+class LoadedModel:
+    def __init__(self, name, path, tokenizer, model, load_seconds):
+        self.name = name
+        self.path = path
+        self.tokenizer = tokenizer
+        self.model = model
+        self.load_seconds = load_seconds
+        self.size_bytes = resident_bytes(model)
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.uses = 0
+
+# ---------------- REGISTRY ---------------- #
+class ModelRegistry:
+    """
+    Loads seq2seq checkpoints on first use and keeps the most recently used ones
+    resident while their combined size fits in the RAM budget. Requests already
+    holding an evicted model keep their reference until they finish.
+    """
+
+    def __init__(self, models=SUMMARIZER_MODELS, default=DEFAULT_MODEL, budget_mb=RAM_BUDGET_MB):
+        self.models = dict(models)
+        self.default = default
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.models}
+        self.loads = 0
+        self.evictions = 0
+
+    def resolve(self, name=None, user_id=None) -> str:
+        """Explicit name, else the tenant's model, else the default."""
+        name = name or TENANT_MODELS.get(str(user_id)) or self.default
+        if name not in self.models:
+            raise UnknownModel(name)
+        return name
+
+    def get(self, name=None) -> LoadedModel:
+        name = self.resolve(name)
+        with self._lock:
+            entry = self._loaded.get(name)
+            if entry is not None:
+                self._loaded.move_to_end(name)
+                entry.last_used = time.time()
+                entry.uses += 1
+                return entry
+
+        # One loader per model; other callers for the same model wait for it
+        with self._load_locks[name]:
+            with self._lock:
+                entry = self._loaded.get(name)
+            if entry is None:
+                entry = self._load(name)
+                with self._lock:
+                    self._loaded[name] = entry
+                    self._evict(keep=name)
+            entry.last_used = time.time()
+            entry.uses += 1
+            return entry
+
+    def _load(self, name) -> LoadedModel:
+        path = self.models[name]
+        started = time.perf_counter()
+        tokenizer = AutoTokenizer.from_pretrained(path)
+        model = AutoModelForSeq2SeqLM.from_pretrained(path).to(device)
+        model.eval()
+        entry = LoadedModel(name, path, tokenizer, model, time.perf_counter() - started)
+        self.loads += 1
+        print(f"✅ Loaded summarizer model {name} in {entry.load_seconds:.1f}s "
+              f"({entry.size_bytes / 1024 / 1024:.0f} MB)")
+        return entry
+
+    def _evict(self, keep):
+        """Drop least recently used models until the budget fits (caller holds _lock)."""
+        while self.resident_bytes() > self.budget_bytes and len(self._loaded) > 1:
+            oldest = next(iter(self._loaded))
+            if oldest == keep:
+                self._loaded.move_to_end(oldest)
+                oldest = next(iter(self._loaded))
+            entry = self._loaded.pop(oldest)
+            self.evictions += 1
+            print(f"♻️ Evicted summarizer model {oldest} ({entry.size_bytes / 1024 / 1024:.0f} MB)")
+
+    def resident_bytes(self) -> int:
+        return sum(e.size_bytes for e in self._loaded.values())
+
+    def warm(self, names):
+        for name in names:
+            self.get(name)
+
+    def stats(self):
+        with self._lock:
+            loaded = {
+                name: {
+                    "path": e.path,
+                    "size_mb": round(e.size_bytes / 1024 / 1024, 1),
+                    "load_seconds": round(e.load_seconds, 2),
+                    "uses": e.uses,
+                    "idle_seconds": round(time.time() - e.last_used, 1),
+                }
+                for name, e in self._loaded.items()
+            }
+            return {
+                "available": list(self.models),
+                "default": self.default,
+                "loaded": loaded,
+                "resident_mb": round(self.resident_bytes() / 1024 / 1024, 1),
+                "budget_mb": round(self.budget_bytes / 1024 / 1024, 1),
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+registry = ModelRegistry()
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))                 # cost factor for new hashes
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))           # concurrent bcrypt computations
+HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32))  # running + waiting jobs
+HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 5))         # seconds a request waits
+
+class HashPoolBusy(Exception):
+    """Raised when the hashing queue is full or the job did not finish within HASH_TIMEOUT."""
+
+def hash_cost(hashed: str) -> int:
+    """Cost factor of a "$2b$12$..." hash."""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+# ---------------- HASHING POOL ---------------- #
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated pool so login/signup bursts cannot take every
+    request thread. bcrypt releases the GIL, so threads give real parallelism here.
+    """
+
+    def __init__(self, workers=HASH_WORKERS, queue_limit=HASH_QUEUE_LIMIT,
+                 timeout=HASH_TIMEOUT, rounds=BCRYPT_ROUNDS):
+        self.rounds = rounds
+        self.timeout = timeout
+        self.queue_limit = queue_limit
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(queue_limit)
+        self._lock = threading.Lock()
+        self.workers = workers
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.rehashed = 0
+        self.total_hash_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.max_hash_ms = 0.0
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise HashPoolBusy("Password hashing queue is full")
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        queued_at = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                hash_ms = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    self.completed += 1
+                    self.total_hash_ms += hash_ms
+                    self.total_wait_ms += (started - queued_at) * 1000
+                    self.max_hash_ms = max(self.max_hash_ms, hash_ms)
+
+        future = self._pool.submit(job)
+
+        # The slot is held until the job really finishes, even if the caller gave up
+        def release(_):
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+        future.add_done_callback(release)
+        return future
+
+    def _wait(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise HashPoolBusy("Password hashing timed out")
+
+    def hash(self, password: str) -> str:
+        def work():
+            return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds)).decode("utf-8")
+        return self._wait(self._submit(work))
+
+    def check(self, password: str, hashed: str) -> bool:
+        def work():
+            return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        return self._wait(self._submit(work))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return hash_cost(hashed) < self.rounds
+
+    def rehash_in_background(self, password: str, save):
+        """Re-hash at the current cost and pass the new hash to `save`, without blocking the caller."""
+        def work():
+            new_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=self.rounds)).decode("utf-8")
+            save(new_hash)
+            with self._lock:
+                self.rehashed += 1
+        try:
+            future = self._submit(work)
+        except HashPoolBusy:
+            return  # upgrade again on a later login
+
+        def report(f):
+            if f.exception():
+                print("❌ Password rehash failed:", f.exception())
+                traceback.print_exception(f.exception())
+        future.add_done_callback(report)
+
+    def stats(self):
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "queue_depth": self.in_flight,
+                "max_queue_depth": self.max_in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "rehashed": self.rehashed,
+                "avg_hash_ms": round(self.total_hash_ms / done, 2),
+                "max_hash_ms": round(self.max_hash_ms, 2),
+                "avg_wait_ms": round(self.total_wait_ms / done, 2),
+            }
+
+hasher = PasswordHasher()
@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import fitz  # PyMuPDF
+from dotenv import load_dotenv
+from db import get_db_connection
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+PDF_OPTIMIZE = os.getenv("PDF_OPTIMIZE", "0") == "1"
+PDF_OPTIMIZE_WORKERS = int(os.getenv("PDF_OPTIMIZE_WORKERS", 2))
+PDF_MIN_SAVINGS = float(os.getenv("PDF_MIN_SAVINGS", 0.05))     # keep the original unless >= 5% smaller
+PDF_IMAGE_DPI = int(os.getenv("PDF_IMAGE_DPI", 150))            # downsample images above ~1.3x this
+PDF_IMAGE_QUALITY = int(os.getenv("PDF_IMAGE_QUALITY", 75))     # JPEG quality of rewritten images
+
+def optimize_pdf(pdf_bytes, dpi=PDF_IMAGE_DPI, quality=PDF_IMAGE_QUALITY):
+    """Downsample images (PyMuPDF >= 1.24.11), drop duplicate/unused objects and deflate streams."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        if doc.needs_pass or doc.is_encrypted:
+            return pdf_bytes
+        if hasattr(doc, "rewrite_images"):
+            doc.rewrite_images(dpi_threshold=int(dpi * 1.3), dpi_target=dpi, quality=quality)
+        return doc.tobytes(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=True)
+
+# ---------------- WORKER POOL ---------------- #
+class PdfOptimizer:
+    """Runs optimize_pdf in worker processes and keeps running totals of bytes saved."""
+
+    def __init__(self, workers=PDF_OPTIMIZE_WORKERS, min_savings=PDF_MIN_SAVINGS):
+        self.workers = workers
+        self.min_savings = min_savings
+        self._pool = None
+        self._lock = threading.Lock()
+        self.optimized = 0
+        self.kept_original = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the parent already runs scheduler, ingestion and torch threads
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def _reset_pool(self, broken):
+        """A crashed worker breaks the whole pool; start a fresh one for the next document."""
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=False)
+
+    def optimize(self, pdf_bytes):
+        """Returns (bytes to store, optimized?). Falls back to the original on error or marginal savings."""
+        started = time.perf_counter()
+        pool = self._get_pool()
+        try:
+            candidate = pool.submit(optimize_pdf, pdf_bytes).result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._reset_pool(pool)
+            print(f"⚠️ PDF optimization failed, keeping original: {e}")
+            with self._lock:
+                self.failed += 1
+            return pdf_bytes, False
+
+        better = len(candidate) <= len(pdf_bytes) * (1 - self.min_savings)
+        result = candidate if better else pdf_bytes
+        with self._lock:
+            self.bytes_in += len(pdf_bytes)
+            self.bytes_out += len(result)
+            self.seconds += time.perf_counter() - started
+            if better:
+                self.optimized += 1
+            else:
+                self.kept_original += 1
+        return result, better
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "enabled": PDF_OPTIMIZE,
+                "workers": self.workers,
+                "optimized": self.optimized,
+                "kept_original": self.kept_original,
+                "failed": self.failed,
+                "mb_saved": round((self.bytes_in - self.bytes_out) / 1024 / 1024, 2),
+                "avg_seconds": round(self.seconds / (self.optimized + self.kept_original), 2)
+                if self.optimized + self.kept_original else None,
+            }
+
+        # Totals across every stored document, not just this process
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT COUNT(*) AS documents, SUM(optimized) AS optimized,
+                   SUM(original_size) AS original_bytes, SUM(stored_size) AS stored_bytes
+            FROM medical_documents
+            WHERE original_size IS NOT NULL
+            """
+        )
+        totals = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        original, stored = totals["original_bytes"] or 0, totals["stored_bytes"] or 0
+        stats["storage"] = {
+            "documents": totals["documents"],
+            "optimized": int(totals["optimized"] or 0),
+            "original_mb": round(original / 1024 / 1024, 2),
+            "stored_mb": round(stored / 1024 / 1024, 2),
+            "saved_pct": round((1 - stored / original) * 100, 1) if original else 0.0,
+        }
+        return stats
+
+optimizer = PdfOptimizer()
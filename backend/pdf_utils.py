@@ -1,16 +1,21 @@
 import fitz  # PyMuPDF
+import hashlib
 import re
+import threading
+from collections import Counter, OrderedDict
 
 def extract_text_from_pdf(file):
     """
     Extracts text from a PDF file (werkzeug FileStorage object).
     Cleans up CID artifacts, control characters, and normalizes whitespace.
     """
+    # Ensure we're reading from the start
+    file.seek(0)
+    return extract_text_from_bytes(file.read())
+
+def extract_text_from_bytes(pdf_bytes):
+    """Same as extract_text_from_pdf, for PDF bytes already in memory (e.g. a DB blob)."""
     try:
-        # Ensure we're reading from the start
-        file.seek(0)
-        pdf_bytes = file.read()
-        
         # Open PDF from bytes
         with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
             text = ""
@@ -33,3 +38,142 @@ def extract_text_from_pdf(file):
     except Exception as e:
         print("❌ PDF extraction error:", e)
         raise
+
+# ---------------- SECTION-AWARE PARSING ---------------- #
+# Inline labels as written in MTSamples reports: "... stable. HISTORY OF PRESENT ILLNESS:, The patient ..."
+INLINE_HEADING = re.compile(r"(?:^|(?<=[.,;:]\s)|(?<=[.,;:]))\s*([A-Z][A-Z/&()'-]+(?: [A-Z/&()'-]+){0,7}):[\s,]*")
+BOLD_FLAG = 16
+# Sections worth reading first, in order of clinical value
+HIGH_VALUE_SECTIONS = (
+    "IMPRESSION", "ASSESSMENT", "ASSESSMENT AND PLAN", "FINAL DIAGNOSIS", "DIAGNOSIS", "DIAGNOSES",
+    "POSTOPERATIVE DIAGNOSIS", "POSTOPERATIVE DIAGNOSES", "SUMMARY", "FINDINGS", "PLAN", "PLANS",
+    "RECOMMENDATIONS", "CHIEF COMPLAINT", "HISTORY OF PRESENT ILLNESS", "HPI",
+)
+IMPRESSION_SECTIONS = (
+    "IMPRESSION", "ASSESSMENT", "ASSESSMENT AND PLAN", "FINAL DIAGNOSIS", "DIAGNOSIS", "DIAGNOSES",
+    "POSTOPERATIVE DIAGNOSIS", "POSTOPERATIVE DIAGNOSES",
+)
+SECTION_CACHE_SIZE = 128
+
+_section_cache = OrderedDict()
+_section_cache_lock = threading.Lock()
+
+def _clean(text):
+    text = re.sub(r'\(cid:\d+\)', '', text)
+    text = re.sub(r'[\x00-\x1F\x7F-\x9F]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def _body_font_size(pages):
+    """Most common span size by character count, i.e. the body text size."""
+    sizes = Counter()
+    for page in pages:
+        for block in page["blocks"]:
+            for line in block.get("lines", []):
+                for span in line["spans"]:
+                    sizes[round(span["size"], 1)] += len(span["text"].strip())
+    return sizes.most_common(1)[0][0] if sizes else 0
+
+def _split_heading(spans, body_size):
+    """Return (heading, remainder) if a line starts with a heading, else (None, text)."""
+    text = "".join(s["text"] for s in spans).strip()
+    if not text:
+        return None, ""
+
+    # Leading bold or enlarged spans form the heading (e.g. "<b>IMPRESSION:</b> ...")
+    lead = []
+    for span in spans:
+        if span["flags"] & BOLD_FLAG or span["size"] >= body_size + 1.5:
+            lead.append(span["text"])
+        else:
+            break
+    lead_text = "".join(lead).strip()
+    if lead_text and len(lead_text) <= 80 and not lead_text.endswith("."):
+        return lead_text.rstrip(":").strip(), text[len(lead_text):].strip(" :,")
+    return None, text
+
+def _split_inline(heading, text):
+    """Split one font-delimited section further on inline upper-case labels."""
+    parts = INLINE_HEADING.split(text)
+    # re.split with one group: [before, label1, after1, label2, after2, ...]
+    sections = [(heading, parts[0])]
+    for label, body in zip(parts[1::2], parts[2::2]):
+        if sum(c.isalpha() for c in label) >= 3:
+            sections.append((label, body))
+        else:
+            sections[-1] = (sections[-1][0], f"{sections[-1][1]} {label}: {body}")
+    return sections
+
+def extract_sections_from_bytes(pdf_bytes):
+    """
+    Split a report into [{"heading": ..., "text": ...}] using PyMuPDF span fonts
+    (bold / larger headings) and inline upper-case labels. Results are cached by content hash.
+    """
+    key = hashlib.sha1(pdf_bytes).hexdigest()
+    with _section_cache_lock:
+        if key in _section_cache:
+            _section_cache.move_to_end(key)
+            return _section_cache[key]
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        pages = [page.get_text("dict") for page in doc]
+    body_size = _body_font_size(pages)
+
+    sections = []
+    current = {"heading": "PREAMBLE", "lines": []}
+    for page in pages:
+        for block in page["blocks"]:
+            for line in block.get("lines", []):
+                heading, rest = _split_heading(line["spans"], body_size)
+                if heading:
+                    sections.append(current)
+                    current = {"heading": re.sub(r"\s+", " ", heading).upper(), "lines": []}
+                if rest:
+                    current["lines"].append(rest)
+    sections.append(current)
+
+    result = []
+    for s in sections:
+        for heading, text in _split_inline(s["heading"], " ".join(s["lines"])):
+            text = _clean(text)
+            if text:
+                result.append({"heading": re.sub(r"\s+", " ", heading).strip().upper(), "text": text})
+    with _section_cache_lock:
+        _section_cache[key] = result
+        while len(_section_cache) > SECTION_CACHE_SIZE:
+            _section_cache.popitem(last=False)
+    return result
+
+HEADING_ABBREVIATIONS = {"POSTOP": "POSTOPERATIVE", "PREOP": "PREOPERATIVE", "DX": "DIAGNOSIS"}
+
+def normalize_heading(heading):
+    """Upper-case words only, with common abbreviations spelled out ("Post-op Dx" -> "POSTOPERATIVE DIAGNOSIS")."""
+    words = re.sub(r"[^A-Z ]+", " ", heading.upper().replace("-", "")).split()
+    return " ".join(HEADING_ABBREVIATIONS.get(w, w) for w in words)
+
+def find_section(sections, names=IMPRESSION_SECTIONS):
+    """
+    Text of the first section whose heading matches one of `names` (in priority order).
+    Exact matches win; otherwise a heading containing the name counts, so "DIAGNOSTIC IMPRESSION"
+    and "CLINICAL IMPRESSION" are found as IMPRESSION.
+    """
+    by_heading = {}
+    for s in sections:
+        if s["text"]:
+            by_heading.setdefault(normalize_heading(s["heading"]), s["text"])
+    for name in names:
+        if name in by_heading:
+            return by_heading[name]
+    for name in names:
+        for heading, text in by_heading.items():
+            if f" {name} " in f" {heading} ":
+                return text
+    return None
+
+def section_focus_text(sections):
+    """High-value sections first, then the rest, so truncation drops the least useful text."""
+    rank = {name: i for i, name in enumerate(HIGH_VALUE_SECTIONS)}
+    ordered = sorted(
+        (s for s in sections if s["heading"] != "PREAMBLE"),
+        key=lambda s: rank.get(s["heading"], len(rank)),
+    )
+    return " ".join(f"{s['heading'].title()}: {s['text']}" for s in ordered)
@@ -0,0 +1,90 @@
+# Read queries served by both the Flask blueprints and the async routes in asgi.py.
+# Each function returns (sql, args) so the same SQL runs on a mysql.connector cursor
+# or an aiomysql one; results are fetched as dicts in both.
+
+# ---------------- MEMBERS ---------------- #
+def family_members(user_id):
+    return (
+        """
+        SELECT id, user_id, name, phone, email, age, gender, relation
+        FROM family_members
+        WHERE user_id = %s
+        ORDER BY id DESC
+        """,
+        (user_id,),
+    )
+
+def family_member(member_id, user_id):
+    return (
+        """
+        SELECT id, user_id, name, phone, email, age, gender, relation
+        FROM family_members
+        WHERE id = %s AND user_id = %s
+        """,
+        (member_id, user_id),
+    )
+
+def family_member_count(user_id):
+    return "SELECT COUNT(*) AS count FROM family_members WHERE user_id = %s", (user_id,)
+
+# ---------------- TIMELINE / DOCUMENTS ---------------- #
+# Scoped to the caller: another user's member id returns no rows
+def member_timeline(member_id, user_id):
+    return (
+        """
+        SELECT t.id, t.title, t.event_type, t.event_date, t.severity, t.notes, t.created_at
+        FROM medical_timeline t
+        JOIN family_members fm ON fm.id = t.family_member_id
+        WHERE t.family_member_id = %s AND fm.user_id = %s
+        ORDER BY t.event_date DESC
+        """,
+        (member_id, user_id),
+    )
+
+def member_documents(member_id, user_id):
+    return (
+        """
+        SELECT d.id, d.title, d.document_type, d.document_date, d.notes, d.file_name,
+               d.page_count, d.ingest_status
+        FROM medical_documents d
+        JOIN family_members fm ON fm.id = d.family_member_id
+        WHERE d.family_member_id = %s AND fm.user_id = %s
+        ORDER BY d.created_at DESC
+        """,
+        (member_id, user_id),
+    )
+
+def with_thumbnail_urls(documents):
+    for doc in documents:
+        doc["thumbnail_url"] = f"/api/documents/{doc['id']}/thumbnail"
+    return documents
+
+# ---------------- DOCTOR VIEW ---------------- #
+# Public by UUID; the member row is looked up first, the rest by its id
+def member_by_uuid(member_uuid):
+    return "SELECT * FROM family_members WHERE uuid=%s", (member_uuid,)
+
+def emergency_card(member_id):
+    return "SELECT * FROM emergency_health_cards WHERE member_id=%s", (member_id,)
+
+def doctor_view_timeline(member_id):
+    return (
+        """
+        SELECT id, title, event_type, event_date AS date, severity, notes
+        FROM medical_timeline
+        WHERE family_member_id=%s
+        ORDER BY event_date DESC
+        """,
+        (member_id,),
+    )
+
+def doctor_view_documents(member_id):
+    return (
+        """
+        SELECT id, title, document_type, document_date, notes, file_name, impression
+        FROM medical_documents
+        WHERE family_member_id=%s
+        ORDER BY created_at DESC
+        """,
+        (member_id,),
+    )
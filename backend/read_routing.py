@@ -0,0 +1,45 @@
+import os
+from flask import g, has_request_context, request
+from dotenv import load_dotenv
+from cache import cache
+import db
+
+load_dotenv()
+
+# Read-your-writes for Flask requests: a successful write pins the session's reads to
+# the primary for DB_STICKY_SECONDS. db.py only takes the resulting sticky flag.
+DB_STICKY_SECONDS = int(os.getenv("DB_STICKY_SECONDS", 10))
+
+def session_keys():
+    """Who the current request belongs to: the authenticated user and the client address."""
+    if not has_request_context():
+        return []
+    keys = [f"addr:{request.remote_addr}"]
+    user_id = g.get("user_id")
+    if user_id:
+        keys.append(f"user:{user_id}")
+    return keys
+
+def mark_write(keys):
+    # Kept in the shared cache so every worker process sees it (Redis, the multi-worker default)
+    for key in keys:
+        cache.set("db_sticky", key, True, ttl=DB_STICKY_SECONDS)
+
+def is_sticky(keys):
+    return any(cache.get("db_sticky", key) is not None for key in keys)
+
+def get_read_connection():
+    """Replica connection for this request, or the primary if the session wrote recently."""
+    return db.get_read_connection(sticky=is_sticky(session_keys()))
+
+def remember_writes(response):
+    """after_request: successful writes pin the session's reads to the primary for a while."""
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        mark_write(session_keys())
+    return response
+
+def init_read_routing(app):
+    app.after_request(remember_writes)
+
+def stats():
+    return {**db.read_router.stats(), "sticky_seconds": DB_STICKY_SECONDS}
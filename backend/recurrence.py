@@ -0,0 +1,203 @@
+import datetime
+import os
+import numpy as np
+from dotenv import load_dotenv
+from db import get_db_connection
+from read_routing import get_read_connection
+from cache import cache, upcoming_namespace
+
+load_dotenv()
+
+# Expands reminder rules (frequency, day_of_week, day_of_month, start/end dates) into concrete
+# occurrences over a date window, with the same meaning as the APScheduler jobs in
+# AddReminderDialog.schedule_reminder. All reminders are evaluated at once as a
+# reminders x days boolean matrix.
+
+# ---------------- CONFIG ---------------- #
+UPCOMING_CACHE_TTL = int(os.getenv("UPCOMING_CACHE_TTL", 600))   # also invalidated on every reminder write
+MAX_WINDOW_DAYS = 366
+
+ONCE, DAILY, WEEKLY, MONTHLY = range(4)
+FREQUENCIES = {"once": ONCE, "daily": DAILY, "weekly": WEEKLY, "monthly": MONTHLY}
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]   # 0 = Monday, as in APScheduler cron
+NO_END = np.datetime64("9999-12-31", "D")
+
+# ---------------- RULE PARSING ---------------- #
+def weekday_mask(day_of_week, start_date):
+    """
+    day_of_week as stored ("Monday", "mon", "mon,wed,fri", "mon-fri", 0-6, "2") -> 7 booleans.
+    Empty means the start date's weekday, like schedule_reminder.
+    """
+    mask = np.zeros(7, dtype=bool)
+    if day_of_week in (None, ""):
+        mask[start_date.weekday()] = True
+        return mask
+
+    def index(token):
+        token = token.strip().lower()
+        if token.isdigit():
+            return int(token) % 7
+        return WEEKDAYS.index(token[:3])
+
+    for part in str(day_of_week).split(","):
+        if not part.strip():
+            continue
+        first, _, last = part.partition("-")
+        lo = index(first)
+        hi = index(last) if last else lo
+        if lo <= hi:
+            mask[lo:hi + 1] = True
+        else:  # wraps past Sunday, e.g. "sat-mon"
+            mask[lo:] = True
+            mask[:hi + 1] = True
+    return mask
+
+def time_seconds(value):
+    """reminder_time from MySQL (timedelta), a time, or "HH:MM[:SS]" -> seconds after midnight."""
+    if isinstance(value, datetime.timedelta):
+        return int(value.total_seconds()) % 86400
+    if isinstance(value, str):
+        value = datetime.time.fromisoformat(value)
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+def to_date(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+def compile_rules(reminders):
+    """
+    Rule rows -> column arrays for expand(). Rows whose rule cannot be read are
+    returned separately instead of failing the whole window.
+    """
+    kept, skipped = [], []
+    starts, ends, freqs, seconds, dows, doms = [], [], [], [], [], []
+    for r in reminders:
+        try:
+            start = to_date(r["start_date"])
+            end = to_date(r.get("end_date"))
+            freq = FREQUENCIES[str(r.get("frequency") or "Once").strip().lower()]
+            dow = weekday_mask(r.get("day_of_week"), start) if freq == WEEKLY else np.zeros(7, dtype=bool)
+            dom = int(r.get("day_of_month") or start.day) if freq == MONTHLY else 0
+            secs = time_seconds(r["reminder_time"])
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            skipped.append({"id": r.get("id"), "error": f"Unreadable rule: {e}"})
+            continue
+        kept.append(r)
+        starts.append(start)
+        ends.append(end or NO_END)
+        freqs.append(freq)
+        seconds.append(secs)
+        dows.append(dow)
+        doms.append(dom)
+
+    rules = {
+        "start": np.array(starts, dtype="datetime64[D]"),
+        "end": np.array(ends, dtype="datetime64[D]"),
+        "freq": np.array(freqs, dtype=np.int8),
+        "seconds": np.array(seconds, dtype=np.int32),
+        "dow": np.array(dows, dtype=bool).reshape(len(kept), 7),
+        "dom": np.array(doms, dtype=np.int8),
+    }
+    return kept, rules, skipped
+
+# ---------------- EXPANSION ---------------- #
+def occurrence_matrix(rules, days):
+    """reminders x days booleans: does reminder i fire on days[j]?"""
+    weekday = (days.astype(np.int64) + 3) % 7                             # 1970-01-01 was a Thursday
+    day_of_month = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+
+    start, end, freq = rules["start"][:, None], rules["end"][:, None], rules["freq"][:, None]
+    in_range = (days >= start) & (days <= end)
+    fires = (
+        ((freq == ONCE) & (days == start))
+        | (freq == DAILY)
+        | ((freq == WEEKLY) & rules["dow"][:, weekday])
+        # Like a cron day=31 job, months without that day are skipped
+        | ((freq == MONTHLY) & (rules["dom"][:, None] == day_of_month))
+    )
+    return in_range & fires
+
+def expand(reminders, start_date, days):
+    """
+    Occurrences of the given reminder rows on each of `days` days from start_date,
+    sorted by date and time. Returns (occurrences, skipped rows).
+    """
+    kept, rules, skipped = compile_rules(reminders)
+    window = np.datetime64(start_date, "D") + np.arange(days)
+    if not kept:
+        return [], skipped
+
+    rows, cols = np.nonzero(occurrence_matrix(rules, window))
+    order = np.lexsort((rows, rules["seconds"][rows], cols))
+    rows, cols = rows[order], cols[order]
+
+    dates = window[cols].astype(object)  # datetime.date
+    occurrences = []
+    for i, date in zip(rows.tolist(), dates):
+        r = kept[i]
+        secs = int(rules["seconds"][i])
+        occurrences.append({
+            "reminder_id": r.get("id"),
+            "family_member_id": r.get("family_member_id"),
+            "member_name": r.get("member_name"),
+            "title": r.get("title"),
+            "reminder_type": r.get("reminder_type"),
+            "dosage": r.get("dosage"),
+            "frequency": r.get("frequency"),
+            "date": date.isoformat(),
+            "time": f"{secs // 3600:02d}:{secs // 60 % 60:02d}",
+        })
+    return occurrences, skipped
+
+# ---------------- LOADING / CACHE ---------------- #
+def load_reminders(user_id, member_id=None):
+    query = """
+        SELECT r.id, r.family_member_id, fm.name AS member_name, r.title, r.reminder_type,
+               r.start_date, r.end_date, r.reminder_time, r.frequency, r.dosage,
+               r.day_of_week, r.day_of_month
+        FROM reminders r
+        JOIN family_members fm ON fm.id = r.family_member_id
+        WHERE fm.user_id = %s AND r.is_active = 1
+    """
+    args = [user_id]
+    if member_id:
+        query += " AND r.family_member_id = %s"
+        args.append(member_id)
+    conn = get_read_connection()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(query, tuple(args))
+    reminders = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return reminders
+
+def upcoming(user_id, start_date, days, member_id=None):
+    """Cached expansion for one user (optionally one member); dropped whenever their reminders change."""
+    namespace = upcoming_namespace(user_id)
+    key = f"{start_date.isoformat()}:{days}:{member_id or 'all'}"
+    result = cache.get(namespace, key)
+    if result is None:
+        occurrences, skipped = expand(load_reminders(user_id, member_id), start_date, days)
+        result = {"occurrences": occurrences, "skipped": skipped}
+        cache.set(namespace, key, result, ttl=UPCOMING_CACHE_TTL)
+    return result
+
+def invalidate_upcoming(member_ids):
+    """Call after reminders of these members are added, changed or removed."""
+    ids = list({int(m) for m in member_ids})
+    if not ids:
+        return
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT DISTINCT user_id FROM family_members WHERE id IN ({', '.join(['%s'] * len(ids))})", ids
+    )
+    for (user_id,) in cursor.fetchall():
+        cache.invalidate(upcoming_namespace(user_id))
+    cursor.close()
+    conn.close()
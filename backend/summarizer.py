@@ -1,48 +1,144 @@
-from transformers import T5Tokenizer, T5ForConditionalGeneration
 import torch
+import os
+import threading
+import time
+from collections import OrderedDict
 from re import sub
+from transformers.modeling_outputs import BaseModelOutput
+from extractive import extractive_prefilter
+from model_registry import registry, WARM_MODELS
+from cpu_policy import apply_policy, gate
 
 # ---------------- MODEL LOADING ---------------- #
-tokenizer = T5Tokenizer.from_pretrained("t5-small")
-model = T5ForConditionalGeneration.from_pretrained("t5-small")
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model = model.to(device)
+apply_policy()  # thread counts / pinning before any model runs
+# Checkpoints come from the registry (t5-small by default); the warm set loads now
+registry.warm(WARM_MODELS)
+
+# ---------------- DECODING PROFILES ---------------- #
+# Beam search costs roughly num_beams x greedy on CPU
+DECODING_PROFILES = {
+    "fast": {"num_beams": 1, "min_length": 20},
+    "balanced": {"num_beams": 2, "min_length": 30, "length_penalty": 1.5, "early_stopping": True},
+    "quality": {"num_beams": 4, "min_length": 40, "length_penalty": 2.0, "early_stopping": True},
+}
+PROFILE_ORDER = ["quality", "balanced", "fast"]
+DEFAULT_PROFILE = os.getenv("SUMMARIZER_PROFILE", "quality")
+DEFAULT_DEADLINE = float(os.getenv("SUMMARIZER_DEADLINE_SECONDS", 30))   # wall clock per generate call, queueing included
+MIN_DECODE_SECONDS = 0.5                                                  # a slot granted at the deadline still emits a few tokens
+DOWNGRADE_EVERY = int(os.getenv("SUMMARIZER_DOWNGRADE_EVERY", 2))        # in-flight generations per step down
+ENCODER_CACHE_SIZE = 16
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+def resolve_profile(requested=None, adaptive=True) -> str:
+    """Requested profile, stepped down one level per DOWNGRADE_EVERY generations already running."""
+    profile = requested if requested in DECODING_PROFILES else DEFAULT_PROFILE
+    if adaptive and DOWNGRADE_EVERY > 0:
+        steps = _in_flight // DOWNGRADE_EVERY
+        index = min(PROFILE_ORDER.index(profile) + steps, len(PROFILE_ORDER) - 1)
+        profile = PROFILE_ORDER[index]
+    return profile
+
+class SummarizationError(Exception):
+    """Generation failed; there is no summary to show or store."""
+
+class SummarizerBusy(SummarizationError):
+    """No inference slot freed up within the deadline."""
+
+# ---------------- ENCODER CACHE ---------------- #
+_encoder_cache = OrderedDict()
+_encoder_lock = threading.Lock()
+
+def encode(loaded, input_text: str, max_input_length=512):
+    """
+    Tokenize + run the encoder once per distinct input. Only byte-identical prompts hit
+    (the same report summarized again); summarize and simplify prompts never share an entry.
+    """
+    key = (loaded.name, input_text, max_input_length)
+    with _encoder_lock:
+        cached = _encoder_cache.get(key)
+        if cached is not None:
+            _encoder_cache.move_to_end(key)
+            return cached
+
+    batch = loaded.tokenizer(input_text, return_tensors="pt", max_length=max_input_length, truncation=True)
+    device = loaded.model.device
+    input_ids = batch["input_ids"].to(device)
+    attention_mask = batch["attention_mask"].to(device)
+    with torch.inference_mode():
+        encoder_outputs = loaded.model.get_encoder()(input_ids=input_ids, attention_mask=attention_mask)
+
+    with _encoder_lock:
+        _encoder_cache[key] = (attention_mask, encoder_outputs)
+        while len(_encoder_cache) > ENCODER_CACHE_SIZE:
+            _encoder_cache.popitem(last=False)
+    return attention_mask, encoder_outputs
 
 # ---------------- HELPER ---------------- #
 def clean_text(text: str) -> str:
     """Remove excessive whitespace and normalize text."""
     return sub(r'\s+', ' ', text).strip()
 
-def generate_summary(input_text: str, max_input_length=512, max_output_length=150) -> str:
-    """Helper to generate text using T5 safely."""
+def generate_summary(input_text: str, max_input_length=512, max_output_length=150,
+                     profile=None, deadline=None, adaptive=True, model_name=None) -> str:
+    """Generate text with T5. Raises SummarizationError (SummarizerBusy if no slot frees up in time)."""
+    global _in_flight
+    profile = resolve_profile(profile, adaptive)
+    with _in_flight_lock:
+        _in_flight += 1
     try:
-        inputs = tokenizer.encode(input_text, return_tensors="pt", max_length=max_input_length, truncation=True)
-        inputs = inputs.to(device)
-        summary_ids = model.generate(
-            inputs,
-            max_length=max_output_length,
-            min_length=40,
-            length_penalty=2.0,
-            num_beams=4,
-            early_stopping=True
-        )
-        return tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        loaded = registry.get(model_name)
+        budget = deadline or DEFAULT_DEADLINE
+        queued = time.monotonic()
+        # Concurrent generations share the process's torch threads; queue instead of oversubscribing.
+        # The deadline covers the wait too, so decoding only gets what is left of it
+        with gate.slot(timeout=budget):
+            remaining = max(budget - (time.monotonic() - queued), MIN_DECODE_SECONDS)
+            attention_mask, encoder_outputs = encode(loaded, input_text, max_input_length)
+            with torch.inference_mode():
+                summary_ids = loaded.model.generate(
+                    # Fresh wrapper: generate() expands the hidden states per beam in place
+                    encoder_outputs=BaseModelOutput(last_hidden_state=encoder_outputs.last_hidden_state),
+                    attention_mask=attention_mask,
+                    max_length=max_output_length,
+                    max_time=remaining,  # stops decoding early, keeping what was generated
+                    **DECODING_PROFILES[profile],
+                )
+        return loaded.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+    except TimeoutError as e:
+        print("⚠️ Summarization timed out waiting for the model:", e)
+        raise SummarizerBusy("Summarizer is busy, please try again.") from e
     except Exception as e:
+        # Raised, not returned as text, so callers never store an error message as the summary
         print("❌ Summarization error:", e)
-        return "Error generating summary."
+        raise SummarizationError(str(e)) from e
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
 
 # ---------------- SUMMARIZATION ---------------- #
-def summarize_text(text: str) -> str:
+def count_tokens(text: str, model_name=None) -> int:
+    return len(registry.get(model_name).tokenizer.encode(text, add_special_tokens=False))
+
+def summarize_text(text: str, prefilter: bool = True, profile=None, deadline=None, adaptive=True,
+                   model_name=None) -> str:
     text = clean_text(text)
     if not text:
         return "No text to summarize."
+    if prefilter:
+        # T5 only sees 512 tokens: spend them on the most informative sentences, not headers
+        text = extractive_prefilter(text, token_budget=500,
+                                    count_tokens=lambda s: count_tokens(s, model_name))
     input_text = "summarize: " + text
-    return generate_summary(input_text, max_input_length=512, max_output_length=150)
+    return generate_summary(input_text, max_input_length=512, max_output_length=150,
+                            profile=profile, deadline=deadline, adaptive=adaptive, model_name=model_name)
 
 # ---------------- SIMPLIFY SUMMARY ---------------- #
-def simplify_summary(summary: str) -> str:
+def simplify_summary(summary: str, profile=None, deadline=None, adaptive=True, model_name=None) -> str:
     summary = clean_text(summary)
     if not summary:
         return "No summary to simplify."
     prompt = f"Explain this medical summary to a patient in simple language with no medical knowledge: {summary}"
-    return generate_summary(prompt, max_input_length=512, max_output_length=180)
+    return generate_summary(prompt, max_input_length=512, max_output_length=180,
+                            profile=profile, deadline=deadline, adaptive=adaptive, model_name=model_name)
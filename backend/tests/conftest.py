@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Backend modules are imported flat (python app.py from backend/), so tests do the same.
+# Nothing here needs a database or Redis: DB access is replaced by fakes in each test.
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("DB_PASSWORD", "")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("DB_REPLICAS", "")
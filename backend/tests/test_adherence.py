@@ -0,0 +1,139 @@
+import datetime
+import pytest
+from flask import Flask
+import adherence
+import MedicationAdherence
+from adherence import AdherenceLog, ack_token, verify_ack_token, ACKNOWLEDGED, DELIVERED, FIRED, ACK_VALID_HOURS
+
+def dose_time(hours_ago=0):
+    return (datetime.datetime.now() - datetime.timedelta(hours=hours_ago)).replace(microsecond=0)
+
+# ---------------- SIGNED LINKS ---------------- #
+def test_ack_token_round_trip():
+    at = dose_time()
+    assert verify_ack_token(ack_token(7, 3, at)) == (7, 3, at)
+
+@pytest.mark.parametrize("tamper", [
+    lambda t: t[:-1] + ("0" if t[-1] != "0" else "1"),     # wrong signature
+    lambda t: t.replace("7.", "8.", 1),                    # different reminder, same signature
+    lambda t: t[:-2] + "é1",                               # non-ASCII signature
+    lambda t: "no-signature",
+])
+def test_tampered_token_is_rejected(tamper):
+    with pytest.raises(ValueError, match="Invalid link"):
+        verify_ack_token(tamper(ack_token(7, 3, dose_time())))
+
+def test_expired_token_is_rejected():
+    with pytest.raises(ValueError, match="Link expired"):
+        verify_ack_token(ack_token(7, 3, dose_time(hours_ago=ACK_VALID_HOURS + 1)))
+
+# ---------------- ACK DEDUPE ---------------- #
+class FakeAcks:
+    """adherence_acks with its (reminder_id, occurrence_at) primary key, behind INSERT IGNORE."""
+
+    def __init__(self):
+        self.rows = set()
+
+    def connect(self):
+        return FakeAckConnection(self)
+
+class FakeAckConnection:
+    def __init__(self, table):
+        self.table = table
+        self.rowcount = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params):
+        assert sql.startswith("INSERT IGNORE INTO adherence_acks")
+        self.rowcount = 0 if params in self.table.rows else 1
+        self.table.rows.add(params)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def record(self, event, reminder_id, member_id, occurrence_at):
+        self.events.append((event, reminder_id, member_id, occurrence_at))
+        return True
+
+@pytest.fixture
+def ack_client(monkeypatch):
+    acks, recorder = FakeAcks(), Recorder()
+    monkeypatch.setattr(MedicationAdherence, "get_db_connection", acks.connect)
+    monkeypatch.setattr(MedicationAdherence, "adherence_log", recorder)
+    app = Flask(__name__)
+    app.register_blueprint(MedicationAdherence.adherence_bp)
+    return app.test_client(), recorder
+
+def test_each_dose_is_acknowledged_once(ack_client):
+    client, recorder = ack_client
+    at = dose_time()
+    token = ack_token(7, 3, at)
+    for _ in range(3):
+        assert client.get(f"/adherence/ack/{token}").status_code == 200
+    assert recorder.events == [(ACKNOWLEDGED, 7, 3, at)]
+
+def test_other_doses_are_counted_separately(ack_client):
+    client, recorder = ack_client
+    client.get(f"/adherence/ack/{ack_token(7, 3, dose_time(hours_ago=24))}")
+    client.get(f"/adherence/ack/{ack_token(7, 3, dose_time())}")
+    assert len(recorder.events) == 2
+
+def test_bad_link_is_a_400(ack_client):
+    client, recorder = ack_client
+    assert client.get("/adherence/ack/7.3.1700000000.é").status_code == 400
+    assert recorder.events == []
+
+# ---------------- DAILY ROLLUP ---------------- #
+class FakeFlushConnection:
+    def __init__(self):
+        self.batches = {}
+        self.committed = False
+
+    def cursor(self):
+        return self
+
+    def executemany(self, sql, rows):
+        table = "adherence_daily" if "adherence_daily" in sql else "adherence_events"
+        self.batches.setdefault(table, []).extend(rows)
+
+    def commit(self):
+        self.committed = True
+
+    def close(self):
+        pass
+
+def test_flush_folds_events_into_one_row_per_member_day(monkeypatch):
+    conn = FakeFlushConnection()
+    monkeypatch.setattr(adherence, "get_db_connection", lambda: conn)
+    log = AdherenceLog(flush_rows=2)
+    monkeypatch.setattr(log, "start", lambda: None)  # no writer thread; flush by hand
+
+    morning = datetime.datetime(2026, 3, 1, 8, 0)
+    evening = datetime.datetime(2026, 3, 1, 20, 0)
+    log.record(FIRED, 7, 3, morning)
+    log.record(DELIVERED, 7, 3, morning)
+    log.record(FIRED, 8, 3, evening)
+    log.record(ACKNOWLEDGED, 7, 3, morning)
+    log.record(FIRED, 9, 4, morning)
+
+    assert log.flush() == 5
+    assert conn.committed
+    assert len(conn.batches["adherence_events"]) == 5
+    assert sorted(conn.batches["adherence_daily"]) == [
+        (3, datetime.date(2026, 3, 1), 2, 1, 1),
+        (4, datetime.date(2026, 3, 1), 1, 0, 0),
+    ]
+    assert log.stats()["written"] == 5 and log.stats()["buffered"] == 0
+
+def test_unknown_event_is_rejected():
+    with pytest.raises(ValueError):
+        AdherenceLog().record("skipped", 7, 3, dose_time())
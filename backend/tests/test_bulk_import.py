@@ -0,0 +1,105 @@
+import BulkImport
+from BulkImport import SPECS, insert_batch, insert_statement
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+class FakeCursor:
+    """Multi-row INSERTs get consecutive ids from next_id; a row containing "bad" fails its statement."""
+
+    def __init__(self, next_id=100):
+        self.next_id = next_id
+        self.statements = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, sql, params):
+        self.statements.append((sql, list(params)))
+        if "bad" in params:
+            raise ValueError("Data too long for column 'title'")
+        rows = sql.count("(%s")
+        self.rowcount = rows
+        self.lastrowid = self.next_id
+        self.next_id += rows
+
+    def close(self):
+        pass
+
+def reminder_row(title):
+    return (1, title, "Medicine", "2026-01-01", None, "08:00:00", "Daily", "1 tablet", "", None, None)
+
+def test_insert_statement_binds_fixed_values():
+    spec = SPECS["reminders"]
+    sql = insert_statement(spec, {"is_active": 1, "created_at": "now"}, 3)
+    assert sql.startswith("INSERT INTO reminders (")
+    assert "is_active, created_at) VALUES" in sql
+    assert "NOW()" not in sql
+    assert sql.count("(%s") == 3
+    assert sql.count("%s") == 3 * (len(spec["db_columns"]) + 2)
+
+def test_ids_follow_lastrowid_per_batch():
+    conn, cursor = FakeConnection(), FakeCursor(next_id=100)
+    inserted, errors = [], []
+    rows = [reminder_row(f"r{i}") for i in range(4)]
+    insert_batch(conn, cursor, SPECS["reminders"], rows, [2, 3, 4, 5], inserted, errors)
+
+    assert errors == []
+    assert [(num, new_id) for num, new_id, _ in inserted] == [(2, 100), (3, 101), (4, 102), (5, 103)]
+    assert len(cursor.statements) == 1 and conn.commits == 1
+    sql, params = cursor.statements[0]
+    # Fixed columns are parameters of every row, not inlined SQL
+    assert len(params) == 4 * (len(SPECS["reminders"]["db_columns"]) + 2)
+    assert params[len(SPECS["reminders"]["db_columns"])] == 1
+
+def test_failed_row_is_isolated_and_ids_stay_correct():
+    conn, cursor = FakeConnection(), FakeCursor(next_id=10)
+    inserted, errors = [], []
+    rows = [reminder_row("a"), reminder_row("bad"), reminder_row("c"), reminder_row("d")]
+    insert_batch(conn, cursor, SPECS["reminders"], rows, [2, 3, 4, 5], inserted, errors)
+
+    assert [e["row"] for e in errors] == [3]
+    # Bisected: [a] -> 10, [c, d] -> 11, 12
+    assert sorted((num, new_id) for num, new_id, _ in inserted) == [(2, 10), (4, 11), (5, 12)]
+    assert conn.rollbacks >= 1
+
+def test_short_rowcount_is_treated_as_failure(monkeypatch):
+    conn, cursor = FakeConnection(), FakeCursor()
+    original = cursor.execute
+
+    def short_insert(sql, params):
+        original(sql, params)
+        if cursor.rowcount > 1:
+            cursor.rowcount -= 1  # e.g. a row silently ignored
+
+    monkeypatch.setattr(cursor, "execute", short_insert)
+    inserted, errors = [], []
+    insert_batch(conn, cursor, SPECS["reminders"], [reminder_row("a"), reminder_row("b")], [2, 3], inserted, errors)
+    assert errors == []
+    assert [num for num, _, _ in inserted] == [2, 3]
+    assert len({new_id for _, new_id, _ in inserted}) == 2
+
+def test_chunks_use_batch_size(monkeypatch):
+    monkeypatch.setattr(BulkImport, "BULK_CHUNK_ROWS", 2)
+    cursor = FakeCursor(next_id=1)
+
+    class Conn(FakeConnection):
+        def cursor(self):
+            return cursor
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(BulkImport, "get_db_connection", Conn)
+    rows = [reminder_row(str(i)) for i in range(5)]
+    inserted, errors = BulkImport.insert_chunks(SPECS["reminders"], rows, list(range(2, 7)))
+    assert errors == []
+    assert [new_id for _, new_id, _ in inserted] == [1, 2, 3, 4, 5]
+    assert [sql.count("(%s") for sql, _ in cursor.statements] == [2, 2, 1]
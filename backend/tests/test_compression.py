@@ -0,0 +1,94 @@
+import gzip
+import json
+import pytest
+from flask import Flask, Response, jsonify, request
+import compression
+from compression import choose_encoding, init_compression
+
+PAYLOAD = {"items": [{"title": "Blood test", "notes": "All values within range"}] * 100}
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    init_compression(app)
+
+    @app.route("/api/big")
+    def big():
+        # Same revalidation pattern as /api/dashboard
+        if "v1" in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = jsonify(PAYLOAD)
+        response.set_etag("v1")
+        return response
+
+    @app.route("/api/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/api/stream")
+    def stream():
+        return Response((json.dumps(item) + "\n" for item in PAYLOAD["items"]), mimetype="application/x-ndjson")
+
+    @app.route("/api/file")
+    def file():
+        return Response(b"%PDF-1.4" + b"0" * 4096, mimetype="application/pdf")
+
+    return app.test_client()
+
+# ---------------- NEGOTIATION ---------------- #
+@pytest.fixture
+def all_encodings(monkeypatch):
+    monkeypatch.setattr(compression, "ENCODINGS", ["zstd", "br", "gzip"])
+
+def test_client_q_values_win(all_encodings):
+    assert choose_encoding("gzip, br;q=0.9") == "gzip"
+    assert choose_encoding("br;q=0.5, zstd;q=0.8") == "zstd"
+
+def test_server_preference_breaks_ties(all_encodings):
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("*") == "zstd"
+
+def test_identity_when_nothing_acceptable(all_encodings):
+    assert choose_encoding(None) is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("gzip;q=oops") is None
+    assert choose_encoding("*;q=0, gzip;q=0") is None
+
+# ---------------- MIDDLEWARE ---------------- #
+def test_gzip_body_and_etag(client):
+    response = client.get("/api/big", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == '"v1-gzip"'
+    assert json.loads(gzip.decompress(response.data)) == PAYLOAD
+
+def test_identity_keeps_plain_etag(client):
+    response = client.get("/api/big", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"v1"'
+    assert response.get_json() == PAYLOAD
+
+def test_encoded_etag_revalidates(client):
+    response = client.get("/api/big", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+    assert response.status_code == 304
+    assert response.data == b""
+
+def test_small_body_is_not_compressed(client):
+    response = client.get("/api/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == {"ok": True}
+
+def test_streamed_body_is_compressed(client):
+    response = client.get("/api/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.data).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == PAYLOAD["items"]
+
+def test_compressed_formats_are_sent_as_is(client):
+    response = client.get("/api/file", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.data.startswith(b"%PDF")
@@ -0,0 +1,79 @@
+import pytest
+from flask import Flask, g, jsonify, request
+import db
+import read_routing
+from cache import Cache, MemoryBackend
+
+@pytest.fixture
+def router(monkeypatch):
+    router = db.ReadRouter(["simulated"])
+    monkeypatch.setattr(db, "read_router", router)
+    monkeypatch.setattr(db, "get_db_connection", lambda: "primary")
+    monkeypatch.setattr(db.Replica, "connect", lambda self: f"replica:{self.name}")
+    monkeypatch.setattr(db, "DB_SIMULATED_LAG", 0.0)
+    monkeypatch.setattr(read_routing, "cache", Cache(MemoryBackend()))  # fresh sticky marks per test
+    return router
+
+@pytest.fixture
+def client(router):
+    app = Flask(__name__)
+
+    @app.before_request
+    def fake_auth():
+        # Stands in for auth.authenticate, which sets g.user_id from the verified token
+        g.user_id = request.headers.get("X-User-Id", type=int)
+
+    read_routing.init_read_routing(app)
+
+    @app.route("/api/read")
+    def read():
+        return jsonify({"connection": read_routing.get_read_connection()})
+
+    @app.route("/api/write", methods=["POST"])
+    def write():
+        return jsonify({}), request.args.get("status", 201, type=int)
+
+    return app.test_client()
+
+def read_as(client, user_id, addr="10.0.0.1"):
+    response = client.get("/api/read", headers={"X-User-Id": str(user_id)}, environ_base={"REMOTE_ADDR": addr})
+    return response.get_json()["connection"]
+
+def write_as(client, user_id, addr="10.0.0.1", status=201):
+    client.post(f"/api/write?status={status}", headers={"X-User-Id": str(user_id)},
+                environ_base={"REMOTE_ADDR": addr})
+
+def test_reads_go_to_replica(client, router):
+    assert read_as(client, 1) == "replica:simulated"
+    assert router.counts["replica"] == 1
+
+def test_write_pins_that_users_reads_to_primary(client, router):
+    write_as(client, 1)
+    assert read_as(client, 1) == "primary"
+    assert read_as(client, 1, addr="10.0.0.9") == "primary"   # same user from another address
+    assert read_as(client, 2, addr="10.0.0.2") == "replica:simulated"
+    assert router.counts["primary_sticky"] == 2
+
+def test_write_pins_the_client_address(client):
+    write_as(client, 1, addr="10.0.0.5")
+    assert read_as(client, 2, addr="10.0.0.5") == "primary"
+
+def test_failed_write_does_not_pin(client):
+    write_as(client, 1, status=400)
+    assert read_as(client, 1) == "replica:simulated"
+
+def test_lagging_replica_falls_back_to_primary(client, router, monkeypatch):
+    monkeypatch.setattr(db, "DB_SIMULATED_LAG", db.DB_REPLICA_MAX_LAG + 1)
+    assert read_as(client, 1) == "primary"
+    assert router.counts["primary_fallback"] == 1
+
+def test_outside_a_request_is_never_sticky(router):
+    assert read_routing.session_keys() == []
+    assert read_routing.get_read_connection() == "replica:simulated"
+
+def test_no_replicas_uses_primary(monkeypatch):
+    router = db.ReadRouter([])
+    monkeypatch.setattr(db, "get_db_connection", lambda: "primary")
+    assert router.connection() == "primary"
+    assert router.connection(sticky=True) == "primary"
+    assert router.counts["primary_no_replicas"] == 2
@@ -0,0 +1,61 @@
+import datetime
+from recurrence import expand, time_seconds, weekday_mask
+
+START = datetime.date(2026, 1, 1)   # a Thursday
+
+def rule(id, frequency, start_date="2026-01-01", reminder_time="08:00:00", **extra):
+    return {"id": id, "family_member_id": 3, "title": f"Reminder {id}", "frequency": frequency,
+            "start_date": start_date, "reminder_time": reminder_time, **extra}
+
+def dates(occurrences, reminder_id=None):
+    return [o["date"] for o in occurrences if reminder_id is None or o["reminder_id"] == reminder_id]
+
+def test_once_fires_on_its_start_date_only():
+    occurrences, skipped = expand([rule(1, "Once", start_date="2026-01-03")], START, 7)
+    assert dates(occurrences) == ["2026-01-03"] and skipped == []
+
+def test_daily_is_clipped_to_start_and_end():
+    reminders = [rule(1, "Daily", start_date="2025-12-30", end_date="2026-01-03")]
+    occurrences, _ = expand(reminders, START, 7)
+    assert dates(occurrences) == ["2026-01-01", "2026-01-02", "2026-01-03"]
+
+def test_weekly_on_listed_days():
+    occurrences, _ = expand([rule(1, "Weekly", day_of_week="mon,wed")], START, 14)
+    assert dates(occurrences) == ["2026-01-05", "2026-01-07", "2026-01-12", "2026-01-14"]
+
+def test_weekly_without_days_uses_start_weekday():
+    occurrences, _ = expand([rule(1, "Weekly", day_of_week="")], START, 14)
+    assert dates(occurrences) == ["2026-01-01", "2026-01-08"]
+
+def test_weekday_ranges_and_numbers():
+    assert weekday_mask("sat-mon", START).tolist() == [True, False, False, False, False, True, True]
+    assert weekday_mask("Tuesday", START).tolist() == [False, True, False, False, False, False, False]
+    assert weekday_mask("0,4", START).tolist() == [True, False, False, False, True, False, False]
+
+def test_monthly_skips_months_without_the_day():
+    occurrences, _ = expand([rule(1, "Monthly", start_date="2026-01-31", day_of_month=31)], START, 90)
+    assert dates(occurrences) == ["2026-01-31", "2026-03-31"]
+
+def test_occurrences_sorted_by_date_then_time():
+    reminders = [rule(1, "Daily", reminder_time="20:00:00"), rule(2, "Daily", reminder_time="08:00:00")]
+    occurrences, _ = expand(reminders, START, 2)
+    assert [(o["date"], o["time"], o["reminder_id"]) for o in occurrences] == [
+        ("2026-01-01", "08:00", 2), ("2026-01-01", "20:00", 1),
+        ("2026-01-02", "08:00", 2), ("2026-01-02", "20:00", 1),
+    ]
+
+def test_unreadable_rule_is_skipped_not_fatal():
+    reminders = [rule(1, "Fortnightly"), rule(2, "Daily"), rule(3, "Daily", start_date="not a date")]
+    occurrences, skipped = expand(reminders, START, 2)
+    assert dates(occurrences, 2) == ["2026-01-01", "2026-01-02"]
+    assert [s["id"] for s in skipped] == [1, 3]
+
+def test_rules_outside_the_window_expand_to_nothing():
+    reminders = [rule(1, "Daily", start_date="2025-01-01", end_date="2025-12-31"),
+                 rule(2, "Once", start_date="2026-02-01")]
+    assert expand(reminders, START, 30) == ([], [])
+
+def test_reminder_time_formats():
+    assert time_seconds(datetime.timedelta(hours=8, minutes=30)) == 30600   # MySQL TIME
+    assert time_seconds("08:30") == 30600
+    assert time_seconds(datetime.time(8, 30, 15)) == 30615
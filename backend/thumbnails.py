@@ -0,0 +1,114 @@
+import os
+import threading
+from collections import OrderedDict
+import fitz  # PyMuPDF
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ---------------- CONFIG ---------------- #
+THUMB_CACHE_DIR = os.getenv("THUMB_CACHE_DIR", "uploads/thumbnails")
+THUMB_CACHE_MAX_MB = int(os.getenv("THUMB_CACHE_MAX_MB", 200))
+THUMB_SIZES = {"sm": 160, "md": 480}   # width in pixels
+THUMB_QUALITY = 75
+THUMB_VERSION = "1"                     # bump when rendering changes; part of file names and ETags
+
+os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+
+def render_thumbnails(pdf_bytes, sizes=THUMB_SIZES):
+    """First page of the PDF as JPEG bytes, one per size name."""
+    thumbs = {}
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        if doc.page_count == 0:
+            return thumbs
+        page = doc[0]
+        for name, width in sizes.items():
+            zoom = width / page.rect.width
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            thumbs[name] = pix.tobytes(output="jpeg", jpg_quality=THUMB_QUALITY)
+    return thumbs
+
+# ---------------- DISK LRU ---------------- #
+class DiskLRU:
+    """
+    Files in one directory, evicted least-recently-used first once their total size
+    passes the byte budget. Recency is kept in memory and seeded from file mtimes.
+    """
+
+    def __init__(self, directory=THUMB_CACHE_DIR, max_bytes=THUMB_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # file name -> size
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def _scan(self):
+        files = [e for e in os.scandir(self.directory) if e.is_file() and not e.name.endswith(".tmp")]
+        for entry in sorted(files, key=lambda e: e.stat().st_mtime):
+            size = entry.stat().st_size
+            self._entries[entry.name] = size
+            self.total_bytes += size
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, name):
+        """Path of a cached file, or None."""
+        with self._lock:
+            if name not in self._entries:
+                # Another worker process may have written it
+                if not os.path.exists(self.path(name)):
+                    self.misses += 1
+                    return None
+                size = os.path.getsize(self.path(name))
+                self._entries[name] = size
+                self.total_bytes += size
+            self._entries.move_to_end(name)
+            self.hits += 1
+        return self.path(name)
+
+    def put(self, name, data):
+        tmp = f"{self.path(name)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path(name))
+        with self._lock:
+            self.total_bytes += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+        return self.path(name)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "mb": round(self.total_bytes / 1024 / 1024, 2),
+                "max_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+thumb_cache = DiskLRU()
+
+def thumb_name(doc_id, size):
+    return f"{doc_id}-{size}-v{THUMB_VERSION}.jpg"
+
+def store_thumbnails(doc_id, pdf_bytes):
+    """Render and cache every size; returns {size: path}."""
+    return {size: thumb_cache.put(thumb_name(doc_id, size), data)
+            for size, data in render_thumbnails(pdf_bytes).items()}
@@ -0,0 +1,193 @@
+import argparse
+import datetime
+import time
+from collections import Counter
+from db import get_db_connection
+
+# Monthly counts of timeline events per member, event type and severity, kept in
+# timeline_rollup_monthly so trend charts read a few hundred rows instead of the whole history.
+# Writers update it in the same transaction as the timeline insert/delete; rebuild() recomputes it.
+
+NO_SEVERITY = ""  # severity is part of the primary key, so NULL is stored as ''
+
+UPSERT_SQL = """
+    INSERT INTO timeline_rollup_monthly (family_member_id, month, event_type, severity, event_count)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE event_count = event_count + VALUES(event_count)
+"""
+
+# ---------------- INCREMENTAL ---------------- #
+def add_entry(cursor, entry_id):
+    """Count one new medical_timeline row; call before committing the insert."""
+    cursor.execute(
+        """
+        INSERT INTO timeline_rollup_monthly (family_member_id, month, event_type, severity, event_count)
+        SELECT family_member_id, DATE_FORMAT(event_date, '%Y-%m-01'), event_type, COALESCE(severity, ''), 1
+        FROM medical_timeline
+        WHERE id = %s
+        ON DUPLICATE KEY UPDATE event_count = event_count + 1
+        """,
+        (entry_id,),
+    )
+
+def remove_entry(cursor, entry_id):
+    """Uncount a medical_timeline row; call before deleting it."""
+    cursor.execute(
+        """
+        UPDATE timeline_rollup_monthly r
+        JOIN medical_timeline t
+          ON t.family_member_id = r.family_member_id
+         AND r.month = DATE_FORMAT(t.event_date, '%Y-%m-01')
+         AND r.event_type = t.event_type
+         AND r.severity = COALESCE(t.severity, '')
+        SET r.event_count = GREATEST(r.event_count - 1, 0)
+        WHERE t.id = %s
+        """,
+        (entry_id,),
+    )
+
+def add_rows(cursor, rows):
+    """
+    Count a chunk of bulk-imported timeline rows (member_id, title, event_type, event_date,
+    severity, notes), aggregated first so each (member, month, type, severity) is one upsert.
+    """
+    counts = Counter(
+        (member_id, event_date.replace(day=1), event_type, severity or NO_SEVERITY)
+        for member_id, _, event_type, event_date, severity, _ in rows
+    )
+    if counts:
+        cursor.executemany(UPSERT_SQL, [key + (n,) for key, n in counts.items()])
+
+# ---------------- REBUILD ---------------- #
+def member_filter(member_ids, column):
+    if member_ids is None:
+        return "", ()
+    ids = list(member_ids) or [-1]
+    return f" WHERE {column} IN ({', '.join(['%s'] * len(ids))})", tuple(ids)
+
+def rebuild(member_ids=None):
+    """
+    Recompute the rollup from medical_timeline in SQL (all members, or only member_ids),
+    replacing the existing rows in one transaction. Returns the number of rollup rows written.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        where, args = member_filter(member_ids, "family_member_id")
+        cursor.execute("DELETE FROM timeline_rollup_monthly" + where, args)
+        cursor.execute(
+            """
+            INSERT INTO timeline_rollup_monthly (family_member_id, month, event_type, severity, event_count)
+            SELECT family_member_id, DATE_FORMAT(event_date, '%Y-%m-01') AS month,
+                   event_type, COALESCE(severity, '') AS severity, COUNT(*)
+            FROM medical_timeline
+            """ + where + """
+            GROUP BY family_member_id, month, event_type, severity
+            """,
+            args,
+        )
+        written = cursor.rowcount
+        conn.commit()
+        return written
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+# ---------------- OFFLINE (PANDAS) ---------------- #
+def compute_rollup(frame):
+    """
+    Vectorized rollup of a DataFrame with family_member_id, event_date, event_type and
+    severity columns; returns one row per (member, month, type, severity) with event_count.
+    """
+    import pandas as pd  # only needed for offline recomputation
+
+    frame = frame.assign(
+        month=pd.to_datetime(frame["event_date"]).values.astype("datetime64[M]"),
+        severity=frame["severity"].fillna(NO_SEVERITY),
+    )
+    return (frame.groupby(["family_member_id", "month", "event_type", "severity"], sort=True)
+                 .size()
+                 .rename("event_count")
+                 .reset_index())
+
+def recompute_offline(member_ids=None, batch_rows=5000):
+    """
+    Same result as rebuild(), computed in pandas from one streamed read of the raw rows.
+    Useful on a replica or a restored dump where INSERT ... SELECT would lock the source table.
+    """
+    import pandas as pd
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        where, args = member_filter(member_ids, "family_member_id")
+        cursor.execute(
+            "SELECT family_member_id, event_date, event_type, severity FROM medical_timeline" + where, args
+        )
+        frame = pd.DataFrame.from_records(
+            cursor.fetchall(), columns=["family_member_id", "event_date", "event_type", "severity"]
+        )
+        rollup = compute_rollup(frame)
+
+        cursor.execute("DELETE FROM timeline_rollup_monthly" + where, args)
+        rows = [
+            (int(member_id), month.date(), event_type, severity, int(n))
+            for member_id, month, event_type, severity, n in rollup.itertuples(index=False)
+        ]
+        for start in range(0, len(rows), batch_rows):
+            cursor.executemany(UPSERT_SQL, rows[start:start + batch_rows])
+        conn.commit()
+        return len(rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+# ---------------- READ ---------------- #
+def month_start(months_back, today=None):
+    """First day of the month months_back months before today's month."""
+    today = today or datetime.date.today()
+    index = today.year * 12 + today.month - 1 - months_back
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+def shape_series(rows, since, today=None):
+    """Rollup rows -> one count per month for each event type and severity, zero-filled."""
+    today = today or datetime.date.today()
+    months = []
+    month = since
+    while month <= today:
+        months.append(month)
+        month = month_start(-1, month)
+    position = {m: i for i, m in enumerate(months)}
+
+    by_type, by_severity, totals = {}, {}, [0] * len(months)
+    for row in rows:
+        i = position.get(row["month"])
+        if i is None:
+            continue
+        n = int(row["n"])
+        by_type.setdefault(row["event_type"], [0] * len(months))[i] += n
+        by_severity.setdefault(row["severity"] or "unspecified", [0] * len(months))[i] += n
+        totals[i] += n
+    return {
+        "months": [m.strftime("%Y-%m") for m in months],
+        "by_type": by_type,
+        "by_severity": by_severity,
+        "totals": totals,
+        "total": sum(totals),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild timeline_rollup_monthly from medical_timeline")
+    parser.add_argument("--pandas", action="store_true", help="recompute offline in pandas instead of SQL")
+    parser.add_argument("--member", type=int, action="append", help="only these member ids (repeatable)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = (recompute_offline if args.pandas else rebuild)(args.member)
+    print(f"✅ {written} rollup rows written in {time.perf_counter() - started:.2f}s")
@@ -21,3 +21,111 @@ CREATE TABLE IF NOT EXISTS family_members (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
+
+-- ---------------- FULL-TEXT SEARCH ---------------- --
+-- Text extracted from uploaded PDFs at upload time, indexed together with titles and notes
+ALTER TABLE medical_documents ADD COLUMN extracted_text LONGTEXT NULL;
+ALTER TABLE medical_documents ADD FULLTEXT INDEX ft_documents_text (title, extracted_text);
+ALTER TABLE medical_timeline ADD FULLTEXT INDEX ft_timeline_text (title, notes);
+ALTER TABLE reminders ADD FULLTEXT INDEX ft_reminders_title (title);
+
+-- ---------------- DOCUMENT INGESTION ---------------- --
+-- Filled by the background pipeline (ingestion.py) after each upload
+ALTER TABLE medical_documents
+    ADD COLUMN page_count INT NULL,
+    ADD COLUMN summary TEXT NULL,
+    ADD COLUMN simplified TEXT NULL,
+    ADD COLUMN ingest_status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    ADD COLUMN ingest_error TEXT NULL,
+    ADD COLUMN ingest_started_at DATETIME NULL,
+    ADD COLUMN ingested_at DATETIME NULL,
+    ADD INDEX idx_documents_ingest_status (ingest_status);
+
+-- ---------------- SEMANTIC RETRIEVAL ---------------- --
+-- Sentence embeddings (float32 bytes) of timeline entries and document text chunks
+CREATE TABLE IF NOT EXISTS record_embeddings (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    family_member_id INT NOT NULL,
+    source VARCHAR(20) NOT NULL,
+    source_id INT NOT NULL,
+    chunk_index INT NOT NULL DEFAULT 0,
+    preview VARCHAR(300),
+    vector BLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_record_chunk (source, source_id, chunk_index),
+    INDEX idx_embeddings_user (user_id)
+);
+
+-- ---------------- SECTION-AWARE PARSING ---------------- --
+-- Labelled report sections ([{"heading", "text"}]) and the Impression/Assessment text for the doctor view
+ALTER TABLE medical_documents
+    ADD COLUMN sections_json LONGTEXT NULL,
+    ADD COLUMN impression TEXT NULL;
+
+-- ---------------- PDF OPTIMIZATION ---------------- --
+-- Sizes before/after the optional ingestion-time rewrite (PDF_OPTIMIZE=1)
+ALTER TABLE medical_documents
+    ADD COLUMN original_size INT NULL,
+    ADD COLUMN stored_size INT NULL,
+    ADD COLUMN optimized TINYINT(1) NOT NULL DEFAULT 0;
+
+-- ---------------- TIMELINE ROLLUP ---------------- --
+-- Events per member, month, type and severity (NULL severity stored as ''), kept current by
+-- the timeline writers; rebuild with: python timeline_rollup.py [--pandas]
+CREATE TABLE IF NOT EXISTS timeline_rollup_monthly (
+    family_member_id INT NOT NULL,
+    month DATE NOT NULL,
+    event_type VARCHAR(100) NOT NULL,
+    severity VARCHAR(50) NOT NULL DEFAULT '',
+    event_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (family_member_id, month, event_type, severity),
+    INDEX idx_rollup_month (month)
+);
+
+-- ---------------- MEDICATION ADHERENCE ---------------- --
+-- Append-only log written in batches by adherence.py. Partitioned by month of created_at:
+-- monthly partitions are split off pmax ahead of time and expired months dropped whole
+-- (python adherence.py, also run daily by the writer). One secondary index keeps inserts cheap.
+CREATE TABLE IF NOT EXISTS adherence_events (
+    id BIGINT AUTO_INCREMENT,
+    reminder_id INT NOT NULL,
+    family_member_id INT NOT NULL,
+    occurrence_at DATETIME NOT NULL,
+    event ENUM('fired', 'delivered', 'acknowledged') NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id, created_at),
+    INDEX idx_adherence_member (family_member_id, occurrence_at)
+)
+PARTITION BY RANGE COLUMNS (created_at) (
+    PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
+
+-- Per member and dose day, upserted once per flush; what /api/adherence reads
+CREATE TABLE IF NOT EXISTS adherence_daily (
+    family_member_id INT NOT NULL,
+    day DATE NOT NULL,
+    fired INT NOT NULL DEFAULT 0,
+    delivered INT NOT NULL DEFAULT 0,
+    acknowledged INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (family_member_id, day)
+);
+
+-- ---------------- DASHBOARD FINGERPRINT ---------------- --
+-- Row edits (member uuid, reminder dates, ...) must change the /api/dashboard ETag, not just inserts
+ALTER TABLE family_members
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+ALTER TABLE medical_documents
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+ALTER TABLE reminders
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+ALTER TABLE medical_timeline
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+-- One row per acknowledged dose; INSERT IGNORE makes repeated or concurrent link clicks count once
+CREATE TABLE IF NOT EXISTS adherence_acks (
+    reminder_id INT NOT NULL,
+    occurrence_at DATETIME NOT NULL,
+    acknowledged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (reminder_id, occurrence_at)
+);
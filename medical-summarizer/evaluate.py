@@ -1,9 +1,14 @@
 # evaluate.py (batch mode)
 import os
+import sys
+import time
 import textstat
 import matplotlib.pyplot as plt
-from app.pdf_utils import extract_text_from_pdf
-from app.summarizer import summarize_text, simplify_summary
+
+# The summarizer (and its extractive pre-filter) lives in the Flask backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from pdf_utils import extract_text_from_pdf
+from summarizer import summarize_text, simplify_summary
 
 REPORTS_DIR = "reports"
 
@@ -18,21 +23,41 @@ def evaluate_texts(original, summary, simplified):
         "simplified_readability": textstat.flesch_reading_ease(simplified),
     }
 
-def gather_metrics():
+def coverage(original, summary):
+    """Share of the report's distinct content words (>3 chars) that appear in the summary."""
+    words = lambda t: {w for w in t.lower().split() if len(w) > 3 and w.isalpha()}
+    source = words(original)
+    return 0 if not source else round(len(source & words(summary)) / len(source), 3)
+
+def gather_metrics(prefilter=True):
     metrics = []
     files = [f for f in os.listdir(REPORTS_DIR) if f.lower().endswith(".pdf")]
     for i, fname in enumerate(sorted(files)):
         with open(os.path.join(REPORTS_DIR, fname), "rb") as f:
             original = extract_text_from_pdf(f)
-        summary = summarize_text(original)
+        start = time.perf_counter()
+        summary = summarize_text(original, prefilter=prefilter)
+        summary_seconds = time.perf_counter() - start
         simplified = simplify_summary(summary)
         m = evaluate_texts(original, summary, simplified)
         m["doc"] = fname
+        m["summary_seconds"] = round(summary_seconds, 3)
+        m["coverage"] = coverage(original, summary)
         metrics.append(m)
         print(f"[{i+1}/{len(files)}] {fname}: ratio={m['compression_ratio']}, "
-              f"FRE summary={m['summary_readability']:.1f}")
+              f"FRE summary={m['summary_readability']:.1f}, {summary_seconds:.2f}s")
     return metrics
 
+def compare_prefilter():
+    """Run the batch with and without the extractive pre-filter and print mean metrics side by side."""
+    runs = {"without": gather_metrics(prefilter=False), "with": gather_metrics(prefilter=True)}
+    keys = ["summary_seconds", "coverage", "compression_ratio", "summary_readability", "simplified_readability"]
+    mean = lambda ms, k: sum(m[k] for m in ms) / max(len(ms), 1)
+    print(f"\n{'metric':<24}{'without':>12}{'with':>12}")
+    for k in keys:
+        print(f"{k:<24}{mean(runs['without'], k):>12.3f}{mean(runs['with'], k):>12.3f}")
+    return runs["with"]
+
 def plot_all(metrics):
     # lengths
     originals = [m["original_len"] for m in metrics]
@@ -78,6 +103,6 @@ def plot_all(metrics):
     plt.legend(); plt.savefig("stacked_bar_wordcount_top10.png"); plt.close()
 
 if __name__ == "__main__":
-    mets = gather_metrics()
+    mets = compare_prefilter() if "--compare-prefilter" in sys.argv else gather_metrics()
     plot_all(mets)
     print("✅ Saved: scatter_lengths.png, hist_compression.png, boxplot_readability_all.png, stacked_bar_wordcount_top10.png")
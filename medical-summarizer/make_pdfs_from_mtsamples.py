@@ -1,6 +1,13 @@
 # make_pdfs_from_mtsamples.py
+import argparse
+import hashlib
+import io
+import json
 import os
+import random
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import pandas as pd
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -16,53 +23,78 @@ CSV_PATH = os.path.join(BASE_DIR, "data", "mtsamples.csv")   # CSV inside /data
 OUT_DIR = os.path.join(BASE_DIR, "reports")                  # PDFs will be saved here
 N_DOCS = 50                                                  # how many PDFs to generate
 
+# Corpus mode (large synthetic datasets for load tests)
+CORPUS_DIR = os.path.join(BASE_DIR, "corpus")
+CHUNK_ROWS = 500              # CSV rows read per chunk
+BYTES_PER_PAGE = 6 * 1024     # rough size of one dense page, used for --size-kb targets
+MANIFEST_NAME = "manifest.json"
+
+# Styles are built once per process and shared by every PDF it renders
+_STYLES = None
+
 def slugify(s: str, maxlen=60):
     s = re.sub(r"[^\w\s-]", "", s, flags=re.UNICODE).strip().lower()
     s = re.sub(r"[-\s]+", "-", s)
     return s[:maxlen] or "report"
 
-def build_pdf(row, idx):
+def get_styles():
+    global _STYLES
+    if _STYLES is None:
+        styles = getSampleStyleSheet()
+        _STYLES = {
+            "title": ParagraphStyle(
+                "Title",
+                parent=styles["Heading1"],
+                alignment=enums.TA_LEFT,
+                spaceAfter=6,
+            ),
+            "meta": ParagraphStyle(
+                "Meta",
+                parent=styles["Normal"],
+                textColor="#444444",
+                leading=14,
+                spaceAfter=10,
+            ),
+            "body": ParagraphStyle(
+                "Body",
+                parent=styles["Normal"],
+                leading=14,
+                spaceAfter=8,
+            ),
+            "section": ParagraphStyle(
+                "Section",
+                parent=styles["Heading2"],
+                spaceBefore=6,
+                spaceAfter=4,
+            ),
+        }
+    return _STYLES
+
+def row_fields(row, idx):
     title = str(row.get("sample_name") or row.get("Sample Name") or f"Medical Report #{idx}")
     specialty = str(row.get("medical_specialty") or row.get("Medical Specialty") or "General")
     description = str(row.get("description") or row.get("Description") or "").strip()
     body = str(row.get("transcription") or row.get("Transcription") or "").strip()
 
+    # pandas gives NaN for empty cells
+    if body.lower() == "nan":
+        body = ""
+    if description.lower() == "nan":
+        description = ""
+
     # Basic fallback if body is empty
     if not body:
         body = "No transcription text available in this sample."
+    return title.strip(), specialty.strip(), description, body
 
-    filename = f"{idx:03d}_{slugify(title)}.pdf"
-    path = os.path.join(OUT_DIR, filename)
-
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        "Title",
-        parent=styles["Heading1"],
-        alignment=enums.TA_LEFT,
-        spaceAfter=6,
-    )
-    meta_style = ParagraphStyle(
-        "Meta",
-        parent=styles["Normal"],
-        textColor="#444444",
-        leading=14,
-        spaceAfter=10,
-    )
-    body_style = ParagraphStyle(
-        "Body",
-        parent=styles["Normal"],
-        leading=14,
-        spaceAfter=8,
-    )
-    section_style = ParagraphStyle(
-        "Section",
-        parent=styles["Heading2"],
-        spaceBefore=6,
-        spaceAfter=4,
-    )
+def render_pdf(row, idx, target_pages=None):
+    """Render one report to PDF bytes. Returns (pdf_bytes, title, specialty, pages)."""
+    title, specialty, description, body = row_fields(row, idx)
+    styles = get_styles()
 
+    buf = io.BytesIO()
     doc = SimpleDocTemplate(
-        path,
+        buf,
         pagesize=A4,
         leftMargin=0.8*inch,
         rightMargin=0.8*inch,
@@ -70,21 +102,172 @@ def build_pdf(row, idx):
         bottomMargin=0.8*inch,
         title=title,
         author="De-identified Sample",
+        invariant=1,  # no timestamps/random IDs, so the same seed yields byte-identical files
     )
 
+    # Replace double newlines with <br/> to keep paragraph breaks
+    body_html = body.replace("\n\n", "<br/><br/>").replace("\n", "<br/>")
+
     story = []
-    story.append(Paragraph(title, title_style))
-    story.append(Paragraph(f"<b>Specialty:</b> {specialty}", meta_style))
+    story.append(Paragraph(title, styles["title"]))
+    story.append(Paragraph(f"<b>Specialty:</b> {specialty}", styles["meta"]))
     if description:
-        story.append(Paragraph(f"<b>Description:</b> {description}", body_style))
+        story.append(Paragraph(f"<b>Description:</b> {description}", styles["body"]))
     story.append(Spacer(1, 6))
-    story.append(Paragraph("Report", section_style))
-    # Replace double newlines with <br/> to keep paragraph breaks
-    story.append(Paragraph(body.replace("\n\n", "<br/><br/>").replace("\n", "<br/>"), body_style))
+    story.append(Paragraph("Report", styles["section"]))
+    story.append(Paragraph(body_html, styles["body"]))
+
+    # Pad with addenda of the same transcription until the page target is roughly met
+    if target_pages and target_pages > 1:
+        chars_per_page = BYTES_PER_PAGE // 2
+        repeats = max(0, (target_pages * chars_per_page) // max(len(body), 1) - 1)
+        for n in range(repeats):
+            story.append(Paragraph(f"Addendum {n + 1}", styles["section"]))
+            story.append(Paragraph(body_html, styles["body"]))
 
     doc.build(story)
+    return buf.getvalue(), title, specialty, doc.page
+
+def build_pdf(row, idx):
+    pdf_bytes, title, _, _ = render_pdf(row, idx)
+    filename = f"{idx:03d}_{slugify(title)}.pdf"
+    path = os.path.join(OUT_DIR, filename)
+    with open(path, "wb") as f:
+        f.write(pdf_bytes)
     return path
 
+# ---------------- CORPUS MODE ---------------- #
+def parse_distribution(spec):
+    """
+    Parse "1:0.5,2-4:0.3,10-20:0.2" into [((lo, hi), weight), ...].
+    Each bucket is a value or inclusive range picked with the given weight.
+    """
+    buckets = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        rng, _, weight = part.partition(":")
+        lo, _, hi = rng.partition("-")
+        lo = int(lo)
+        hi = int(hi) if hi else lo
+        buckets.append(((lo, hi), float(weight or 1)))
+    if not buckets:
+        raise ValueError(f"Empty distribution: {spec!r}")
+    return buckets
+
+def sample_target(buckets, rnd):
+    ranges = [b[0] for b in buckets]
+    weights = [b[1] for b in buckets]
+    lo, hi = rnd.choices(ranges, weights=weights)[0]
+    return rnd.randint(lo, hi)
+
+def iter_rows(csv_path, count, min_words=0):
+    """Stream CSV rows chunk by chunk, cycling through the file until `count` rows are yielded."""
+    yielded = 0
+    while yielded < count:
+        produced = 0
+        for chunk in pd.read_csv(csv_path, chunksize=CHUNK_ROWS):
+            length_col = "transcription" if "transcription" in chunk.columns else "Transcription"
+            if min_words:
+                words = chunk[length_col].fillna("").astype(str).str.split().str.len()
+                chunk = chunk[words >= min_words]
+            for row in chunk.to_dict("records"):
+                yield row
+                produced += 1
+                yielded += 1
+                if yielded >= count:
+                    return
+        if produced == 0:
+            raise ValueError(f"No usable rows in {csv_path}")
+
+def _corpus_worker(task):
+    row, idx, target_pages, out_dir = task
+    pdf_bytes, title, specialty, pages = render_pdf(row, idx, target_pages)
+    filename = f"{idx:06d}_{slugify(title, maxlen=40)}.pdf"
+    with open(os.path.join(out_dir, filename), "wb") as f:
+        f.write(pdf_bytes)
+    return {
+        "idx": idx,
+        "file": filename,
+        "sha256": hashlib.sha256(pdf_bytes).hexdigest(),
+        "bytes": len(pdf_bytes),
+        "pages": pages,
+        "target_pages": target_pages,
+        "specialty": specialty,
+    }
+
+def iter_tasks(args):
+    rnd = random.Random(args.seed)
+    pages_dist = parse_distribution(args.pages) if args.pages else None
+    size_dist = parse_distribution(args.size_kb) if args.size_kb else None
+    for idx, row in enumerate(iter_rows(args.csv, args.count, args.min_words), start=1):
+        target_pages = None
+        if size_dist:
+            target_pages = max(1, round(sample_target(size_dist, rnd) * 1024 / BYTES_PER_PAGE))
+        elif pages_dist:
+            target_pages = sample_target(pages_dist, rnd)
+        yield row, idx, target_pages, args.out
+
+def generate_corpus(args):
+    os.makedirs(args.out, exist_ok=True)
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    entries = []
+    started = time.perf_counter()
+
+    # Bounded submission window so memory stays flat for very large corpora
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_styles) as pool:
+        pending = set()
+        reported = 0
+        for task in iter_tasks(args):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                entries.extend(f.result() for f in done)
+                if len(entries) - reported >= 1000:
+                    reported = len(entries)
+                    print(f"… {reported} PDFs written")
+            pending.add(pool.submit(_corpus_worker, task))
+        entries.extend(f.result() for f in wait(pending).done)
+
+    elapsed = time.perf_counter() - started
+    entries.sort(key=lambda e: e["idx"])
+    manifest = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source_csv": os.path.basename(args.csv),
+        "seed": args.seed,
+        "count": len(entries),
+        "pages_distribution": args.pages,
+        "size_kb_distribution": args.size_kb,
+        "total_bytes": sum(e["bytes"] for e in entries),
+        "files": entries,
+    }
+    with open(os.path.join(args.out, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+
+    print(f"✅ Created {len(entries)} PDFs in '{args.out}/' "
+          f"({manifest['total_bytes'] / 1e6:.1f} MB, {len(entries) / elapsed:.1f} PDFs/s, {workers} workers)")
+
+def verify_corpus(corpus_dir):
+    """Check every file in a corpus against its manifest hash."""
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    bad = []
+    for entry in manifest["files"]:
+        path = os.path.join(corpus_dir, entry["file"])
+        try:
+            with open(path, "rb") as pdf:
+                digest = hashlib.sha256(pdf.read()).hexdigest()
+        except FileNotFoundError:
+            digest = None
+        if digest != entry["sha256"]:
+            bad.append(entry["file"])
+    if bad:
+        print(f"❌ {len(bad)} of {manifest['count']} files missing or modified, e.g. {bad[:5]}")
+        return False
+    print(f"✅ Corpus OK: {manifest['count']} files match manifest")
+    return True
+
 def main():
     os.makedirs(OUT_DIR, exist_ok=True)
     df = pd.read_csv(CSV_PATH)
@@ -103,5 +286,25 @@ def main():
     for p in paths[:5]:
         print(" -", p)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build report PDFs from MTSamples.")
+    parser.add_argument("--generate", dest="count", type=int,
+                        help="corpus mode: number of PDFs to generate (cycles through the CSV)")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--out", default=CORPUS_DIR)
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (default: CPU count)")
+    parser.add_argument("--pages", help='page-count distribution, e.g. "1:0.5,2-4:0.3,10-20:0.2"')
+    parser.add_argument("--size-kb", dest="size_kb", help='file-size distribution in KB, e.g. "50-200:0.8,1000:0.2"')
+    parser.add_argument("--min-words", type=int, default=0, help="skip transcriptions shorter than this")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verify", metavar="DIR", help="check an existing corpus against its manifest")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.verify:
+        raise SystemExit(0 if verify_corpus(args.verify) else 1)
+    elif args.count:
+        generate_corpus(args)
+    else:
+        main()
@@ -5,6 +5,7 @@ import { Card, CardContent, CardTitle, CardHeader } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Textarea } from "@/components/ui/textarea";
 import { useToast } from "@/hooks/use-toast";
+import { authHeaders } from "@/lib/api";
 
 const MedicalSummarizerDialog: React.FC = () => {
   const [file, setFile] = useState<File | null>(null);
@@ -43,7 +44,7 @@ const MedicalSummarizerDialog: React.FC = () => {
         "http://localhost:8000/api/summarizer/",
         formData,
         {
-          headers: { "Content-Type": "multipart/form-data" },
+          headers: { "Content-Type": "multipart/form-data", ...authHeaders() },
         }
       );
 
@@ -14,6 +14,7 @@ import {
   AlertDialogTrigger,
   AlertDialogFooter
 } from '@/components/ui/alert-dialog';
+import { authFetch, openAuthorizedFile } from '@/lib/api';
 
 // ---------------- TYPES ---------------- //
 interface Document {
@@ -46,7 +47,7 @@ const DocumentsList = ({ memberId, refresh = 0, readOnly = false }: DocumentsLis
   const fetchDocuments = async () => {
     setLoading(true);
     try {
-      const res = await fetch(`${BACKEND_HOST}/api/family-members/${memberId}/documents`);
+      const res = await authFetch(`${BACKEND_HOST}/api/family-members/${memberId}/documents`);
       if (!res.ok) throw new Error("Failed to fetch documents");
       setDocuments(await res.json());
     } catch (error: any) {
@@ -64,7 +65,7 @@ const DocumentsList = ({ memberId, refresh = 0, readOnly = false }: DocumentsLis
   const handleDelete = async (documentId: number) => {
     if (readOnly) return;
     try {
-      const res = await fetch(`${BACKEND_HOST}/api/documents/${documentId}`, { method: "DELETE" });
+      const res = await authFetch(`${BACKEND_HOST}/api/documents/${documentId}`, { method: "DELETE" });
       if (!res.ok) throw new Error("Failed to delete document");
       toast({ title: "Deleted", description: "Document deleted successfully" });
       fetchDocuments();
@@ -74,11 +75,12 @@ const DocumentsList = ({ memberId, refresh = 0, readOnly = false }: DocumentsLis
   };
 
   // ---------------- DOWNLOAD DOCUMENT ---------------- //
-  const handleDownload = (documentId: number, fileName: string) => {
-    const link = document.createElement("a");
-    link.href = `${BACKEND_HOST}/api/documents/${documentId}`;
-    link.download = fileName;
-    link.click();
+  const handleDownload = async (documentId: number, fileName?: string) => {
+    try {
+      await openAuthorizedFile(`${BACKEND_HOST}/api/documents/${documentId}`, fileName);
+    } catch (error: any) {
+      toast({ title: "Error", description: error.message, variant: "destructive" });
+    }
   };
 
   if (loading) return <p>Loading documents...</p>;
@@ -103,7 +105,7 @@ const DocumentsList = ({ memberId, refresh = 0, readOnly = false }: DocumentsLis
                 <Download className="w-4 h-4 mr-1" /> Download
               </Button>
               <Button
-                onClick={() => window.open(`${BACKEND_HOST}/api/documents/${doc.id}`, "_blank")}
+                onClick={() => handleDownload(doc.id)}
                 aria-label={`View ${doc.title}`}
               >
                 <ExternalLink className="w-4 h-4 mr-1" /> View
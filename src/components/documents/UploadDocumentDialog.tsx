@@ -14,6 +14,7 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@
 import { Textarea } from '@/components/ui/textarea';
 import { useToast } from '@/hooks/use-toast';
 import { Upload } from 'lucide-react';
+import { authFetch } from '@/lib/api';
 
 interface UploadDocumentDialogProps {
   memberId: string;
@@ -77,7 +78,7 @@ const UploadDocumentDialog = ({ memberId, onDocumentUploaded }: UploadDocumentDi
       data.append('notes', formData.notes);
       data.append('file', formData.file);
 
-      const res = await fetch('http://localhost:8000/api/documents/upload', {
+      const res = await authFetch('http://localhost:8000/api/documents/upload', {
         method: 'POST',
         body: data
       });
@@ -8,6 +8,7 @@ import { useToast } from "@/hooks/use-toast";
 import { Shield, Download, Pencil } from "lucide-react";
 import QRCode from "qrcode";
 import { PDFDownloadLink, Document, Page, View, Text, StyleSheet, Image } from "@react-pdf/renderer";
+import { authFetch } from "@/lib/api";
 
 interface FamilyMember {
   id: number;
@@ -133,7 +134,7 @@ const EmergencyCardGenerator = ({ member }: EmergencyCardGeneratorProps) => {
     const ensureUuid = async () => {
       if (!memberUuid) {
         try {
-          const res = await fetch(`${BACKEND_HOST}/generate-uuid/${member.id}`, { method: "POST" });
+          const res = await authFetch(`${BACKEND_HOST}/generate-uuid/${member.id}`, { method: "POST" });
           if (res.ok) {
             const data = await res.json();
             setMemberUuid(data.uuid);
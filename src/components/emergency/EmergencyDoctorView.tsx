@@ -175,7 +175,7 @@ const EmergencyDoctorView = () => {
                   <Button
                     onClick={async () => {
                       try {
-                        const res = await fetch(`${BACKEND_HOST}/api/documents/${doc.id}`);
+                        const res = await fetch(`${BACKEND_HOST}/api/doctor-view/${uuid}/documents/${doc.id}`);
                         if (!res.ok) throw new Error("Failed to fetch document");
                         const blob = await res.blob();
                         const link = document.createElement("a");
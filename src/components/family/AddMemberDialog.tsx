@@ -20,6 +20,7 @@ import {
 import { useToast } from '@/hooks/use-toast';
 import { useAuth } from '@/hooks/useAuth';
 import { Plus } from 'lucide-react';
+import { authFetch } from '@/lib/api';
 
 interface AddMemberDialogProps {
   onMemberAdded: () => void;
@@ -61,7 +62,7 @@ const AddMemberDialog = ({ onMemberAdded }: AddMemberDialogProps) => {
 
     setLoading(true);
     try {
-      const res = await fetch('http://127.0.0.1:8000/api/family-members', {
+      const res = await authFetch('http://127.0.0.1:8000/api/family-members', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
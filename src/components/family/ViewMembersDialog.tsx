@@ -12,6 +12,7 @@ import { useToast } from '@/hooks/use-toast';
 import { useAuth } from '@/hooks/useAuth';
 import { Users, Eye } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
+import { authFetch } from '@/lib/api';
 
 interface FamilyMember {
   id: number;
@@ -36,7 +37,7 @@ const ViewMembersDialog = () => {
 
     try {
       setLoading(true);
-      const res = await fetch(`http://127.0.0.1:8000/api/family-members?user_id=${user.id}`);
+      const res = await authFetch(`http://127.0.0.1:8000/api/family-members?user_id=${user.id}`);
       if (!res.ok) {
         const errData = await res.json();
         throw new Error(errData.error || 'Failed to fetch family members');
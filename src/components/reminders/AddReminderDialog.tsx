@@ -20,6 +20,7 @@ import {
 import { useToast } from '@/hooks/use-toast';
 import { useAuth } from '@/hooks/useAuth';
 import { Plus } from 'lucide-react';
+import { authFetch } from '@/lib/api';
 
 interface AddReminderDialogProps {
   memberId: number;
@@ -66,7 +67,7 @@ const AddReminderDialog = ({ memberId, memberEmail, userEmail, onReminderAdded }
     e.preventDefault();
     setLoading(true);
     try {
-      const res = await fetch('http://127.0.0.1:8000/api/reminders', {
+      const res = await authFetch('http://127.0.0.1:8000/api/reminders', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
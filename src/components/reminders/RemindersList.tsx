@@ -15,6 +15,7 @@ import {
   AlertDialogTitle,
   AlertDialogTrigger,
 } from '@/components/ui/alert-dialog';
+import { authFetch } from '@/lib/api';
 
 interface Reminder {
   id: number;
@@ -51,7 +52,7 @@ const RemindersList = ({ memberId, refresh, showLimited = false }: RemindersList
   const fetchReminders = async () => {
     setLoading(true);
     try {
-      const res = await fetch(`http://127.0.0.1:8000/api/family-members/${memberId}/reminders`);
+      const res = await authFetch(`http://127.0.0.1:8000/api/family-members/${memberId}/reminders`);
       if (!res.ok) throw new Error(`Failed to fetch reminders (Status ${res.status})`);
       const data: Reminder[] = await res.json();
       setReminders(data || []);
@@ -69,7 +70,7 @@ const RemindersList = ({ memberId, refresh, showLimited = false }: RemindersList
 
   const handleToggleActive = async (reminderId: number, isActive: boolean) => {
     try {
-      const res = await fetch(`http://127.0.0.1:8000/api/reminders/${reminderId}/toggle-active`, {
+      const res = await authFetch(`http://127.0.0.1:8000/api/reminders/${reminderId}/toggle-active`, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ is_active: isActive }),
@@ -84,7 +85,7 @@ const RemindersList = ({ memberId, refresh, showLimited = false }: RemindersList
 
   const handleDelete = async (reminderId: number) => {
     try {
-      const res = await fetch(`http://127.0.0.1:8000/api/reminders/${reminderId}`, { method: 'DELETE' });
+      const res = await authFetch(`http://127.0.0.1:8000/api/reminders/${reminderId}`, { method: 'DELETE' });
       if (!res.ok) throw new Error(`Failed to delete reminder (Status ${res.status})`);
       toast({ title: 'Success', description: 'Reminder deleted successfully' });
       fetchReminders();
@@ -95,7 +96,7 @@ const RemindersList = ({ memberId, refresh, showLimited = false }: RemindersList
 
   const markAsTaken = async (reminderId: number) => {
     try {
-      const res = await fetch(`http://127.0.0.1:8000/api/reminders/${reminderId}/mark-taken`, {
+      const res = await authFetch(`http://127.0.0.1:8000/api/reminders/${reminderId}/mark-taken`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ member_id: memberId }),
@@ -7,6 +7,7 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@
 import { Textarea } from '@/components/ui/textarea';
 import { useToast } from '@/hooks/use-toast';
 import { Plus } from 'lucide-react';
+import { authFetch } from '@/lib/api';
 
 interface AddTimelineDialogProps {
   memberId: string;
@@ -35,7 +36,7 @@ const AddTimelineDialog = ({ memberId, onTimelineAdded }: AddTimelineDialogProps
     setLoading(true);
 
     try {
-      const response = await fetch("http://127.0.0.1:8000/api/timeline", {
+      const response = await authFetch("http://127.0.0.1:8000/api/timeline", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ member_id: memberId, ...formData })
@@ -13,6 +13,7 @@ import {
   AlertDialogTrigger,
   AlertDialogFooter,
 } from "@/components/ui/alert-dialog";
+import { authFetch } from "@/lib/api";
 
 interface TimelineEntry {
   id: number;
@@ -44,7 +45,7 @@ const TimelineList = ({ memberId, refresh = 0, showLimited = false, readOnly = f
     setLoading(true);
     try {
       const limitParam = showLimited ? "?limit=3" : "";
-      const res = await fetch(`http://localhost:8000/api/family-members/${memberId}/timeline${limitParam}`);
+      const res = await authFetch(`http://localhost:8000/api/family-members/${memberId}/timeline${limitParam}`);
       if (!res.ok) throw new Error("Failed to fetch timeline");
       const data: TimelineEntry[] = await res.json();
       setTimeline(data);
@@ -58,7 +59,7 @@ const TimelineList = ({ memberId, refresh = 0, showLimited = false, readOnly = f
   const handleDelete = async (entryId: number) => {
     if (readOnly) return;
     try {
-      const res = await fetch(`http://localhost:8000/api/timeline/${entryId}`, { method: "DELETE" });
+      const res = await authFetch(`http://localhost:8000/api/timeline/${entryId}`, { method: "DELETE" });
       if (!res.ok) throw new Error("Failed to delete entry");
       toast({ title: "Deleted", description: "Timeline entry deleted successfully" });
       fetchTimeline();
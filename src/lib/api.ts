@@ -0,0 +1,34 @@
+// fetch() for the backend API with the signed-in user's bearer token attached.
+// A 401 means the token is missing, expired or from before tokens carried the user id:
+// the stored session is dropped and the user is sent back to the login page.
+export const authHeaders = (): Record<string, string> => {
+  const stored = localStorage.getItem("user");
+  const token = stored ? JSON.parse(stored)?.token : null;
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
+export const authFetch = async (input: RequestInfo | URL, init: RequestInit = {}) => {
+  const headers = new Headers(init.headers);
+  Object.entries(authHeaders()).forEach(([name, value]) => headers.set(name, value));
+  const res = await fetch(input, { ...init, headers });
+  if (res.status === 401) {
+    localStorage.removeItem("user");
+    window.location.assign("/auth");
+  }
+  return res;
+};
+
+// Fetch a protected file and open or save it from a blob URL (plain links cannot send the header)
+export const openAuthorizedFile = async (url: string, fileName?: string) => {
+  const res = await authFetch(url);
+  if (!res.ok) throw new Error("Failed to fetch document");
+  const blobUrl = URL.createObjectURL(await res.blob());
+  if (fileName) {
+    const link = document.createElement("a");
+    link.href = blobUrl;
+    link.download = fileName;
+    link.click();
+  } else {
+    window.open(blobUrl, "_blank");
+  }
+};
@@ -7,6 +7,7 @@ import { Heart, Plus, Calendar, Users, Bell, Pill } from 'lucide-react';
 import DashboardHeader from '@/components/DashboardHeader';
 import AddMemberDialog from '@/components/family/AddMemberDialog';
 import ViewMembersDialog from '@/components/family/ViewMembersDialog';
+import { authFetch } from '@/lib/api';
 
 interface FamilyMember {
   id: number;
@@ -27,22 +28,22 @@ const Dashboard = () => {
 
   useEffect(() => {
     if (user?.id) {
-      fetchFamilyMembers();
-      fetchFamilyMemberCount();
+      fetchDashboard();
     }
   }, [user?.id]);
 
-  // Fetch members list
-  const fetchFamilyMembers = async () => {
+  // Fetch members and counts in one call (revalidated via ETag by the browser cache)
+  const fetchDashboard = async () => {
     if (!user?.id) return;
 
     setLoading(true);
     try {
-      const res = await fetch(`http://localhost:8000/api/family-members?user_id=${user.id}`);
-      if (!res.ok) throw new Error(`Failed to fetch members. Status: ${res.status}`);
+      const res = await authFetch(`http://localhost:8000/api/dashboard?user_id=${user.id}`);
+      if (!res.ok) throw new Error(`Failed to fetch dashboard. Status: ${res.status}`);
 
-      const data: FamilyMember[] = await res.json();
-      setFamilyMembers(data || []);
+      const data: { member_count: number; members: FamilyMember[] } = await res.json();
+      setFamilyMembers(data?.members || []);
+      setMemberCount(data?.member_count || 0);
     } catch (error: any) {
       toast({
         title: "Error",
@@ -50,35 +51,15 @@ const Dashboard = () => {
         variant: "destructive",
       });
       setFamilyMembers([]);
+      setMemberCount(0);
     } finally {
       setLoading(false);
     }
   };
 
-  // Fetch family member count
-  const fetchFamilyMemberCount = async () => {
-    if (!user?.id) return;
-
-    try {
-      const res = await fetch(`http://localhost:8000/api/family-members/count?user_id=${user.id}`);
-      if (!res.ok) throw new Error(`Failed to fetch count. Status: ${res.status}`);
-
-      const data: { count: number } = await res.json();
-      setMemberCount(data?.count || 0);
-    } catch (error: any) {
-      toast({
-        title: "Error",
-        description: error.message || "Failed to load member count",
-        variant: "destructive",
-      });
-      setMemberCount(0);
-    }
-  };
-
   // Callback after adding member
   const handleMemberAdded = () => {
-    fetchFamilyMembers();
-    fetchFamilyMemberCount();
+    fetchDashboard();
   };
 
   return (
@@ -17,6 +17,7 @@ import UploadDocumentDialog from '@/components/documents/UploadDocumentDialog';
 import EmergencyCardGenerator from '@/components/emergency/EmergencyCardGenerator';
 import AddDoctorDialog from '@/components/doctors/AddDoctorDialog';
 import DoctorsList from '@/components/doctors/DoctorsList';
+import { authFetch } from '@/lib/api';
 
 interface FamilyMember {
   id: number;
@@ -52,7 +53,7 @@ const MemberProfile = () => {
 
     try {
       setLoading(true);
-      const res = await fetch(
+      const res = await authFetch(
         `http://127.0.0.1:8000/api/family-members/${memberId}?user_id=${user.id}`
       );
       if (!res.ok) {